@@ -1,6 +1,11 @@
+import logging
+
 from fastapi import APIRouter, Query, HTTPException
+from app.config import AUTO_UPLOAD_MAX_DAYS
 from app.service.auto_upload_service import AutoUploadService
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/auto", tags=["Auto Upload"])
 service = AutoUploadService()
@@ -14,6 +19,18 @@ class UploadRequest(BaseModel):
     duration: int = 30
 
 
+class DayPayload(BaseModel):
+    date: str  # ✅ YYYY-MM-DD 형식
+    raw_json: dict
+
+
+class BulkUploadRequest(BaseModel):
+    user_id: str
+    days: list[DayPayload] = Field(..., max_length=AUTO_UPLOAD_MAX_DAYS)
+    difficulty: str = "중"
+    duration: int = 30
+
+
 @router.post("/upload")
 async def upload_json(payload: UploadRequest):
     """
@@ -28,16 +45,6 @@ async def upload_json(payload: UploadRequest):
     - 애플: HealthUploadModel.swift → raw_json 전송 → platform="apple"
     - VectorDB source: "api_samsung" or "api_apple"
     """
-    print("=" * 60)
-    print("📥 API 데이터 업로드 요청")
-    print("=" * 60)
-    print(f"User ID: {payload.user_id}")
-    print(f"Date: {payload.date}")  # ✅ YYYY-MM-DD
-    print(f"Difficulty: {payload.difficulty}")
-    print(f"Duration: {payload.duration}분")
-    print(f"Data keys: {list(payload.raw_json.keys())}")
-    print("=" * 60)
-
     try:
         result = await service.process_json(
             json_data=payload.raw_json,
@@ -46,12 +53,36 @@ async def upload_json(payload: UploadRequest):
             difficulty=payload.difficulty,
             duration=payload.duration,
         )
-        print(f"✅ {payload.date} 데이터 처리 완료")
         return result
 
     except Exception as e:
-        print(f"❌ {payload.date} 데이터 처리 실패: {str(e)}")
-        import traceback
+        logger.exception("%s 데이터 처리 실패: %s", payload.date, e)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        traceback.print_exc()
+
+@router.post("/upload/bulk")
+async def upload_json_bulk(payload: BulkUploadRequest):
+    """
+    앱에서 여러 날짜 건강 데이터를 한 번에 업로드
+
+    - 최근 N일치를 요청 1번으로 전송 (날짜별 반복 호출 대체, 최대 AUTO_UPLOAD_MAX_DAYS일)
+    - 전처리 / 임베딩 / VectorDB 저장은 일괄 처리
+    - LLM 분석은 가장 최근 날짜만 1회
+    """
+    if not payload.days:
+        raise HTTPException(status_code=400, detail="days가 비어 있습니다.")
+
+    try:
+        result = await service.process_bulk_json(
+            days=[day.model_dump() for day in payload.days],
+            user_id=payload.user_id,
+            difficulty=payload.difficulty,
+            duration=payload.duration,
+        )
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("일괄 데이터 처리 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
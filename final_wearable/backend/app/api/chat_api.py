@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, Optional
 from app.service.chat_service import ChatService
 
 router = APIRouter(prefix="/api")
@@ -14,13 +14,18 @@ class ChatRequest(BaseModel):
     user_id: str  # 이메일 ID
     message: str
     character: Literal["devil_coach", "angel_coach", "booster_coach"] = "booster_coach"
+    session_id: Optional[str] = None  # 이전 응답의 session_id (없으면 새 대화)
 
 
+# 동기 함수로 선언 → threadpool에서 실행 (동시 요청 병렬 처리 + single-flight 공유)
 @router.post("/chat")
-async def chat(req: ChatRequest):
+def chat(req: ChatRequest):
 
     result = chat_service.handle_chat(
-        user_id=req.user_id, message=req.message, character=req.character
+        user_id=req.user_id,
+        message=req.message,
+        character=req.character,
+        session_id=req.session_id,
     )
 
     return result
@@ -36,7 +41,7 @@ class FixedRequest(BaseModel):
 
 
 @router.post("/chat/fixed")
-async def chat_fixed(req: FixedRequest):
+def chat_fixed(req: FixedRequest):
 
     result = chat_service.handle_fixed_chat(
         user_id=req.user_id, question_type=req.question_type, character=req.character
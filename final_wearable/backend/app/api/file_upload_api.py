@@ -1,8 +1,10 @@
-from fastapi import APIRouter, UploadFile, File, Query
+from fastapi import APIRouter, UploadFile, File, Query, HTTPException
 from app.service.file_upload_service import FileUploadService
+from app.service.upload_job_service import UploadJobService
 
 router = APIRouter(prefix="/api/file", tags=["File Upload"])
 service = FileUploadService()
+job_service = UploadJobService(file_service=service)
 
 @router.post("/upload")
 async def upload_file(
@@ -11,9 +13,18 @@ async def upload_file(
     difficulty: str = Query("중"),
     duration: int = Query(30),
 ):
-    return await service.process_file(
+    """파일 저장 후 job id 즉시 반환 (분석은 백그라운드 처리)"""
+    return await job_service.submit(
         file=file,
         user_id=user_id,
         difficulty=difficulty,
         duration=duration
-    )
\ No newline at end of file
+    )
+
+@router.get("/jobs/{job_id}")
+def get_upload_job(job_id: str):
+    """업로드 job 상태 / 단계별 진행 / 결과 조회"""
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(404, "존재하지 않는 job입니다.")
+    return job
@@ -2,12 +2,23 @@
 User API Router (수정 버전 - 날짜 기준 최신 데이터 조회)
 """
 
+import logging
+
 from fastapi import APIRouter, Query, HTTPException
-from app.core.vector_store import collection, search_similar_summaries
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.core.vector_store import (
+    collection,
+    search_similar_summaries,
+    summary_from_metadata,
+)
 from app.core.llm_analysis import run_llm_analysis
-import json
+from app.service.batch_analysis_service import BatchAnalysisService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/user", tags=["user"])
+batch_service = BatchAnalysisService()
 
 
 # ------------------------------------------------------------
@@ -25,8 +36,9 @@ def get_latest_analysis(
 
     ✅ 수정: 유사도가 아닌 날짜 기준으로 최신 데이터 조회
     """
-    print(
-        f"[INFO] 최신 분석 요청: user_id={user_id}, difficulty={difficulty}, duration={duration}분"
+    logger.info(
+        "최신 분석 요청: user_id=%s, difficulty=%s, duration=%s분",
+        user_id, difficulty, duration,
     )
 
     # ✅ 1. 날짜 기준으로 최신 데이터 가져오기
@@ -50,39 +62,35 @@ def get_latest_analysis(
         latest_meta = sorted_data[0]
         date = latest_meta.get("date", "")
 
-        print(f"[INFO] 최신 데이터 날짜: {date}")
+        logger.debug("최신 데이터 날짜: %s", date)
 
-        # summary_json 파싱
-        summary_json = latest_meta.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
-
-        raw_data = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
+        # summary 복원 (raw 바이너리 또는 summary_json)
+        raw_data, summary_text = summary_from_metadata(latest_meta)
 
         if not raw_data:
             raise HTTPException(400, "건강 데이터가 비어있습니다.")
 
         # 데이터 개수 및 출처 정보 출력
         same_date_data = [m for m in sorted_data if m.get("date") == date]
-        print(f"[INFO] 해당 날짜 데이터 개수: {len(same_date_data)}개")
-        for idx, m in enumerate(same_date_data[:3], 1):
-            source = m.get("source", "unknown")
-            score = m.get("health_score", 0)
-            print(f"[INFO] - 출처: {source}, 건강점수: {score}점")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("해당 날짜 데이터 개수: %d개", len(same_date_data))
+            for m in same_date_data[:3]:
+                logger.debug(
+                    "- 출처: %s, 건강점수: %s점",
+                    m.get("source", "unknown"), m.get("health_score", 0),
+                )
 
         # 데이터 출처 분석
         sources = [m.get("source", "unknown") for m in same_date_data]
         if "api_samsung" in sources or "api_apple" in sources:
-            print(f"[INFO] 분석 전략: API 최신 데이터 사용 (실시간)")
+            logger.debug("분석 전략: API 최신 데이터 사용 (실시간)")
         elif "zip_samsung" in sources or "zip_apple" in sources:
-            print(f"[WARN] 분석 전략: ZIP 업로드 데이터 사용 (과거 데이터)")
+            logger.warning("분석 전략: ZIP 업로드 데이터 사용 (과거 데이터)")
         else:
-            print(f"[WARN] 분석 전략: 출처 불명 데이터 사용")
+            logger.warning("분석 전략: 출처 불명 데이터 사용")
 
-        print(f"[INFO] 주요 데이터 키: {list(raw_data.keys())[:10]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("주요 데이터 키: %s...", list(raw_data.keys())[:10])
 
         # 데이터 품질 검증
         has_sleep = raw_data.get("sleep_hr", 0) > 0 or raw_data.get("sleep_min", 0) > 0
@@ -91,15 +99,12 @@ def get_latest_analysis(
         )
 
         if not has_sleep and not has_activity:
-            print(f"[WARN] 데이터 품질: 수면/활동량 모두 0 (빈 데이터 가능성)")
+            logger.warning("데이터 품질: 수면/활동량 모두 0 (빈 데이터 가능성)")
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[ERROR] 데이터 조회 실패: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("데이터 조회 실패: %s", e)
         raise HTTPException(500, f"데이터 조회 중 오류 발생: {str(e)}")
 
     # 2. ⭐ summary 형식으로 재구성 (run_llm_analysis가 요구하는 형식)
@@ -114,7 +119,7 @@ def get_latest_analysis(
             duration_min=duration,
         )
 
-        print("[SUCCESS] AI 분석 완료")
+        logger.info("AI 분석 완료: user_id=%s date=%s", user_id, date)
 
         return {
             "success": True,
@@ -127,10 +132,7 @@ def get_latest_analysis(
         }
 
     except Exception as e:
-        print(f"[ERROR] AI 분석 중 오류: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("AI 분석 중 오류: %s", e)
         raise HTTPException(500, f"AI 분석 중 오류가 발생했습니다: {str(e)}")
 
 
@@ -150,15 +152,8 @@ def get_raw_history(user_id: str = Query(...)):
 
     history = []
     for doc_id, meta in zip(ids, metas):
-        # summary_json 파싱
-        sj = meta.get("summary_json", "{}")
-        try:
-            parsed = json.loads(sj)
-        except:
-            parsed = {}
-
-        raw = parsed.get("raw", {})
-        summary_text = parsed.get("summary_text", "")
+        # summary 복원 (raw 바이너리 또는 summary_json)
+        raw, summary_text = summary_from_metadata(meta)
 
         history.append(
             {
@@ -173,3 +168,35 @@ def get_raw_history(user_id: str = Query(...)):
         )
 
     return {"user_id": user_id, "count": len(history), "data": history}
+
+
+# ------------------------------------------------------------
+# 3) 배치 분석 (여러 사용자 최신 분석 + 운동 추천)
+# ------------------------------------------------------------
+class BatchAnalysisRequest(BaseModel):
+    user_ids: list[str]
+    difficulty: str = "중"
+    duration: int = 30
+
+
+@router.post("/batch-analysis")
+async def batch_analysis(req: BatchAnalysisRequest):
+    """
+    여러 사용자의 최신 분석을 한 번에 요청 (아침 배치 작업용)
+
+    - VectorDB는 1회만 조회
+    - Fallback 대상은 LLM 없이 즉시 반환
+    - LLM 대상은 동시 호출 수 제한 (BATCH_LLM_CONCURRENCY)
+    - 결과는 사용자별 1줄씩 NDJSON으로 스트리밍
+    """
+    if not req.user_ids:
+        raise HTTPException(400, "user_ids가 비어있습니다.")
+
+    return StreamingResponse(
+        batch_service.stream_analyses(
+            user_ids=req.user_ids,
+            difficulty=req.difficulty,
+            duration=req.duration,
+        ),
+        media_type="application/x-ndjson",
+    )
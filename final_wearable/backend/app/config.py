@@ -46,12 +46,18 @@ ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",
 # ============================================================
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_data")
 CHROMA_COLLECTION_NAME = os.getenv("CHROMA_COLLECTION_NAME", "summaries")
+# 사용자별 데이터 버전 (캐시 무효화용, 같은 ChromaDB를 쓰는 워커 프로세스가 모두 공유)
+DATA_VERSION_DB = os.getenv("DATA_VERSION_DB", "./chroma_data/data_versions.sqlite3")
 
 # ============================================================
 # 로깅 설정
 # ============================================================
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_FILE = os.getenv("LOG_FILE", "app.log")  # JSON lines (비우면 파일 기록 안 함)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # 콘솔 출력 형식: text / json
+
+# 이 시간(초) 이상 걸린 요청은 단계별 소요 시간을 로그로 출력 (0이면 끔)
+TRACE_SLOW_REQUEST_SEC = float(os.getenv("TRACE_SLOW_REQUEST_SEC", "5"))
 
 # ============================================================
 # 기타 설정
@@ -64,5 +70,69 @@ DEFAULT_DURATION = 30  # 분
 RAG_TOP_K = int(os.getenv("RAG_TOP_K", "3"))
 RAG_SIMILARITY_THRESHOLD = float(os.getenv("RAG_SIMILARITY_THRESHOLD", "0.5"))
 
+# 로컬 intent 분류 모델 (비워두면 키워드 규칙만 사용)
+# 학습: python train_intent_model.py → app/core/chatbot_engine/data/intent_model.npz
+INTENT_MODEL_PATH = os.getenv("INTENT_MODEL_PATH", "")
+# 모델 확률이 이 값 미만이면 규칙 결과 사용
+INTENT_MODEL_MIN_CONFIDENCE = float(os.getenv("INTENT_MODEL_MIN_CONFIDENCE", "0.7"))
+
+# 챗봇 응답 캐시 (같은 사용자 / 데이터 버전 / 캐릭터 / intent / 날짜의 반복·유사 질문)
+CHAT_CACHE_MAX_SIZE = int(os.getenv("CHAT_CACHE_MAX_SIZE", "4096"))  # 0이면 사용 안 함
+CHAT_CACHE_TTL_SEC = float(os.getenv("CHAT_CACHE_TTL_SEC", "21600"))  # 6시간
+# 질문 문자 n-gram 코사인 유사도가 이 값 이상이면 같은 질문으로 간주 (1보다 크면 완전 일치만)
+CHAT_CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.85"))
+
+# 챗봇 대화 세션 (서버 메모리, 마지막 대화 후 TTL 동안 유지)
+CHAT_SESSION_MAX = int(os.getenv("CHAT_SESSION_MAX", "2000"))  # 메모리에 보관할 세션 수
+CHAT_SESSION_TTL_SEC = float(os.getenv("CHAT_SESSION_TTL_SEC", "1800"))  # 30분
+CHAT_SESSION_HISTORY_TURNS = int(os.getenv("CHAT_SESSION_HISTORY_TURNS", "4"))  # 원문으로 보낼 최근 턴 수
+CHAT_SESSION_SUMMARY_LINES = int(os.getenv("CHAT_SESSION_SUMMARY_LINES", "8"))  # 이전 턴 한 줄 요약 최대 수
+
+# 집계 질문용 사용자 날짜 테이블 (데이터 버전 단위 캐시)
+DAY_TABLE_MAX_USERS = int(os.getenv("DAY_TABLE_MAX_USERS", "1000"))  # 메모리에 보관할 사용자 수
+DAY_TABLE_TTL_SEC = float(os.getenv("DAY_TABLE_TTL_SEC", "3600"))  # 1시간 (버전 확인과 별개로 주기적 재생성)
+
+# 사용자별 최근 7 / 30 / 90일 누적 통계 (업로드마다 증분 갱신)
+ROLLING_STATS_MAX_USERS = int(os.getenv("ROLLING_STATS_MAX_USERS", "2000"))  # 메모리에 보관할 사용자 수
+ROLLING_STATS_TTL_SEC = float(os.getenv("ROLLING_STATS_TTL_SEC", "3600"))  # 1시간
+
+# 고정형 챗봇 리포트 (업로드 후 질문 × 캐릭터 전체 미리 생성)
+FIXED_REPORT_CONCURRENCY = int(os.getenv("FIXED_REPORT_CONCURRENCY", "3"))  # LLM 동시 호출 수
+FIXED_REPORT_MAX_USERS = int(os.getenv("FIXED_REPORT_MAX_USERS", "1000"))  # 메모리에 보관할 사용자 수
+FIXED_REPORT_TTL_SEC = float(os.getenv("FIXED_REPORT_TTL_SEC", "21600"))  # 6시간
+
 # 임베딩 배치 사이즈
 EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+
+# 배치 분석 (여러 사용자 동시 처리) 시 LLM 동시 호출 수
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+
+# 배치 분석 최신 데이터 조회 범위 (오늘 기준 최근 N일, 이 안에 데이터가 없는 사용자만 전체 기간 재조회)
+BATCH_LATEST_LOOKBACK_DAYS = int(os.getenv("BATCH_LATEST_LOOKBACK_DAYS", "14"))
+
+
+# ============================================================
+# 업로드 job 큐 설정
+# ============================================================
+# job 상태 저장용 SQLite 경로 (비워두면 zip_data/upload_jobs.sqlite3)
+UPLOAD_JOB_DB = os.getenv("UPLOAD_JOB_DB", "")
+# 동시에 처리할 업로드 job 수
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+# 같은 job 최대 실행 횟수 (재시작마다 재실행되다 worker를 계속 죽이는 job 방지)
+UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
+# 실행 중 job 점유 유효 시간 (초, 실행 중에는 1/3 간격으로 연장)
+# 이 시간 동안 연장이 없으면 (프로세스 종료) 다른 워커 프로세스가 가져가서 다시 실행
+UPLOAD_JOB_LEASE_SEC = float(os.getenv("UPLOAD_JOB_LEASE_SEC", "60"))
+# 배치 진행 상황(처리된 날짜 수) 저장 최소 간격 (초, 단계 시작 / 종료는 항상 저장)
+UPLOAD_JOB_PROGRESS_INTERVAL_SEC = float(os.getenv("UPLOAD_JOB_PROGRESS_INTERVAL_SEC", "1.0"))
+
+# ============================================================
+# 앱 자동 업로드 분석 병합 (짧은 시간 내 연속 업로드 → 분석 1회)
+# ============================================================
+# 마지막 업로드 후 이 시간 동안 추가 업로드가 없으면 분석 시작 (초)
+AUTO_ANALYSIS_DEBOUNCE_SEC = float(os.getenv("AUTO_ANALYSIS_DEBOUNCE_SEC", "1.5"))
+# 업로드가 계속 이어져도 첫 업로드 후 이 시간이 지나면 분석 시작 (초)
+AUTO_ANALYSIS_MAX_WAIT_SEC = float(os.getenv("AUTO_ANALYSIS_MAX_WAIT_SEC", "10"))
+
+# 일괄 업로드(/api/auto/upload/bulk) 요청당 최대 날짜 수 (임베딩 / upsert는 EMBEDDING_BATCH_SIZE씩)
+AUTO_UPLOAD_MAX_DAYS = int(os.getenv("AUTO_UPLOAD_MAX_DAYS", "366"))
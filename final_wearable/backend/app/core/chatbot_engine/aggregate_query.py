@@ -0,0 +1,130 @@
+"""
+Aggregate Query - 집계 질문 응답 (최대 / 최소 / 평균 / 합계 / 추이)
+
+"가장 많이 걸은 날 언제야?", "최저 수면"처럼 지표를 집계하는 질문은
+질문 임베딩 + 유사도 검색 대신 사용자 날짜 테이블(day_table)에서 바로 계산한다.
+- 임베딩 호출 없음, VectorDB 조회는 데이터 버전당 1번 (테이블 캐시)
+- argmax / argmin / 평균 / 합계 / 선형 추세 모두 NumPy 배열 연산
+
+사용 예:
+    intent = classify_intent("가장 많이 걸은 날 언제야?")
+    result = run_aggregate(user_id, intent["aggregate"])
+    format_aggregate_result(result)
+    # → "[2026-09-19 ~ 2026-10-19 걸음수 집계 (기록 30일)]\n가장 높은 날: 2026-10-03 (12,345보)"
+"""
+
+import numpy as np
+
+from app.core.day_table import load_day_table
+from app.utils.health_record import metric_label
+
+# 추이: (후반 평균 - 전반 평균) / 전반 평균이 이 비율 이상이면 증가 / 감소
+TREND_MIN_CHANGE = 0.05
+
+# 정수로 표시할 지표
+_INTEGER_METRICS = {"steps", "flights", "active_calories", "total_calories", "calories_intake"}
+
+
+# ================================================================
+#  1) 계산
+# ================================================================
+def aggregate_values(op: str, dates, values) -> dict:
+    """
+    (날짜, 값) 배열 → 집계 결과
+
+    Returns:
+        max / min: {"value", "date"}
+        avg / sum: {"value"}
+        trend: {"value" (평균), "slope" (하루당 변화), "first", "last" (전반 / 후반 평균),
+                "direction": "증가" | "감소" | "유지" | None (기록 2일 미만)}
+    """
+    if len(values) == 0:
+        return {}
+
+    if op in ("max", "min"):
+        index = int(np.argmax(values) if op == "max" else np.argmin(values))
+        return {"value": float(values[index]), "date": str(dates[index])}
+
+    if op == "sum":
+        return {"value": float(values.sum())}
+
+    result = {"value": float(values.mean())}
+    if op != "trend":
+        return result
+
+    if len(values) < 2:
+        return {**result, "slope": 0.0, "direction": None}
+
+    days = (dates - dates[0]).astype(np.float64)
+    slope = float(np.polyfit(days, values, 1)[0]) if days[-1] > 0 else 0.0
+
+    half = len(values) // 2
+    first, last = float(values[:half].mean()), float(values[half:].mean())
+    change = (last - first) / first if first else 0.0
+    if change >= TREND_MIN_CHANGE:
+        direction = "증가"
+    elif change <= -TREND_MIN_CHANGE:
+        direction = "감소"
+    else:
+        direction = "유지"
+
+    return {**result, "slope": slope, "first": first, "last": last, "direction": direction}
+
+
+def run_aggregate(user_id: str, aggregate: dict) -> dict:
+    """
+    classify_intent()["aggregate"] → 집계 결과
+
+    Returns:
+        {"op", "metric", "start_date", "end_date", "days": 기록 있는 날 수, ...aggregate_values()}
+    """
+    table = load_day_table(user_id)
+    dates, values = table.window(
+        aggregate["metric"], aggregate["start_date"], aggregate["end_date"]
+    )
+    return {
+        **aggregate,
+        "days": len(values),
+        **aggregate_values(aggregate["op"], dates, values),
+    }
+
+
+# ================================================================
+#  2) LLM 컨텍스트 포맷팅
+# ================================================================
+def _format_value(metric: str, value: float) -> str:
+    _, unit = metric_label(metric)
+    text = f"{value:,.0f}" if metric in _INTEGER_METRICS else f"{value:,.1f}"
+    return f"{text}{unit}"
+
+
+def format_aggregate_result(result: dict) -> str:
+    """run_aggregate() 결과 → LLM 프롬프트용 텍스트"""
+    metric = result["metric"]
+    label, _ = metric_label(metric)
+    header = (
+        f"[{result['start_date']} ~ {result['end_date']} {label} 집계 "
+        f"(기록 {result['days']}일)]"
+    )
+
+    if not result["days"]:
+        return f"{header}\n해당 기간 기록 없음"
+
+    op = result["op"]
+    value = _format_value(metric, result["value"])
+    if op == "max":
+        return f"{header}\n가장 높은 날: {result['date']} ({value})"
+    if op == "min":
+        return f"{header}\n가장 낮은 날: {result['date']} ({value})"
+    if op == "sum":
+        return f"{header}\n합계: {value}"
+    if op == "avg":
+        return f"{header}\n하루 평균: {value}"
+
+    lines = [header, f"하루 평균: {value}"]
+    if result["direction"]:
+        lines.append(
+            f"전반 평균 {_format_value(metric, result['first'])} → "
+            f"후반 평균 {_format_value(metric, result['last'])} ({result['direction']})"
+        )
+    return "\n".join(lines)
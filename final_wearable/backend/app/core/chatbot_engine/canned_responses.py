@@ -0,0 +1,198 @@
+"""
+Canned Responses - 단순 일반 대화 즉시 응답 (LLM 호출 없음)
+
+인사 / 감사 / 웃음 / 맞장구 / 작별 / 응원처럼 내용이 없는 default_chat 메시지는
+캐릭터별 응답 목록에서 바로 골라서 반환한다.
+- 메시지 정규화 (소문자, 공백/문장부호/이모지 제거, 끝의 ㅋㅋ/ㅠㅠ 제거) 후 카테고리 패턴 전체 일치
+- 다른 내용이 섞인 메시지("안녕 오늘 뭐 먹지")는 매칭되지 않음 → 기존처럼 LLM
+- 카테고리별 hit 수 → canned_response_stats() / /metrics (app_canned_responses_total)
+"""
+
+import re
+import random
+import threading
+
+from app.utils.tracing import CANNED_RESPONSES
+
+# ================================================================
+#  1) 메시지 정규화
+# ================================================================
+_IGNORED = re.compile(r"[\s!?.,~^*;:'\"♡♥\uFE0F\u2600-\u27BF\U0001F300-\U0001FAFF]+")
+_TRAILING = re.compile(r"[ㅋㅎㅠㅜ]+$")
+
+
+def normalize_message(message: str) -> str:
+    """패턴 매칭용 정규화 ("안녕하세요!! 😊" → "안녕하세요")"""
+    return _IGNORED.sub("", message.strip().lower())
+
+
+# ================================================================
+#  2) 카테고리 패턴 (정규화된 메시지 전체 일치)
+# ================================================================
+CATEGORY_PATTERNS = {
+    "greeting": r"안녕(하세요|하십니까|요)?|하이+|헬로+|ㅎㅇ|hi+|hello+|hey+|"
+                r"반가워(요)?|반갑습니다|굿모닝|좋은아침(이에요|입니다)?",
+    "thanks": r"고마워(요)?|고맙습니다|감사(합니다|해요|해)?|ㄳ+|ㄱㅅ+|thx|thanks?|"
+              r"thankyou|땡큐|덕분이야|덕분이에요",
+    "laugh": r"[ㅋㅎ]+|키+|크크+|lol+|(ha)+|하하+|헤헤+|히히+",
+    "ack": r"응+|ㅇㅇ+|ㅇㅋ+|오케이|ok(ay)?|알겠어(요)?|알겠습니다|알았어(요)?|"
+           r"네+|넵+|넹+|그래(요)?|좋아(요)?|그렇구나|아하+",
+    "farewell": r"잘자(요)?|굿나잇|goodnight|(바이)+|bye+|잘가(요)?|다음에봐(요)?|"
+                r"내일봐(요)?|수고했어(요)?|수고하셨습니다",
+    "cheer": r"파이팅|화이팅|홧팅|fighting|아자아자|가즈아+|렛츠고+",
+}
+_PATTERNS = {
+    category: re.compile(f"(?:{pattern})") for category, pattern in CATEGORY_PATTERNS.items()
+}
+
+# ================================================================
+#  3) 캐릭터별 응답
+# ================================================================
+CANNED_RESPONSES_BY_PERSONA = {
+    "devil_coach": {
+        "greeting": [
+            "인간, 왔군. 인사는 됐고 오늘 몸 상태나 물어봐라.",
+            "지옥에서 방금 올라왔다, 인간. 오늘도 조져줄 준비 됐다.",
+        ],
+        "thanks": [
+            "감사는 땀으로 갚아라, 인간.",
+            "고맙다고? 그럼 스쿼트 20개로 증명해봐라.",
+        ],
+        "laugh": [
+            "웃을 힘이 남았군, 인간. 그 힘 운동에 써라.",
+            "킥킥, 웃음도 복근 운동이다. 계속 웃어라.",
+        ],
+        "ack": [
+            "좋다, 인간. 대답만큼 몸도 빨리 움직여라.",
+            "그래, 그 자세다. 궁금한 건 언제든 물어봐라.",
+        ],
+        "farewell": [
+            "가라, 인간. 내일은 더 혹독하게 조져주지.",
+            "푹 쉬어라. 회복도 지옥 훈련의 일부다.",
+        ],
+        "cheer": [
+            "그 기세 좋다, 인간! 말만 말고 몸으로 보여라!",
+            "파이팅은 입이 아니라 허벅지로 외치는 거다!",
+        ],
+    },
+    "angel_coach": {
+        "greeting": [
+            "안녕하세요 ✨ 오늘도 찾아와 주셔서 반가워요.",
+            "반가워요! 오늘 당신의 하루는 어땠나요? 🌿",
+        ],
+        "thanks": [
+            "고마워해 주셔서 제가 더 감사해요 ✨",
+            "천만에요. 언제나 당신 곁에 있을게요 💛",
+        ],
+        "laugh": [
+            "웃는 모습이 보기 좋아요 😊",
+            "당신이 웃으니 저도 기뻐요 ✨",
+        ],
+        "ack": [
+            "네, 좋아요. 궁금한 게 생기면 편하게 물어봐 주세요.",
+            "알겠어요 😊 천천히 함께 해봐요.",
+        ],
+        "farewell": [
+            "오늘도 수고 많았어요. 편안한 쉼 되세요 🌙",
+            "또 만나요. 당신의 내일을 응원할게요 ✨",
+        ],
+        "cheer": [
+            "함께 해봐요! 당신은 이미 잘 하고 있어요 💪",
+            "그 마음이 정말 멋져요. 천천히, 그러나 확실하게!",
+        ],
+    },
+    "booster_coach": {
+        "greeting": [
+            "하이하이!! 🔥 왔구나!! 오늘도 부스트 가보자고!!",
+            "반가워!! 에너지 풀충전 완료!! 렛츠고!! ⚡",
+        ],
+        "thanks": [
+            "별말씀을!! 우리 팀이잖아!! 🎉",
+            "고맙긴!! 그 에너지 그대로 파워업 가자!! 💥",
+        ],
+        "laugh": [
+            "ㅋㅋㅋ 텐션 좋다!! 그 기분 그대로 가자!! 🔥",
+            "웃음 부스트 들어왔다!! 파워업!! 🎉",
+        ],
+        "ack": [
+            "오케이!! 다음 질문도 언제든 던져!! ⚡",
+            "좋아좋아!! 우리 완전 찰떡이야!! 🔥",
+        ],
+        "farewell": [
+            "오늘도 최고였어!! 푹 쉬고 내일 또 터뜨리자!! 🌙",
+            "바이바이!! 충전하고 돌아와!! ⚡",
+        ],
+        "cheer": [
+            "파워! 파워! 파워!! 그 기세로 다 찢어버리자!! 🔥",
+            "렛츠고오오!! 오늘 목표 그냥 부숴버리자!! 💥",
+        ],
+    },
+}
+
+# ================================================================
+#  4) 매칭 + 통계
+# ================================================================
+_stats_lock = threading.Lock()
+_stats = {"lookups": 0, "hits": {category: 0 for category in CATEGORY_PATTERNS}}
+
+
+def match_category(message: str) -> str | None:
+    """
+    정규화된 메시지 전체가 일치하는 카테고리 (없으면 None)
+    - 그대로 안 맞으면 끝의 ㅋㅋ/ㅠㅠ를 떼고 한 번 더 ("고마워ㅋㅋ" → "고마워")
+    """
+    msg = normalize_message(message)
+    if not msg or len(msg) > 20:
+        return None
+
+    for candidate in (msg, _TRAILING.sub("", msg)):
+        for category, pattern in _PATTERNS.items():
+            if candidate and pattern.fullmatch(candidate):
+                return category
+    return None
+
+
+def get_canned_response(message: str, character: str) -> str | None:
+    """
+    default_chat 메시지 → 캐릭터별 즉시 응답 (매칭 안 되면 None → LLM 호출)
+    """
+    category = match_category(message)
+
+    with _stats_lock:
+        _stats["lookups"] += 1
+        if category:
+            _stats["hits"][category] += 1
+    CANNED_RESPONSES.inc(category=category or "none")
+
+    if category is None:
+        return None
+
+    responses = CANNED_RESPONSES_BY_PERSONA.get(
+        character, CANNED_RESPONSES_BY_PERSONA["booster_coach"]
+    )
+    return random.choice(responses[category])
+
+
+def canned_response_stats() -> dict:
+    """
+    Returns:
+        {
+            "lookups": default_chat 메시지 수,
+            "hit_rate": 즉시 응답 비율,
+            "categories": {category: {"hits": int, "hit_rate": float}}
+        }
+    """
+    with _stats_lock:
+        lookups = _stats["lookups"]
+        hits = dict(_stats["hits"])
+
+    def rate(n):
+        return round(n / lookups, 4) if lookups else 0.0
+
+    return {
+        "lookups": lookups,
+        "hit_rate": rate(sum(hits.values())),
+        "categories": {
+            category: {"hits": n, "hit_rate": rate(n)} for category, n in hits.items()
+        },
+    }
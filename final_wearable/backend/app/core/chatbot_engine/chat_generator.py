@@ -9,19 +9,43 @@ import os
 import json
 from openai import OpenAI
 
-from app.core.chatbot_engine.intent_classifier import classify_intent
+from app.core.chatbot_engine.intent_classifier import classify_intent, HEALTH_KEYWORD_TOPICS
+from app.core.chatbot_engine.canned_responses import get_canned_response
+from app.core.chatbot_engine.aggregate_query import run_aggregate, format_aggregate_result
+from app.core.chatbot_engine.response_cache import (
+    date_key,
+    response_cache_key,
+    get_cached_response,
+    store_response,
+)
 from app.core.chatbot_engine.persona import get_persona_prompt
-from app.core.chatbot_engine.rag_query import query_health_data
+from app.core.chatbot_engine.rag_query import query_health_data, query_recent_window
 from app.core.llm_analysis import run_llm_analysis
+from app.core.rolling_stats import get_rolling_stats, format_trend_context
 from app.core.health_interpreter import (
-    interpret_health_data,
+    HealthInterpretation,
     build_health_context_for_llm,
 )
 from app.config import LLM_MODEL_MAIN, LLM_TEMPERATURE
+from app.utils.single_flight import single_flight
+from app.utils.tracing import span, record_llm_usage
 
 # ✅ 챗봇 응답용 토큰 제한 (간결화)
 CHAT_MAX_TOKENS = 400
 
+# 루틴 요청 시 조회할 최근 일수 (오늘 기준, 최신 날짜 + 유사 날짜 후보)
+ROUTINE_CANDIDATE_DAYS = 90
+
+# 질문 주제 → 최근 추세로 함께 보낼 지표 (누적 통계)
+TREND_TOPIC_METRICS = {
+    "sleep": ("sleep_hr",),
+    "body": ("weight", "bmi", "body_fat"),
+    "activity": ("steps", "distance_km", "exercise_min"),
+    "calories": ("active_calories", "calories_intake"),
+    "vitals": ("resting_heart_rate", "hrv", "oxygen_saturation"),
+    "status": ("health_score", "sleep_hr", "steps"),
+}
+
 
 class ChatGenerator:
 
@@ -32,17 +56,32 @@ class ChatGenerator:
     # 1) OpenAI 호출
     # ================================================================
     def _call_openai(
-        self, system_prompt: str, user_prompt: str, max_tokens: int = None
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = None,
+        session=None,
+        blocks: tuple = (),
     ):
-        resp = self.client.chat.completions.create(
-            model=LLM_MODEL_MAIN,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=LLM_TEMPERATURE,
-            max_tokens=max_tokens or CHAT_MAX_TOKENS,
-        )
+        """
+        session이 있으면 이전 대화(압축 요약 + 최근 턴)를 system과 새 질문 사이에 넣고,
+        이번에 보낸 prompt / 데이터 블록 날짜를 세션에 기록
+        """
+        history = session.history_messages() if session else []
+        with span("llm", operation="chat"):
+            resp = self.client.chat.completions.create(
+                model=LLM_MODEL_MAIN,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    *history,
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=LLM_TEMPERATURE,
+                max_tokens=max_tokens or CHAT_MAX_TOKENS,
+            )
+        record_llm_usage("chat", resp)
+        if session:
+            session.record_prompt(user_prompt, blocks)
         return resp.choices[0].message.content
 
     # ================================================================
@@ -125,6 +164,27 @@ class ChatGenerator:
 
         return "\n".join(context_parts)
 
+    def _trend_context(self, user_id: str, intent_result: dict) -> str:
+        """질문 주제 지표의 최근 7 / 30 / 90일 추세 (업로드 시 갱신된 누적 통계에서 바로 읽음)"""
+        health_keyword = intent_result.get("keywords", {}).get("health")
+        metrics = TREND_TOPIC_METRICS.get(HEALTH_KEYWORD_TOPICS.get(health_keyword))
+        if not metrics:
+            return ""
+        return format_trend_context(get_rolling_stats(user_id), metrics)
+
+    def _query(self, message: str, user_id: str, intent_result: dict, session=None) -> dict:
+        """query_health_data() (세션이 있으면 같은 날짜 / 같은 비교 질문의 조회 결과 재사용)"""
+        if session is None:
+            return query_health_data(message, user_id, intent_result=intent_result)
+
+        if intent_result.get("use_similarity"):
+            key = ("similarity", " ".join(message.split()))
+        else:
+            key = ("dates",) + date_key(intent_result.get("time_context"))
+        return session.retrieval(
+            key, lambda: query_health_data(message, user_id, intent_result=intent_result)
+        )
+
     # ================================================================
     # 4) 운동 루틴 템플릿 응답
     # ================================================================
@@ -175,10 +235,48 @@ class ChatGenerator:
     # ================================================================
     # 5) 메인 generate() - 개선 버전
     # ================================================================
-    def generate(self, user_id: str, message: str, character: str):
+    @single_flight("chat", params=("message", "character", "session_id"))
+    def generate(
+        self, user_id: str, message: str, character: str, session=None, session_id: str = None
+    ):
+        """
+        Args:
+            session: ChatSession (없으면 이전 대화 없이 단발 응답)
+            session_id: single-flight key 구분용 (같은 질문이라도 세션이 다르면 따로 생성)
+        """
 
         # ✅ 개선된 intent 분류 (시간/비교 컨텍스트 포함)
         intent_result = classify_intent(message)
+
+        # 세션 후속 질문: 날짜 표현이 없으면 이전 턴의 날짜를 이어받음
+        if session:
+            session.sync_data_version()
+            intent_result = session.resolve_intent(intent_result)
+
+        # 인사 / 감사 / ㅋㅋ 같은 단순 메시지는 LLM 없이 캐릭터별 즉시 응답
+        if intent_result["intent"] == "default_chat":
+            canned = get_canned_response(message, character)
+            if canned:
+                return canned
+
+        # 후속 질문("그거 더 자세히")은 앞 대화에 따라 답이 달라지므로 캐시는 첫 턴에만
+        if session is not None and not session.is_new:
+            return self._respond(user_id, message, character, intent_result, session)
+
+        # 같은 데이터 버전 / 날짜에 대한 반복·유사 질문은 이전 응답 재사용
+        cache_key = response_cache_key(user_id, character, intent_result)
+        cached = get_cached_response(cache_key, message)
+        if cached:
+            return cached
+
+        response = self._respond(user_id, message, character, intent_result, session)
+        store_response(cache_key, message, response)
+        return response
+
+    def _respond(
+        self, user_id: str, message: str, character: str, intent_result: dict, session=None
+    ):
+        """intent별 데이터 조회 + LLM 응답 생성"""
         intent = intent_result["intent"]
         time_context = intent_result.get("time_context")
         use_similarity = intent_result.get("use_similarity", False)
@@ -190,8 +288,20 @@ class ChatGenerator:
         # ================================================================
         if intent == "health_query":
 
+            # 집계 질문 (최대 / 최소 / 평균 / 합계 / 추이) → 날짜 테이블에서 바로 계산
+            # (질문 임베딩 / 유사도 검색 없음)
+            aggregate = intent_result.get("aggregate")
+            if aggregate:
+                system = self._build_system_prompt(persona_prompt, "comparison")
+                user_prompt = f"""질문: {message}
+
+{format_aggregate_result(run_aggregate(user_id, aggregate))}
+
+**위 집계 결과를 근거로 2-3문장으로 핵심만 답변하세요.**"""
+                return self._call_openai(system, user_prompt, max_tokens=300, session=session)
+
             # ✅ 개선: intent_result 전달하여 적절한 데이터 조회
-            rag = query_health_data(message, user_id, intent_result=intent_result)
+            rag = self._query(message, user_id, intent_result, session)
             similar = rag.get("similar_days", [])
             mode = rag.get("mode", "latest")
 
@@ -200,7 +310,7 @@ class ChatGenerator:
                 user_prompt = f"""질문: {message}
 
 데이터 없음. 일반 조언을 2문장으로."""
-                return self._call_openai(system, user_prompt, max_tokens=200)
+                return self._call_openai(system, user_prompt, max_tokens=200, session=session)
 
             # 데이터 컨텍스트 생성
             data_context = self._format_data_context(rag, message)
@@ -213,14 +323,33 @@ class ChatGenerator:
 {data_context}
 
 **여러 날짜 데이터를 비교하여 2-3문장으로 핵심만 답변하세요.**"""
+                blocks = ()
             else:
                 # 단일 데이터 (최신 or 특정 날짜)
                 top_raw = similar[0]["raw"]
-                health_context = build_health_context_for_llm(top_raw)
                 date_info = similar[0].get("date", "")
+                blocks = (date_info,)
 
                 system = self._build_system_prompt(persona_prompt, "health_query")
 
+                # 세션 후속 질문: 같은 날짜 데이터가 이미 대화에 있으면 질문만 전송
+                if session and session.block_sent(date_info):
+                    user_prompt = f"""질문: {message}
+
+([{date_info} 데이터]는 위 대화 참고)
+
+**2-3문장으로 핵심만 답변하세요.**"""
+                    return self._call_openai(
+                        system, user_prompt, max_tokens=300, session=session, blocks=blocks
+                    )
+
+                if session:
+                    health_context = session.context_block(
+                        date_info, lambda: build_health_context_for_llm(top_raw)
+                    )
+                else:
+                    health_context = build_health_context_for_llm(top_raw)
+
                 # 시간 표현이 있었으면 날짜 명시
                 if time_context:
                     user_prompt = f"""질문: {message}
@@ -230,6 +359,10 @@ class ChatGenerator:
 
 **2-3문장으로 핵심만 답변하세요.**"""
                 else:
+                    # 최신 데이터 질문은 주제 지표의 최근 추세도 함께
+                    trend_context = self._trend_context(user_id, intent_result)
+                    if trend_context:
+                        health_context = f"{health_context}\n\n{trend_context}"
                     user_prompt = f"""질문: {message}
 
 [최신 데이터: {date_info}]
@@ -237,7 +370,9 @@ class ChatGenerator:
 
 **2-3문장으로 핵심만 답변하세요.**"""
 
-            return self._call_openai(system, user_prompt, max_tokens=300)
+            return self._call_openai(
+                system, user_prompt, max_tokens=300, session=session, blocks=blocks
+            )
 
         # ================================================================
         # 2) 운동 루틴 요청 (routine_request)
@@ -245,15 +380,16 @@ class ChatGenerator:
         if intent == "routine_request":
 
             # ✅ 루틴 요청은 항상 최신 데이터 사용
-            rag = query_health_data(
-                message,
-                user_id,
-                intent_result={
-                    "intent": "routine_request",
-                    "time_context": None,
-                    "use_similarity": False,
-                },
-            )
+            # 오늘 기준 최근 ROUTINE_CANDIDATE_DAYS일을 범위 조회 1번으로 가져옴
+            # → 첫 항목(최신 날짜) + run_llm_analysis 유사 날짜 후보로 공유
+            # (기간 안에 기록이 없으면 데이터 없음으로 처리)
+            if session:
+                rag = session.retrieval(
+                    ("routine",),
+                    lambda: query_recent_window(user_id, ROUTINE_CANDIDATE_DAYS),
+                )
+            else:
+                rag = query_recent_window(user_id, ROUTINE_CANDIDATE_DAYS)
             similar = rag.get("similar_days", [])
 
             if not similar:
@@ -261,19 +397,22 @@ class ChatGenerator:
                 user_prompt = f"""요청: {message}
 
 데이터 없음. 기본 홈트 루틴을 2문장으로 설명."""
-                return self._call_openai(system, user_prompt, max_tokens=200)
+                return self._call_openai(system, user_prompt, max_tokens=200, session=session)
 
             top_raw = similar[0]["raw"]
-            health_interpretation = interpret_health_data(top_raw)
+            interpretation = HealthInterpretation(top_raw)
 
             routine_result = run_llm_analysis(
                 summary={
+                    "date": similar[0]["date"],
                     "raw": top_raw,
                     "summary_text": similar[0].get("summary_text", ""),
                 },
-                rag_result={"similar_days": similar},
+                user_id=user_id,
                 difficulty_level="중",
                 duration_min=30,
+                interpretation=interpretation,
+                candidates=similar,
             )
 
             analysis_text = routine_result.get(
@@ -282,7 +421,7 @@ class ChatGenerator:
             routine_data = routine_result.get("ai_recommended_routine", {})
 
             return self._format_routine_response(
-                character, analysis_text, routine_data, health_interpretation
+                character, analysis_text, routine_data, interpretation.as_dict()
             )
 
         # ================================================================
@@ -292,4 +431,4 @@ class ChatGenerator:
         user_prompt = f"""메시지: {message}
 
 **1-2문장으로 짧게 응답.**"""
-        return self._call_openai(system, user_prompt, max_tokens=150)
+        return self._call_openai(system, user_prompt, max_tokens=150, session=session)
@@ -0,0 +1,177 @@
+"""
+Chat Session - 서버 측 대화 세션 (메모리, TTL + 최대 개수 제한)
+
+여러 턴에 걸쳐 같은 날짜를 이야기할 때 매번 intent → Chroma 조회 → 컨텍스트 생성을
+반복하지 않도록 세션에 보관하고 재사용한다.
+
+- 해석된 날짜 (time_context): 날짜 표현 없는 후속 질문("그럼 심박은?")은 이전 날짜를 이어받음
+- 조회 결과 / build_health_context_for_llm() 블록: 데이터 버전별로 재사용
+- 대화 기록: 최근 N턴은 그대로, 이전 턴은 한 줄 요약으로 압축 (rolling)
+- 이미 대화 기록에 들어있는 데이터 블록은 다시 보내지 않음 → 모델에는 새 질문(변경분)만 전달
+- 세션은 이 프로세스 메모리에만 있음: 워커가 여러 개면 다른 워커로 간 요청은 새 대화로 시작
+  (같은 대화를 이어가려면 session_id 기준 sticky 라우팅 필요)
+
+사용 예:
+    session = get_or_create_session(session_id, user_id, character)
+    with session.lock:
+        response = generator.generate(
+            user_id, message, character, session=session, session_id=session.session_id
+        )
+        session.add_turn(message, response)
+    save_session(session)
+"""
+
+import re
+import uuid
+import threading
+from collections import deque
+
+from app.config import (
+    CHAT_SESSION_MAX,
+    CHAT_SESSION_TTL_SEC,
+    CHAT_SESSION_HISTORY_TURNS,
+    CHAT_SESSION_SUMMARY_LINES,
+)
+from app.utils.data_version import get_data_version
+from app.utils.lru_cache import LRUCache
+
+# 세션당 보관할 조회 결과 수 (초과 시 오래된 것부터 제거)
+MAX_RETRIEVALS = 8
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s|\n")
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _first_sentence(text: str) -> str:
+    return _SENTENCE_END.split(text.strip(), maxsplit=1)[0]
+
+
+class ChatSession:
+    def __init__(self, user_id: str, character: str, session_id: str = None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.user_id = user_id
+        self.character = character
+        self.lock = threading.Lock()  # 같은 세션의 턴은 순서대로 처리
+
+        self.data_version = get_data_version(user_id)
+        self.time_context = None  # 마지막으로 해석된 날짜 / 기간
+        self._retrievals = {}  # 조회 key → query_health_data() 결과
+        self._contexts = {}  # (데이터 버전, 날짜) → 건강 컨텍스트 블록
+
+        self._turns = deque()  # {"message", "prompt", "response", "blocks"}
+        self._summary = deque(maxlen=CHAT_SESSION_SUMMARY_LINES)
+        self._pending = None  # 이번 턴에 모델로 보낸 (prompt, blocks)
+
+    # ------ 1) 데이터 버전 ------
+    def sync_data_version(self):
+        """새 데이터가 업로드됐으면 조회 결과 / 컨텍스트 블록 폐기"""
+        version = get_data_version(self.user_id)
+        if version != self.data_version:
+            self.data_version = version
+            self._retrievals.clear()
+            self._contexts.clear()
+
+    @property
+    def is_new(self) -> bool:
+        return not self._turns and not self._summary
+
+    # ------ 2) 날짜 이어받기 ------
+    def resolve_intent(self, intent_result: dict) -> dict:
+        """
+        날짜 표현이 없는 건강 질문은 세션의 날짜를 이어받고,
+        새 날짜 표현이 있으면 세션 날짜를 갱신
+        """
+        if intent_result["intent"] != "health_query" or intent_result.get("use_similarity"):
+            return intent_result
+
+        if intent_result.get("time_context"):
+            self.time_context = intent_result["time_context"]
+            return intent_result
+
+        if self.time_context:
+            return {**intent_result, "time_context": self.time_context, "inherited": True}
+        return intent_result
+
+    # ------ 3) 조회 / 컨텍스트 재사용 ------
+    def retrieval(self, key: tuple, fetch):
+        """같은 데이터 버전 / 같은 조회 key면 이전 결과 재사용"""
+        key = (self.data_version,) + key
+        if key not in self._retrievals:
+            if len(self._retrievals) >= MAX_RETRIEVALS:
+                self._retrievals.pop(next(iter(self._retrievals)))
+            self._retrievals[key] = fetch()
+        return self._retrievals[key]
+
+    def context_block(self, date: str, build) -> str:
+        key = (self.data_version, date)
+        if key not in self._contexts:
+            self._contexts[key] = build()
+        return self._contexts[key]
+
+    def block_sent(self, date: str) -> bool:
+        """이 날짜 데이터 블록이 (압축되지 않은) 대화 기록에 이미 있는지"""
+        key = (self.data_version, date)
+        return any(key in turn["blocks"] for turn in self._turns)
+
+    # ------ 4) 대화 기록 ------
+    def history_messages(self) -> list:
+        """모델에 보낼 이전 대화 (압축 요약 1개 + 최근 턴 원문)"""
+        messages = []
+        if self._summary:
+            messages.append({
+                "role": "system",
+                "content": "이전 대화 요약:\n" + "\n".join(self._summary),
+            })
+        for turn in self._turns:
+            messages.append({"role": "user", "content": turn["prompt"]})
+            messages.append({"role": "assistant", "content": turn["response"]})
+        return messages
+
+    def record_prompt(self, prompt: str, blocks: tuple = ()):
+        """이번 턴에 실제로 모델에 보낸 prompt / 데이터 블록 날짜 기록"""
+        self._pending = (prompt, {(self.data_version, date) for date in blocks})
+
+    def add_turn(self, message: str, response: str):
+        """턴 추가 (최근 N턴 초과분은 한 줄 요약으로 압축)"""
+        prompt, blocks = self._pending or (message, set())
+        self._pending = None
+        self._turns.append(
+            {"message": message, "prompt": prompt, "response": response or "", "blocks": blocks}
+        )
+
+        while len(self._turns) > CHAT_SESSION_HISTORY_TURNS:
+            turn = self._turns.popleft()
+            self._summary.append(
+                f"- 사용자: {_shorten(turn['message'], 40)} → "
+                f"코치: {_shorten(_first_sentence(turn['response']), 60)}"
+            )
+
+
+# ================================================================
+#  세션 저장소
+# ================================================================
+_sessions = LRUCache("chat_session", max_size=CHAT_SESSION_MAX, ttl=CHAT_SESSION_TTL_SEC)
+
+
+def get_or_create_session(session_id: str | None, user_id: str, character: str) -> ChatSession:
+    """
+    세션 조회 (없거나 만료됐거나 다른 사용자의 세션이면 새로 생성)
+    """
+    session = _sessions.get(session_id) if session_id else None
+    if session is None or session.user_id != user_id:
+        session = ChatSession(user_id, character)
+    session.character = character
+    return session
+
+
+def save_session(session: ChatSession):
+    """턴 처리 후 저장 (TTL 갱신)"""
+    _sessions.set(session.session_id, session)
+
+
+def session_stats() -> dict:
+    return _sessions.stats()
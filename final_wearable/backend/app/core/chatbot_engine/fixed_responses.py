@@ -3,9 +3,13 @@ Fixed Responses - 고정형 질문 응답 생성기 (개선 버전)
 - 최신 데이터 우선 조회
 - 같은 날짜 중복 제거
 - 속도 유지: 각 질문당 LLM 1회 호출
+- 업로드 후 질문 × 캐릭터 전체 리포트를 미리 생성 → 요청 시 조회만
 """
 
 import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 import os
 
@@ -15,22 +19,44 @@ from app.config import (
     LLM_MAX_TOKENS,
     DEFAULT_DIFFICULTY,
     DEFAULT_DURATION,
+    FIXED_REPORT_CONCURRENCY,
+    FIXED_REPORT_MAX_USERS,
+    FIXED_REPORT_TTL_SEC,
 )
 from app.core.chatbot_engine.persona import get_persona_prompt
-from app.core.vector_store import get_recent_summaries, search_similar_summaries
+from app.core.vector_store import get_recent_summaries
 from app.core.llm_analysis import run_llm_analysis
-from app.core.health_interpreter import (
-    interpret_health_data,
-    build_health_context_for_llm,
-    calculate_health_score,
-    interpret_sleep,
-    interpret_heart_rate,
-    interpret_activity,
-)
+from app.core.rolling_stats import get_rolling_stats, format_trend_context
+from app.core.health_interpreter import HealthInterpretation
+from app.utils.data_version import get_data_version
+from app.utils.lru_cache import LRUCache
+from app.utils.single_flight import single_flight
+from app.utils.tracing import span, record_llm_usage, bind_context, FIXED_REPORTS
+
+logger = logging.getLogger(__name__)
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
+# 고정형 질문 종류 / 캐릭터 (업로드 후 전체 조합을 미리 생성)
+FIXED_QUESTION_TYPES = (
+    "weekly_report",
+    "today_recommendation",
+    "weekly_steps",
+    "sleep_report",
+    "heart_rate",
+    "health_score",
+)
+PERSONAS = ("devil_coach", "angel_coach", "booster_coach")
+
+# 사용자별 미리 생성된 리포트: user_id → {"version": 데이터 버전, "reports": {(질문, 캐릭터): 응답}}
+_report_store = LRUCache(
+    "fixed_reports", max_size=FIXED_REPORT_MAX_USERS, ttl=FIXED_REPORT_TTL_SEC
+)
+_report_store_lock = threading.Lock()
+
+
+@single_flight("chat_fixed", params=("question_type", "character"))
 def generate_fixed_response(user_id: str, question_type: str, character: str):
     """
     고정형 질문을 처리하는 엔진 (개선 버전)
@@ -38,42 +64,151 @@ def generate_fixed_response(user_id: str, question_type: str, character: str):
     개선 사항:
     - get_recent_summaries() 사용으로 최신 데이터 우선 조회
     - 같은 날짜 중복 자동 제거
+    - 업로드 후 미리 생성된 리포트가 있으면 바로 반환 (현재 데이터 버전 기준)
+      → 없으면 생성 후 저장 (다음 요청부터 바로 반환)
     """
 
-    # ✅ 디버그 로그
-    print(f"\n{'='*60}")
-    print(f"🤖 고정형 챗봇 요청")
-    print(f"{'='*60}")
-    print(f"   user_id: {user_id}")
-    print(f"   question_type: {question_type}")
-    print(f"   character: {character}")
+    logger.info(
+        "고정형 챗봇 요청: user_id=%s question_type=%s character=%s",
+        user_id, question_type, character,
+    )
 
-    persona = get_persona_prompt(character)
+    if question_type not in FIXED_QUESTION_TYPES:
+        return "⚠️ 알 수 없는 question_type 입니다."
+
+    version = get_data_version(user_id)
+    report = get_stored_report(user_id, version, question_type, character)
+    if report is not None:
+        FIXED_REPORTS.inc(result="stored")
+        return report
+
+    FIXED_REPORTS.inc(result="computed")
+    context = _load_report_context(user_id)
+    report = _build_report(context, user_id, question_type, character)
+    if context is not None:
+        _store_reports(user_id, version, {(question_type, character): report})
+    return report
+
+
+def precompute_fixed_responses(user_id: str) -> int:
+    """
+    모든 고정형 질문 × 캐릭터 리포트를 미리 생성해서 저장 (업로드 후 백그라운드)
+
+    - 최근 7일 데이터 조회 / 규칙 기반 해석은 1회만
+    - LLM 호출은 FIXED_REPORT_CONCURRENCY개씩 병렬
+      (같은 질문의 캐릭터 3개를 연달아 제출 → 오늘 운동 추천의 LLM 분석은 single-flight로 공유)
+
+    Returns:
+        저장된 리포트 수 (데이터가 없으면 0)
+    """
+    version = get_data_version(user_id)
+    context = _load_report_context(user_id)
+    if context is None:
+        return 0
+
+    jobs = [
+        (question_type, character)
+        for question_type in FIXED_QUESTION_TYPES
+        for character in PERSONAS
+    ]
+    with span("fixed_reports_precompute"):
+        with ThreadPoolExecutor(max_workers=FIXED_REPORT_CONCURRENCY) as pool:
+            futures = {
+                job: pool.submit(bind_context(_build_report, context, user_id, *job))
+                for job in jobs
+            }
+
+        reports = {}
+        for job, future in futures.items():
+            try:
+                reports[job] = future.result()
+            except Exception as e:
+                logger.warning("고정형 리포트 생성 실패: user_id=%s job=%s error=%s", user_id, job, e)
+
+    _store_reports(user_id, version, reports)
+    logger.info(
+        "고정형 리포트 미리 생성: user_id=%s version=%d reports=%d/%d",
+        user_id, version, len(reports), len(jobs),
+    )
+    return len(reports)
+
+
+# ============================================================
+# 리포트 저장소
+# ============================================================
+
+
+def get_stored_report(user_id: str, version: int, question_type: str, character: str):
+    """현재 데이터 버전으로 생성된 리포트 (없으면 None)"""
+    entry = _report_store.get(user_id)
+    if entry is None or entry["version"] != version:
+        return None
+    return entry["reports"].get((question_type, character))
+
+
+def _store_reports(user_id: str, version: int, reports: dict):
+    if not reports:
+        return
+    with _report_store_lock:
+        entry = _report_store.setdefault(user_id, {"version": version, "reports": {}})
+        if entry["version"] > version:
+            return  # 더 최신 데이터 기준 리포트가 이미 있음
+        if entry["version"] < version:
+            entry = {"version": version, "reports": {}}
+            _report_store.set(user_id, entry)
+        entry["reports"].update(reports)
+
+
+# ============================================================
+# 리포트 생성
+# ============================================================
+
+
+def _load_report_context(user_id: str) -> dict | None:
+    """최근 7일 데이터 + 최신 날짜 해석 (데이터가 없으면 None)"""
 
     # ✅ 개선: 최신 날짜순으로 데이터 조회 (중복 제거 포함)
-    print(f"\n[DEBUG] get_recent_summaries 호출 중...")
     summaries = get_recent_summaries(user_id, limit=7)
-    print(f"[DEBUG] 조회 결과: {len(summaries)}개 데이터")
 
-    if summaries:
+    # ✅ 디버그 로그
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("get_recent_summaries 조회 결과: %d개 데이터", len(summaries))
         for i, s in enumerate(summaries[:3]):
-            print(
-                f"   [{i+1}] {s.get('date')} | source: {s.get('source')} | score: {s.get('health_score')}"
+            logger.debug(
+                "[%d] %s | source: %s | score: %s",
+                i + 1, s.get("date"), s.get("source"), s.get("health_score"),
             )
 
-    # summary 없을 경우 fallback
     if not summaries:
-        return _get_no_data_response(character)
+        return None
 
     # 최근 summary 데이터 추출 (가장 최신)
     recent = summaries[0]
-    recent_raw = recent.get("raw", {})
-    recent_summary_text = recent.get("summary_text", "")
-    recent_date = recent.get("date", "최근")
 
     # 규칙 기반 건강 해석 (LLM 호출 없음!)
-    health_interpretation = interpret_health_data(recent_raw)
-    health_context = build_health_context_for_llm(recent_raw)
+    interpretation = HealthInterpretation(recent.get("raw", {}))
+
+    return {
+        "summaries": summaries,
+        "recent_raw": recent.get("raw", {}),
+        "recent_summary_text": recent.get("summary_text", ""),
+        "interpretation": interpretation,
+        "health_interpretation": interpretation.as_dict(),
+        "health_context": interpretation.health_context,
+    }
+
+
+def _build_report(context: dict | None, user_id: str, question_type: str, character: str):
+    """question_type별 리포트 생성 (context가 없으면 데이터 없음 응답)"""
+
+    # summary 없을 경우 fallback
+    if context is None:
+        return _get_no_data_response(character)
+
+    persona = get_persona_prompt(character)
+    summaries = context["summaries"]
+    recent_raw = context["recent_raw"]
+    health_interpretation = context["health_interpretation"]
 
     # ================================
     # 1) 주간 리포트
@@ -85,7 +220,8 @@ def generate_fixed_response(user_id: str, question_type: str, character: str):
             recent_raw,
             summaries,
             health_interpretation,
-            health_context,
+            context["health_context"],
+            get_rolling_stats(user_id),
         )
 
     # ================================
@@ -95,9 +231,9 @@ def generate_fixed_response(user_id: str, question_type: str, character: str):
         return _generate_today_recommendation(
             character,
             recent_raw,
-            recent_summary_text,
+            context["recent_summary_text"],
             summaries,
-            health_interpretation,
+            context["interpretation"],
             user_id,
         )
 
@@ -106,7 +242,12 @@ def generate_fixed_response(user_id: str, question_type: str, character: str):
     # ================================
     if question_type == "weekly_steps":
         return _generate_steps_report(
-            persona, character, recent_raw, summaries, health_interpretation
+            persona,
+            character,
+            recent_raw,
+            summaries,
+            health_interpretation,
+            get_rolling_stats(user_id),
         )
 
     # ================================
@@ -114,7 +255,12 @@ def generate_fixed_response(user_id: str, question_type: str, character: str):
     # ================================
     if question_type == "sleep_report":
         return _generate_sleep_report(
-            persona, character, recent_raw, summaries, health_interpretation
+            persona,
+            character,
+            recent_raw,
+            summaries,
+            health_interpretation,
+            get_rolling_stats(user_id),
         )
 
     # ================================
@@ -152,24 +298,22 @@ def _get_no_data_response(character: str) -> str:
 
 
 def _generate_weekly_report(
-    persona, character, raw, summaries, health_info, health_context
+    persona, character, raw, summaries, health_info, health_context, stats
 ):
     """주간 건강 리포트 생성"""
 
-    # 여러 날의 데이터 집계
-    total_steps = 0
-    total_calories = 0
-    avg_sleep = 0
-    days_count = len(summaries)
-
-    for day in summaries[:7]:
-        day_raw = day.get("raw", {})
-        total_steps += day_raw.get("steps", 0)
-        total_calories += day_raw.get("active_calories", 0)
-        avg_sleep += day_raw.get("sleep_hr", 0)
-
-    if days_count > 0:
-        avg_sleep = avg_sleep / days_count
+    # 최근 7일 집계 (누적 통계 - 업로드 시점에 갱신, 측정 안 된 날 제외)
+    steps = stats.window("steps", 7)
+    calories = stats.window("active_calories", 7)
+    sleep = stats.window("sleep_hr", 7)
+
+    total_steps = int(steps["total"] or 0)
+    total_calories = int(calories["total"] or 0)
+    avg_sleep = sleep["mean"] or 0
+    days_count = max(steps["days"], calories["days"], sleep["days"])
+    trend_context = format_trend_context(
+        stats, ("steps", "sleep_hr", "active_calories", "health_score")
+    )
 
     # 건강 점수
     score_info = health_info.get("health_score", {})
@@ -193,12 +337,14 @@ def _generate_weekly_report(
 ### 최근 측정 데이터
 {health_context}
 
-### 주간 집계 (최근 {days_count}일)
+### 주간 집계 (최근 7일 중 기록 {days_count}일)
 • 총 걸음수: {total_steps:,}보
-• 일 평균 걸음: {total_steps // max(days_count, 1):,}보
+• 일 평균 걸음: {int(steps["mean"] or 0):,}보
 • 총 소모 칼로리: {total_calories:,}kcal
 • 평균 수면: {avg_sleep:.1f}시간
 
+{trend_context}
+
 ### 종합 건강 점수
 • 점수: {score_info.get('score', 50)}점
 • 등급: {score_info.get('grade', 'C')} ({score_info.get('grade_text', '보통')})
@@ -212,27 +358,31 @@ def _generate_weekly_report(
 5. 3-4문단으로 자연스럽게 작성하세요 (리스트/불릿 금지)
 """
 
-    resp = client.chat.completions.create(
-        model=LLM_MODEL_MAIN,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=LLM_MAX_TOKENS,
-        temperature=LLM_TEMPERATURE,
-    )
+    with span("llm", operation="generate_weekly_report"):
+        resp = client.chat.completions.create(
+            model=LLM_MODEL_MAIN,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=LLM_MAX_TOKENS,
+            temperature=LLM_TEMPERATURE,
+        )
+    record_llm_usage("generate_weekly_report", resp)
     return resp.choices[0].message.content
 
 
 def _generate_today_recommendation(
-    character, raw, summary_text, summaries, health_info, user_id
+    character, raw, summary_text, summaries, interpretation, user_id
 ):
     """오늘 운동 추천 - 템플릿 기반 (LLM 추가 호출 없음!)"""
 
-    # LLM 분석 1회 호출
+    # LLM 분석 1회 호출 (규칙 기반 해석은 재사용)
     routine = run_llm_analysis(
         summary={"raw": raw, "summary_text": summary_text},
         user_id=user_id,
         difficulty_level=DEFAULT_DIFFICULTY,
         duration_min=DEFAULT_DURATION,
+        interpretation=interpretation,
     )
+    health_info = interpretation.as_dict()
 
     analysis = routine.get("analysis", "오늘 컨디션에 맞는 루틴입니다.")
     routine_data = routine.get("ai_recommended_routine", {})
@@ -323,7 +473,7 @@ def _generate_today_recommendation(
     return "".join(response_parts)
 
 
-def _generate_steps_report(persona, character, raw, summaries, health_info):
+def _generate_steps_report(persona, character, raw, summaries, health_info, stats):
     """걸음수 분석 리포트"""
 
     # 여러 날의 걸음수 집계
@@ -338,9 +488,12 @@ def _generate_steps_report(persona, character, raw, summaries, health_info):
             }
         )
 
-    total_steps = sum(d["steps"] for d in steps_data)
-    avg_steps = total_steps // max(len(steps_data), 1)
-    total_distance = sum(d["distance"] for d in steps_data)
+    # 집계는 누적 통계 (최근 7일, 측정 안 된 날 제외)
+    steps = stats.window("steps", 7)
+    total_steps = int(steps["total"] or 0)
+    avg_steps = int(steps["mean"] or 0)
+    total_distance = stats.window("distance_km", 7)["total"] or 0
+    trend_context = format_trend_context(stats, ("steps", "distance_km"))
 
     activity_info = health_info.get("activity", {})
 
@@ -354,11 +507,13 @@ def _generate_steps_report(persona, character, raw, summaries, health_info):
 ### 최근 {len(steps_data)}일 기록
 {json.dumps(steps_data, ensure_ascii=False, indent=2)}
 
-### 집계
+### 집계 (최근 7일 중 기록 {steps["days"]}일)
 • 총 걸음수: {total_steps:,}보
 • 일 평균: {avg_steps:,}보
 • 총 이동거리: {total_distance:.2f}km
 
+{trend_context}
+
 ### 활동량 평가
 • 활동 레벨: {activity_info.get('activity_level', 'unknown')}
 • 분석: {activity_info.get('message', '')}
@@ -372,16 +527,18 @@ def _generate_steps_report(persona, character, raw, summaries, health_info):
 5. 2-3문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
-        model=LLM_MODEL_MAIN,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=600,
-        temperature=LLM_TEMPERATURE,
-    )
+    with span("llm", operation="generate_steps_report"):
+        resp = client.chat.completions.create(
+            model=LLM_MODEL_MAIN,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=600,
+            temperature=LLM_TEMPERATURE,
+        )
+    record_llm_usage("generate_steps_report", resp)
     return resp.choices[0].message.content
 
 
-def _generate_sleep_report(persona, character, raw, summaries, health_info):
+def _generate_sleep_report(persona, character, raw, summaries, health_info, stats):
     """수면 분석 리포트"""
 
     # 여러 날의 수면 데이터 집계
@@ -396,8 +553,10 @@ def _generate_sleep_report(persona, character, raw, summaries, health_info):
             }
         )
 
-    valid_sleep = [d for d in sleep_data if d["sleep_hr"] > 0]
-    avg_sleep = sum(d["sleep_hr"] for d in valid_sleep) / max(len(valid_sleep), 1)
+    # 집계는 누적 통계 (최근 7일, 측정 안 된 날 제외)
+    sleep = stats.window("sleep_hr", 7)
+    avg_sleep = sleep["mean"] or 0
+    trend_context = format_trend_context(stats, ("sleep_hr",))
 
     sleep_info = health_info.get("sleep", {})
 
@@ -413,7 +572,9 @@ def _generate_sleep_report(persona, character, raw, summaries, health_info):
 
 ### 집계
 • 평균 수면: {avg_sleep:.1f}시간
-• 유효 기록 일수: {len(valid_sleep)}일
+• 유효 기록 일수: {sleep["days"]}일
+
+{trend_context}
 
 ### 수면 상태 분석
 • 상태: {sleep_info.get('status', 'unknown')}
@@ -430,12 +591,14 @@ def _generate_sleep_report(persona, character, raw, summaries, health_info):
 5. 2-3문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
-        model=LLM_MODEL_MAIN,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=600,
-        temperature=LLM_TEMPERATURE,
-    )
+    with span("llm", operation="generate_sleep_report"):
+        resp = client.chat.completions.create(
+            model=LLM_MODEL_MAIN,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=600,
+            temperature=LLM_TEMPERATURE,
+        )
+    record_llm_usage("generate_sleep_report", resp)
     return resp.choices[0].message.content
 
 
@@ -475,12 +638,14 @@ def _generate_heart_rate_report(persona, character, raw, health_info):
 5. 2-3문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
-        model=LLM_MODEL_MAIN,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=600,
-        temperature=LLM_TEMPERATURE,
-    )
+    with span("llm", operation="generate_heart_rate_report"):
+        resp = client.chat.completions.create(
+            model=LLM_MODEL_MAIN,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=600,
+            temperature=LLM_TEMPERATURE,
+        )
+    record_llm_usage("generate_heart_rate_report", resp)
     return resp.choices[0].message.content
 
 
@@ -531,10 +696,12 @@ def _generate_health_score_report(persona, character, raw, health_info):
 6. 3-4문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
-        model=LLM_MODEL_MAIN,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=700,
-        temperature=LLM_TEMPERATURE,
-    )
+    with span("llm", operation="generate_health_score_report"):
+        resp = client.chat.completions.create(
+            model=LLM_MODEL_MAIN,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=700,
+            temperature=LLM_TEMPERATURE,
+        )
+    record_llm_usage("generate_health_score_report", resp)
     return resp.choices[0].message.content
@@ -2,32 +2,46 @@
 Intent Classifier - 개선 버전
 - 시간 표현 감지 추가
 - 비교/패턴 키워드 감지 추가
+- 집계 질문 감지 (최대 / 최소 / 평균 / 합계 / 추이 × 지표 × 기간)
 - 규칙 기반만 사용 (LLM 호출 없음)
+- 모든 키워드 목록은 하나의 automaton으로 컴파일 → 메시지당 1회 스캔
+- (선택) 로컬 ML 모델 (intent_model.py) → 신뢰도가 낮으면 규칙 결과 사용
 """
 
-import time
 import re
 from datetime import datetime, timedelta
 
+from app.utils.keyword_automaton import KeywordAutomaton
+from app.utils.lru_cache import LRUCache
+
 # ================================================================
-#  캐싱 (5분 TTL)
+#  캐싱 (5분 TTL, 최대 2048개 LRU)
 # ================================================================
-_intent_cache = {}
+# 날짜와 무관한 분류 결과만 저장 (intent / 키워드 / 시간 표현 종류)
+# → 날짜는 조회할 때마다 오늘 기준으로 다시 계산 ("어제"가 자정을 넘겨도 정확)
 CACHE_TTL = 300  # 60초 → 300초로 연장
+CACHE_MAX_SIZE = 2048
+_intent_cache = LRUCache("intent", max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL)
 
+# ================================================================
+#  로컬 ML 모델 (선택, 서버 시작 시 set_intent_model()로 등록)
+# ================================================================
+_intent_model = None
+_model_min_confidence = 0.7
 
-def _cache_get(key):
-    data = _intent_cache.get(key)
-    if not data:
-        return None
-    intent, timestamp = data
-    if time.time() - timestamp > CACHE_TTL:
-        return None
-    return intent
 
+def set_intent_model(model, min_confidence: float = 0.7):
+    """
+    로컬 intent 모델 등록 (None이면 규칙만 사용)
 
-def _cache_set(key, intent):
-    _intent_cache[key] = (intent, time.time())
+    Args:
+        model: IntentModel (predict(message) → intent / confidence / use_similarity)
+        min_confidence: 이 확률 미만이면 해당 항목은 규칙 결과 사용
+    """
+    global _intent_model, _model_min_confidence
+    _intent_model = model
+    _model_min_confidence = min_confidence
+    _intent_cache.clear()
 
 
 # ================================================================
@@ -111,65 +125,168 @@ COMPARISON_KEYWORDS = [
     "그때",
 ]
 
+# ================================================================
+#  집계 질문 키워드 (최대 / 최소 / 평균 / 합계 / 추이) - 날짜 테이블로 계산
+# ================================================================
+# 목록 순서 = 우선순위 ("가장 많이"와 "변화"가 같이 있으면 max)
+AGGREGATE_OP_KEYWORD_GROUPS = {
+    "max": [
+        "가장 많이", "제일 많이", "가장 많은", "제일 많은", "가장 높", "제일 높",
+        "가장 길", "제일 길", "가장 오래", "제일 오래", "가장 좋", "제일 좋",
+        "최고", "최대", "최다",
+    ],
+    "min": [
+        "가장 적게", "제일 적게", "가장 적", "제일 적", "가장 낮", "제일 낮",
+        "가장 짧", "제일 짧", "가장 나쁜", "제일 나쁜", "가장 안 좋", "제일 안 좋",
+        "최저", "최소",
+    ],
+    "avg": ["평균", "average", "보통 몇", "하루에 보통"],
+    "sum": ["합계", "총합", "다 합", "전부 합", "총 몇", "총 걸음"],
+    "trend": [
+        "추이", "추세", "트렌드", "경향", "변화", "늘었", "줄었", "늘고", "줄고",
+        "증가", "감소", "좋아지", "나빠지",
+    ],
+}
+AGGREGATE_OPS = {
+    kw: op for op, keywords in AGGREGATE_OP_KEYWORD_GROUPS.items() for kw in keywords
+}
+
+# 지표 키워드 → day_table 지표 (순서 = 우선순위: "안정 심박"이 "심박"보다 먼저)
+AGGREGATE_METRIC_KEYWORDS = {
+    "안정 심박": "resting_heart_rate",
+    "안정시 심박": "resting_heart_rate",
+    "휴식 심박": "resting_heart_rate",
+    "걷기 심박": "walking_heart_rate",
+    "심박": "heart_rate",
+    "맥박": "heart_rate",
+    "heart rate": "heart_rate",
+    "hrv": "hrv",
+    "산소포화": "oxygen_saturation",
+    "oxygen": "oxygen_saturation",
+    "수축기": "systolic",
+    "이완기": "diastolic",
+    "혈압": "systolic",
+    "혈당": "glucose",
+    "glucose": "glucose",
+    "건강 점수": "health_score",
+    "건강점수": "health_score",
+    "컨디션": "health_score",
+    "점수": "health_score",
+    "섭취": "calories_intake",
+    "칼로리": "active_calories",
+    "열량": "active_calories",
+    "소모": "active_calories",
+    "이동거리": "distance_km",
+    "거리": "distance_km",
+    "distance": "distance_km",
+    "운동시간": "exercise_min",
+    "운동 시간": "exercise_min",
+    "활동시간": "exercise_min",
+    "활동 시간": "exercise_min",
+    "계단": "flights",
+    "flights": "flights",
+    "체지방": "body_fat",
+    "제지방": "lean_body",
+    "bmi": "bmi",
+    "체중": "weight",
+    "몸무게": "weight",
+    "weight": "weight",
+    "걸음": "steps",
+    "걸은": "steps",
+    "걸었": "steps",
+    "걷": "steps",
+    "steps": "steps",
+    "만보": "steps",
+    "수면": "sleep_hr",
+    "잠": "sleep_hr",
+    "잤": "sleep_hr",
+    "잔 날": "sleep_hr",
+    "sleep": "sleep_hr",
+}
+
+# 기간 없는 집계 질문의 기본 기간 (오늘 포함 최근 N일)
+AGGREGATE_DEFAULT_DAYS = 30
+LAST_WEEK_KEYWORDS = ("지난주", "저번주")
+LAST_MONTH_KEYWORDS = ("지난달", "저번달")
+_RECENT_WINDOW = re.compile(r"(?:최근|지난)\s*(\d+)\s*(일|주|달|개월)")
+
 # ================================================================
 #  HEALTH KEYWORDS
 # ================================================================
-HEALTH_KEYWORDS = [
+# 주제별 그룹 (응답 캐시 등에서 같은 주제 질문 판별) - 목록 순서 = 우선순위
+HEALTH_KEYWORD_GROUPS = {
     # 수면
-    "수면",
-    "잠",
-    "sleep",
-    "몇시간",
-    "잤",
+    "sleep": [
+        "수면",
+        "잠",
+        "sleep",
+        "몇시간",
+        "잤",
+    ],
     # 신체
-    "체중",
-    "몸무게",
-    "weight",
-    "키",
-    "신장",
-    "height",
-    "bmi",
-    "체지방",
-    "제지방",
-    "lean body",
+    "body": [
+        "체중",
+        "몸무게",
+        "weight",
+        "키",
+        "신장",
+        "height",
+        "bmi",
+        "체지방",
+        "제지방",
+        "lean body",
+    ],
     # 활동 (데이터)
-    "걸음",
-    "보폭",
-    "steps",
-    "cadence",
-    "이동거리",
-    "distance",
-    "운동시간",
-    "활동시간",
-    "계단",
-    "flights",
-    "얼마나 걸었",
-    "몇 걸음",
-    "걸음수",
+    "activity": [
+        "걸음",
+        "보폭",
+        "steps",
+        "cadence",
+        "이동거리",
+        "distance",
+        "운동시간",
+        "활동시간",
+        "계단",
+        "flights",
+        "얼마나 걸었",
+        "몇 걸음",
+        "걸음수",
+    ],
     # 칼로리
-    "칼로리",
-    "active calorie",
-    "열량",
-    "섭취 칼로리",
-    "소모",
+    "calories": [
+        "칼로리",
+        "active calorie",
+        "열량",
+        "섭취 칼로리",
+        "소모",
+    ],
     # 바이탈
-    "심박",
-    "맥박",
-    "heart rate",
-    "산소포화",
-    "oxygen",
-    "hrv",
-    "혈압",
-    "수축기",
-    "이완기",
-    "glucose",
-    "혈당",
+    "vitals": [
+        "심박",
+        "맥박",
+        "heart rate",
+        "산소포화",
+        "oxygen",
+        "hrv",
+        "혈압",
+        "수축기",
+        "이완기",
+        "glucose",
+        "혈당",
+    ],
     # 상태 질문
-    "내 상태",
-    "컨디션",
-    "건강 어때",
-    "오늘 어때",
-]
+    "status": [
+        "내 상태",
+        "컨디션",
+        "건강 어때",
+        "오늘 어때",
+    ],
+}
+
+HEALTH_KEYWORDS = [kw for keywords in HEALTH_KEYWORD_GROUPS.values() for kw in keywords]
+HEALTH_KEYWORD_TOPICS = {
+    kw: topic for topic, keywords in HEALTH_KEYWORD_GROUPS.items() for kw in keywords
+}
 
 # ================================================================
 #  ROUTINE KEYWORDS
@@ -223,71 +340,68 @@ ROUTINE_CONTEXT_KEYWORDS = [
 ]
 
 
+# ================================================================
+#  키워드 automaton (위 키워드 목록 전체 → 메시지당 1회 스캔)
+# ================================================================
+# 카테고리별 결과는 "목록에서 가장 앞선 키워드" → 목록 순서 = 우선순위
+_KEYWORD_AUTOMATON = KeywordAutomaton(
+    {
+        "time": list(TIME_KEYWORDS),
+        "time_range": TIME_RANGE_KEYWORDS,
+        "comparison": COMPARISON_KEYWORDS,
+        "routine_explicit": ROUTINE_EXPLICIT_KEYWORDS,
+        "routine_context": ROUTINE_CONTEXT_KEYWORDS,
+        "health": HEALTH_KEYWORDS,
+        "aggregate_op": list(AGGREGATE_OPS),
+        "aggregate_metric": list(AGGREGATE_METRIC_KEYWORDS),
+    }
+)
+
+
+def scan_keywords(message: str) -> dict:
+    """
+    메시지의 키워드 매칭 결과 (카테고리 → 매칭된 키워드)
+
+    Returns:
+        {"time": "어제", "health": "잠", ...} (매칭 없는 카테고리는 없음)
+    """
+    msg = message.strip().lower()
+    return {
+        category: _KEYWORD_AUTOMATON.keyword(category, index)
+        for category, index in _KEYWORD_AUTOMATON.scan(msg).items()
+    }
+
+
 # ================================================================
 #  시간 표현 감지 함수 (NEW)
 # ================================================================
-def detect_time_expression(message: str) -> dict:
+def parse_time_expression(message: str, keyword_hits: dict = None) -> dict | None:
     """
-    메시지에서 시간 표현을 감지하고 날짜 범위를 반환
+    메시지의 시간 표현 감지 (날짜 계산 전 단계 → 캐시 가능)
+
+    Args:
+        keyword_hits: scan_keywords() 결과 (없으면 새로 스캔)
 
     Returns:
-        {
-            "detected": True/False,
-            "type": "specific" | "range" | None,
-            "days_ago": int (specific일 경우),
-            "start_date": str (range일 경우),
-            "end_date": str (range일 경우),
-            "keyword": str (감지된 키워드)
-        }
+        {"type": "specific", "days_ago": int, "keyword": str}
+        | {"type": "range", "keyword": str}
+        | None (시간 표현 없음)
     """
+    if keyword_hits is None:
+        keyword_hits = scan_keywords(message)
+
+    # 1) 특정 날짜 키워드
+    keyword = keyword_hits.get("time")
+    if keyword is not None:
+        return {"type": "specific", "days_ago": TIME_KEYWORDS[keyword], "keyword": keyword}
+
+    # 2) 기간 키워드
+    keyword = keyword_hits.get("time_range")
+    if keyword is not None:
+        return {"type": "range", "keyword": keyword}
+
+    # 3) 숫자 + 일/주/달 패턴 (예: "3일 전", "2주 전")
     msg = message.strip().lower()
-    today = datetime.now().date()
-
-    # 1) 특정 날짜 키워드 감지
-    for keyword, days_ago in TIME_KEYWORDS.items():
-        if keyword in msg:
-            target_date = today - timedelta(days=days_ago)
-            return {
-                "detected": True,
-                "type": "specific",
-                "days_ago": days_ago,
-                "target_date": target_date.strftime("%Y-%m-%d"),
-                "keyword": keyword,
-            }
-
-    # 2) 기간 키워드 감지
-    for keyword in TIME_RANGE_KEYWORDS:
-        if keyword in msg:
-            if "이번주" in keyword or "금주" in keyword:
-                # 이번 주 월요일부터 오늘까지
-                start = today - timedelta(days=today.weekday())
-                end = today
-            elif "이번달" in keyword or "금월" in keyword:
-                # 이번 달 1일부터 오늘까지
-                start = today.replace(day=1)
-                end = today
-            elif "최근 3일" in keyword:
-                start = today - timedelta(days=3)
-                end = today
-            elif "최근 7일" in keyword or "최근 일주일" in keyword:
-                start = today - timedelta(days=7)
-                end = today
-            elif "최근 30일" in keyword or "최근 한달" in keyword:
-                start = today - timedelta(days=30)
-                end = today
-            else:
-                start = today - timedelta(days=7)
-                end = today
-
-            return {
-                "detected": True,
-                "type": "range",
-                "start_date": start.strftime("%Y-%m-%d"),
-                "end_date": end.strftime("%Y-%m-%d"),
-                "keyword": keyword,
-            }
-
-    # 3) 숫자 + 일/주/달 패턴 감지 (예: "3일 전", "2주 전")
     pattern = r"(\d+)\s*(일|주|달|개월)\s*(전|ago)"
     match = re.search(pattern, msg)
     if match:
@@ -303,52 +417,201 @@ def detect_time_expression(message: str) -> dict:
         else:
             days = num
 
-        target_date = today - timedelta(days=days)
+        return {"type": "specific", "days_ago": days, "keyword": match.group(0)}
+
+    return None
+
+
+def resolve_time_expression(expression: dict | None, today=None) -> dict:
+    """
+    parse_time_expression() 결과 → 오늘 기준 날짜 계산
+
+    Returns:
+        {
+            "detected": True/False,
+            "type": "specific" | "range" | None,
+            "days_ago": int (specific일 경우),
+            "target_date": str (specific일 경우),
+            "start_date": str (range일 경우),
+            "end_date": str (range일 경우),
+            "keyword": str (감지된 키워드)
+        }
+    """
+    if expression is None:
+        return {"detected": False, "type": None}
+
+    today = today or datetime.now().date()
+    keyword = expression["keyword"]
+
+    if expression["type"] == "specific":
+        days_ago = expression["days_ago"]
+        target_date = today - timedelta(days=days_ago)
         return {
             "detected": True,
             "type": "specific",
-            "days_ago": days,
+            "days_ago": days_ago,
             "target_date": target_date.strftime("%Y-%m-%d"),
-            "keyword": match.group(0),
+            "keyword": keyword,
         }
 
-    return {"detected": False, "type": None}
+    # range: 시작일 ~ 오늘
+    if "이번주" in keyword or "금주" in keyword:
+        # 이번 주 월요일부터 오늘까지
+        start = today - timedelta(days=today.weekday())
+        end = today
+    elif "이번달" in keyword or "금월" in keyword:
+        # 이번 달 1일부터 오늘까지
+        start = today.replace(day=1)
+        end = today
+    elif "최근 3일" in keyword:
+        start = today - timedelta(days=3)
+        end = today
+    elif "최근 7일" in keyword or "최근 일주일" in keyword:
+        start = today - timedelta(days=7)
+        end = today
+    elif "최근 30일" in keyword or "최근 한달" in keyword:
+        start = today - timedelta(days=30)
+        end = today
+    else:
+        start = today - timedelta(days=7)
+        end = today
+
+    return {
+        "detected": True,
+        "type": "range",
+        "start_date": start.strftime("%Y-%m-%d"),
+        "end_date": end.strftime("%Y-%m-%d"),
+        "keyword": keyword,
+    }
+
+
+def detect_time_expression(message: str, keyword_hits: dict = None) -> dict:
+    """
+    메시지에서 시간 표현을 감지하고 날짜 범위를 반환 (오늘 기준)
+
+    Args:
+        keyword_hits: scan_keywords() 결과 (없으면 새로 스캔)
+
+    Returns:
+        resolve_time_expression() 형식
+    """
+    return resolve_time_expression(parse_time_expression(message, keyword_hits))
 
 
 # ================================================================
 #  비교/패턴 키워드 감지 함수 (NEW)
 # ================================================================
-def detect_comparison_pattern(message: str) -> bool:
+def detect_comparison_pattern(message: str, keyword_hits: dict = None) -> bool:
     """비교/패턴/조건 키워드가 있는지 감지"""
-    msg = message.strip().lower()
+    if keyword_hits is None:
+        keyword_hits = scan_keywords(message)
 
-    for keyword in COMPARISON_KEYWORDS:
-        if keyword in msg:
-            return True
+    return "comparison" in keyword_hits
 
-    return False
+
+# ================================================================
+#  집계 질문 감지 함수
+# ================================================================
+def parse_aggregate(message: str, keyword_hits: dict = None) -> dict | None:
+    """
+    집계 질문 감지 (연산 + 지표 키워드가 모두 있어야 함, 날짜 계산 전 → 캐시 가능)
+
+    Returns:
+        {
+            "op": "max" | "min" | "avg" | "sum" | "trend",
+            "metric": day_table 지표 이름,
+            "days": int | None ("최근 14일" → 14),
+            "period": "last_week" | "last_month" | None,
+            "keyword": 연산 키워드
+        }
+        | None
+    """
+    if keyword_hits is None:
+        keyword_hits = scan_keywords(message)
+
+    op_keyword = keyword_hits.get("aggregate_op")
+    metric_keyword = keyword_hits.get("aggregate_metric")
+    if op_keyword is None or metric_keyword is None:
+        return None
+
+    period = None
+    if keyword_hits.get("time") in LAST_WEEK_KEYWORDS:
+        period = "last_week"
+    elif keyword_hits.get("time") in LAST_MONTH_KEYWORDS:
+        period = "last_month"
+
+    days = None
+    match = _RECENT_WINDOW.search(message.strip().lower())
+    if match:
+        num, unit = int(match.group(1)), match.group(2)
+        days = num * {"일": 1, "주": 7}.get(unit, 30)
+
+    return {
+        "op": AGGREGATE_OPS[op_keyword],
+        "metric": AGGREGATE_METRIC_KEYWORDS[metric_keyword],
+        "days": days,
+        "period": period,
+        "keyword": op_keyword,
+    }
+
+
+def resolve_aggregate(aggregate: dict, time_context: dict = None, today=None) -> dict:
+    """
+    parse_aggregate() 결과 → 오늘 기준 집계 기간
+
+    기간 우선순위: 지난주/지난달 → "최근 N일" → 감지된 시간 표현 → 최근 AGGREGATE_DEFAULT_DAYS일
+
+    Returns:
+        {"op", "metric", "start_date", "end_date"}
+    """
+    today = today or datetime.now().date()
+
+    if aggregate["period"] == "last_week":
+        monday = today - timedelta(days=today.weekday())
+        start, end = monday - timedelta(days=7), monday - timedelta(days=1)
+    elif aggregate["period"] == "last_month":
+        end = today.replace(day=1) - timedelta(days=1)
+        start = end.replace(day=1)
+    elif aggregate["days"]:
+        start, end = today - timedelta(days=aggregate["days"]), today
+    elif time_context and time_context["type"] == "range":
+        start = datetime.strptime(time_context["start_date"], "%Y-%m-%d").date()
+        end = datetime.strptime(time_context["end_date"], "%Y-%m-%d").date()
+    elif time_context:
+        start = end = datetime.strptime(time_context["target_date"], "%Y-%m-%d").date()
+    else:
+        start, end = today - timedelta(days=AGGREGATE_DEFAULT_DAYS), today
+
+    return {
+        "op": aggregate["op"],
+        "metric": aggregate["metric"],
+        "start_date": start.strftime("%Y-%m-%d"),
+        "end_date": end.strftime("%Y-%m-%d"),
+    }
 
 
 # ================================================================
 #  규칙 기반 분류
 # ================================================================
-def _rule_based_intent(message: str) -> str:
-    msg = message.strip().lower()
+def _rule_based_intent(message: str, keyword_hits: dict = None) -> str:
+    if keyword_hits is None:
+        keyword_hits = scan_keywords(message)
 
     # (A) 명확한 루틴 요청
-    for kw in ROUTINE_EXPLICIT_KEYWORDS:
-        if kw in msg:
-            return "routine_request"
+    if "routine_explicit" in keyword_hits:
+        return "routine_request"
 
     # (B) 문맥 기반 루틴 요청
-    for kw in ROUTINE_CONTEXT_KEYWORDS:
-        if kw in msg:
-            return "routine_request"
+    if "routine_context" in keyword_hits:
+        return "routine_request"
 
     # (C) 건강 데이터 질문
-    for kw in HEALTH_KEYWORDS:
-        if kw in msg:
-            return "health_query"
+    if "health" in keyword_hits:
+        return "health_query"
+
+    # (C-2) 집계 질문 ("가장 많이 걸은 날") - 연산 + 지표 키워드
+    if "aggregate_op" in keyword_hits and "aggregate_metric" in keyword_hits:
+        return "health_query"
 
     # (D) 규칙 매칭 실패
     return None
@@ -365,34 +628,74 @@ def classify_intent(message: str) -> dict:
         {
             "intent": "health_query" | "routine_request" | "default_chat",
             "time_context": { ... } | None,
-            "use_similarity": True | False
+            "use_similarity": True | False,
+            "confidence": float | None (모델 intent 확률, 모델 미사용 시 None),
+            "source": "model" | "rules" (intent 결정 주체),
+            "keywords": {category: keyword} (scan_keywords() 결과),
+            "aggregate": resolve_aggregate() 결과 | None (건강 질문 중 집계 질문)
         }
     """
-    # 캐시 확인
-    cached = _cache_get(message)
-    if cached:
-        return cached
-
-    # 1) 시간 표현 감지
-    time_context = detect_time_expression(message)
-
-    # 2) 비교/패턴 키워드 감지
-    use_similarity = detect_comparison_pattern(message)
-
-    # 3) 기본 intent 분류
-    base_intent = _rule_based_intent(message)
-
-    if not base_intent:
-        base_intent = "default_chat"
+    # 캐시 확인 (날짜와 무관한 분류 결과만 저장)
+    key = message.strip().lower()
+    cached = _intent_cache.get(key)
+
+    if cached is None:
+        # 0) 키워드 스캔 1회 (시간 / 비교 / intent 키워드 모두)
+        keyword_hits = scan_keywords(message)
+
+        cached = {
+            # 1) 시간 표현 감지 (날짜 계산 전)
+            "time_expression": parse_time_expression(message, keyword_hits),
+            # 2) 비교/패턴 키워드 감지
+            "use_similarity": detect_comparison_pattern(message, keyword_hits),
+            # 3) 기본 intent 분류
+            "intent": _rule_based_intent(message, keyword_hits) or "default_chat",
+            "keywords": keyword_hits,
+            "confidence": None,
+            "source": "rules",
+        }
 
-    result = {
-        "intent": base_intent,
-        "time_context": time_context if time_context["detected"] else None,
-        "use_similarity": use_similarity,
+        # 3-1) 로컬 모델 (신뢰도 충분한 항목만 규칙 결과 대체)
+        if _intent_model is not None:
+            prediction = _intent_model.predict(message)
+            cached["confidence"] = round(prediction["confidence"], 4)
+            if prediction["confidence"] >= _model_min_confidence:
+                cached["intent"] = prediction["intent"]
+                cached["source"] = "model"
+            if prediction["similarity_confidence"] >= _model_min_confidence:
+                cached["use_similarity"] = prediction["use_similarity"]
+
+        # 3-2) 집계 질문 (최대 / 최소 / 평균 / 합계 / 추이)
+        cached["aggregate"] = (
+            parse_aggregate(message, keyword_hits)
+            if cached["intent"] == "health_query"
+            else None
+        )
+
+        _intent_cache.set(key, cached)
+
+    # 4) 날짜는 매번 오늘 기준으로 계산
+    time_context = resolve_time_expression(cached["time_expression"])
+    time_context = time_context if time_context["detected"] else None
+
+    return {
+        "intent": cached["intent"],
+        "time_context": time_context,
+        "use_similarity": cached["use_similarity"],
+        "confidence": cached["confidence"],
+        "source": cached["source"],
+        "keywords": dict(cached["keywords"]),
+        "aggregate": (
+            resolve_aggregate(cached["aggregate"], time_context)
+            if cached["aggregate"]
+            else None
+        ),
     }
 
-    _cache_set(message, result)
-    return result
+
+def intent_cache_stats() -> dict:
+    """Intent 캐시 상태 (항목 수 / hit rate 등)"""
+    return _intent_cache.stats()
 
 
 # ================================================================
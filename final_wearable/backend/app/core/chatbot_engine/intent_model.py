@@ -0,0 +1,147 @@
+"""
+Intent Model - 로컬 경량 intent 분류기 (선택 사항)
+
+키워드 규칙에 걸리지 않는 메시지도 분류하기 위한 CPU 전용 모델:
+- 특징: 문자 1~3-gram TF-IDF (L2 정규화, 학습 데이터에 있는 n-gram만)
+- 분류: 로지스틱 회귀 2개
+  - intent: health_query / routine_request / default_chat (softmax)
+  - use_similarity: 비교/패턴 질문 여부 (sigmoid)
+- numpy만 사용, 메시지당 수십 µs (1ms 미만)
+
+학습:
+  python train_intent_model.py   (data/intent_labeled.jsonl → data/intent_model.npz)
+
+사용:
+  model = IntentModel.load("app/core/chatbot_engine/data/intent_model.npz")
+  model.predict("요즘 너무 피곤한데 왜 그럴까")
+  # → {"intent": "health_query", "confidence": 0.82, "use_similarity": False, ...}
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+
+NGRAM_RANGE = (1, 3)
+INTENTS = ("health_query", "routine_request", "default_chat")
+
+_SPACES = re.compile(r"\s+")
+
+
+# ================================================================
+#  1) 특징 추출 (학습 / 추론 공통)
+# ================================================================
+def normalize(message: str) -> str:
+    """소문자 + 연속 공백 1칸 + 앞뒤 경계 표시 (단어 시작/끝 n-gram 구분)"""
+    return " " + _SPACES.sub(" ", message.strip().lower()) + " "
+
+
+def char_ngrams(message: str) -> Counter:
+    """정규화된 메시지의 문자 n-gram 빈도"""
+    text = normalize(message)
+    low, high = NGRAM_RANGE
+    return Counter(
+        text[i:i + n]
+        for n in range(low, high + 1)
+        for i in range(len(text) - n + 1)
+    )
+
+
+# ================================================================
+#  2) 모델
+# ================================================================
+class IntentModel:
+    def __init__(self, vocab: list, idf, intent_weights, intent_bias,
+                 similarity_weights, similarity_bias, intents=INTENTS):
+        """
+        Args:
+            vocab: n-gram 목록 (행 index = 특징 index)
+            idf: (V,) n-gram별 IDF
+            intent_weights: (V, C), intent_bias: (C,)
+            similarity_weights: (V,), similarity_bias: float
+        """
+        self.vocab = {ngram: index for index, ngram in enumerate(vocab)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.intent_weights = np.asarray(intent_weights, dtype=np.float32)
+        self.intent_bias = np.asarray(intent_bias, dtype=np.float32)
+        self.similarity_weights = np.asarray(similarity_weights, dtype=np.float32)
+        self.similarity_bias = float(similarity_bias)
+        self.intents = tuple(intents)
+
+    # ------ 저장 / 로드 ------
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                vocab=data["vocab"].tolist(),
+                idf=data["idf"],
+                intent_weights=data["intent_weights"],
+                intent_bias=data["intent_bias"],
+                similarity_weights=data["similarity_weights"],
+                similarity_bias=data["similarity_bias"].item(),
+                intents=data["intents"].tolist(),
+            )
+
+    def save(self, path: str):
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        np.savez_compressed(
+            path,
+            vocab=np.array(vocab),
+            idf=self.idf,
+            intent_weights=self.intent_weights,
+            intent_bias=self.intent_bias,
+            similarity_weights=self.similarity_weights,
+            similarity_bias=np.array(self.similarity_bias, dtype=np.float32),
+            intents=np.array(self.intents),
+        )
+
+    # ------ 추론 ------
+    def features(self, message: str) -> tuple:
+        """메시지 → (특징 index 배열, TF-IDF 값 배열) (학습 vocab에 없는 n-gram은 무시)"""
+        indices, tf = [], []
+        for ngram, count in char_ngrams(message).items():
+            index = self.vocab.get(ngram)
+            if index is not None:
+                indices.append(index)
+                tf.append(count)
+
+        if not indices:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        indices = np.array(indices, dtype=np.int64)
+        values = np.array(tf, dtype=np.float32) * self.idf[indices]
+        return indices, values / np.linalg.norm(values)
+
+    def predict(self, message: str) -> dict:
+        """
+        Returns:
+            {
+                "intent": str,
+                "confidence": float (intent 확률),
+                "probabilities": {intent: 확률},
+                "use_similarity": bool,
+                "similarity_confidence": float (use_similarity 판단 확률)
+            }
+        """
+        indices, values = self.features(message)
+
+        logits = values @ self.intent_weights[indices] + self.intent_bias
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        best = int(probs.argmax())
+
+        similarity_logit = float(values @ self.similarity_weights[indices]) + self.similarity_bias
+        similarity_prob = 1.0 / (1.0 + np.exp(-similarity_logit))
+        use_similarity = similarity_prob >= 0.5
+
+        return {
+            "intent": self.intents[best],
+            "confidence": float(probs[best]),
+            "probabilities": {
+                intent: float(prob) for intent, prob in zip(self.intents, probs)
+            },
+            "use_similarity": bool(use_similarity),
+            "similarity_confidence": float(
+                similarity_prob if use_similarity else 1.0 - similarity_prob
+            ),
+        }
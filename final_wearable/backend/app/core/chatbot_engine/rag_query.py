@@ -6,6 +6,7 @@ RAG Query - 개선 버전
 """
 
 import json
+import logging
 from datetime import datetime, timedelta
 from app.core.vector_store import (
     search_similar_summaries,
@@ -14,6 +15,8 @@ from app.core.vector_store import (
     get_summaries_by_date_range,
 )
 
+logger = logging.getLogger(__name__)
+
 
 # ------------------------------------------------------------
 # 1) Query 포맷팅
@@ -59,7 +62,7 @@ def query_latest_data(user_id: str, limit: int = 1) -> dict:
 
     Args:
         user_id: 사용자 ID
-        limit: 가져올 개수 (기본 1 = 가장 최신)
+        limit: 가져올 개수 (기본 1 = 가장 최신, None이면 전체)
 
     Returns:
         {"similar_days": [...], "count": int, "mode": "latest"}
@@ -73,6 +76,28 @@ def query_latest_data(user_id: str, limit: int = 1) -> dict:
     }
 
 
+def query_recent_window(user_id: str, days: int) -> dict:
+    """
+    오늘 기준 최근 days일 데이터 조회 (timestamp 범위 조회 1번, 사용자 전체 기록을 불러오지 않음)
+
+    Args:
+        user_id: 사용자 ID
+        days: 조회할 일수 (오늘 포함)
+
+    Returns:
+        {"similar_days": [...], "count": int, "mode": "latest"} (최신순, 첫 항목 = 기간 내 최신 날짜)
+    """
+    today = datetime.now().date()
+    start = (today - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    results = get_summaries_by_date_range(user_id, start, today.strftime("%Y-%m-%d"))
+
+    return {
+        "similar_days": _clean_results(results),
+        "count": len(results),
+        "mode": "latest",
+    }
+
+
 # ------------------------------------------------------------
 # 4) 특정 날짜 조회
 # ------------------------------------------------------------
@@ -197,7 +222,7 @@ def query_health_data(
 
             # 해당 날짜에 데이터가 없으면 최신 데이터로 폴백
             if result["count"] == 0:
-                print(f"[INFO] {target_date} 데이터 없음, 최신 데이터로 폴백")
+                logger.info("%s 데이터 없음, 최신 데이터로 폴백", target_date)
                 return query_latest_data(user_id, limit=1)
 
             return result
@@ -209,7 +234,7 @@ def query_health_data(
 
             # 해당 기간에 데이터가 없으면 최신 데이터로 폴백
             if result["count"] == 0:
-                print(f"[INFO] {start_date}~{end_date} 데이터 없음, 최신 데이터로 폴백")
+                logger.info("%s~%s 데이터 없음, 최신 데이터로 폴백", start_date, end_date)
                 return query_latest_data(user_id, limit=top_k)
 
             return result
@@ -0,0 +1,130 @@
+"""
+Response Cache - 챗봇 응답 캐시 (같은 질문 / 비슷한 질문 재사용)
+
+"어제 잠 몇시간 잤어?"처럼 하루에도 여러 번 반복되는 질문은
+데이터 조회 + LLM 호출 없이 이전 응답을 그대로 반환한다.
+
+- bucket key: (사용자, 데이터 버전, 캐릭터, intent, 비교 모드, 날짜 범위, 건강 주제, 집계 연산/지표/기간)
+  → 새 데이터가 업로드되면 (data_version 증가) 이전 응답은 조회되지 않음
+  → "어제"는 날짜로 풀어서 비교 → 다음 날에는 다른 bucket
+- bucket 안에서는 질문을 비교
+  - 정규화 후 완전히 같으면 hit
+  - 아니면 문자 n-gram 코사인 유사도가 임계값 이상이면 hit (임베딩 호출 없음)
+- LRU + TTL (bucket 단위), hit/miss → /metrics (app_chat_cache_total{result})
+"""
+
+import math
+import threading
+
+from app.config import CHAT_CACHE_MAX_SIZE, CHAT_CACHE_TTL_SEC, CHAT_CACHE_SIMILARITY
+from app.core.chatbot_engine.intent_classifier import HEALTH_KEYWORD_TOPICS
+from app.core.chatbot_engine.intent_model import normalize, char_ngrams
+from app.utils.data_version import get_data_version
+from app.utils.lru_cache import LRUCache
+from app.utils.tracing import CHAT_CACHE
+
+# bucket당 저장할 질문 수 (초과 시 오래된 질문부터 제거)
+MAX_QUESTIONS_PER_BUCKET = 8
+
+_cache = LRUCache("chat_response", max_size=CHAT_CACHE_MAX_SIZE, ttl=CHAT_CACHE_TTL_SEC)
+_bucket_lock = threading.Lock()
+
+
+# ================================================================
+#  1) key / 질문 벡터
+# ================================================================
+def date_key(time_context: dict | None) -> tuple:
+    """time_context → 날짜 key (시간 표현 없음 → ("latest",))"""
+    if not time_context:
+        return ("latest",)
+    if time_context["type"] == "specific":
+        return (time_context["target_date"],)
+    return (time_context["start_date"], time_context["end_date"])
+
+
+def _aggregate_key(aggregate: dict | None) -> tuple | None:
+    """"가장 많이 걸은 날" / "가장 적게 걸은 날"처럼 문장이 비슷해도 집계가 다르면 다른 bucket"""
+    if not aggregate:
+        return None
+    return (aggregate["op"], aggregate["metric"], aggregate["start_date"], aggregate["end_date"])
+
+
+def response_cache_key(user_id: str, character: str, intent_result: dict) -> tuple:
+    """classify_intent() 결과 → bucket key (날짜는 이미 오늘 기준으로 계산된 값)"""
+    health_keyword = intent_result.get("keywords", {}).get("health")
+    return (
+        user_id,
+        get_data_version(user_id),
+        character,
+        intent_result["intent"],
+        bool(intent_result.get("use_similarity")),
+        date_key(intent_result.get("time_context")),
+        HEALTH_KEYWORD_TOPICS.get(health_keyword),
+        _aggregate_key(intent_result.get("aggregate")),
+    )
+
+
+def _question_vector(message: str) -> tuple:
+    """질문 → (정규화 문자열, n-gram 빈도, L2 norm)"""
+    counts = char_ngrams(message)
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    return normalize(message), counts, norm
+
+
+def _cosine(a: tuple, b: tuple) -> float:
+    _, counts_a, norm_a = a
+    _, counts_b, norm_b = b
+    if not norm_a or not norm_b:
+        return 0.0
+    if len(counts_a) > len(counts_b):
+        counts_a, counts_b = counts_b, counts_a
+    dot = sum(count * counts_b.get(ngram, 0) for ngram, count in counts_a.items())
+    return dot / (norm_a * norm_b)
+
+
+# ================================================================
+#  2) 조회 / 저장
+# ================================================================
+def get_cached_response(key: tuple, message: str) -> str | None:
+    """같은 bucket에서 같은(비슷한) 질문의 응답 (없으면 None)"""
+    bucket = _cache.get(key)
+    if not bucket:
+        CHAT_CACHE.inc(result="miss")
+        return None
+
+    question = _question_vector(message)
+    with _bucket_lock:
+        entries = list(bucket)
+
+    best, best_score = None, 0.0
+    for vector, response in entries:
+        if vector[0] == question[0]:
+            CHAT_CACHE.inc(result="exact")
+            return response
+        score = _cosine(question, vector)
+        if score > best_score:
+            best, best_score = response, score
+
+    if best is not None and best_score >= CHAT_CACHE_SIMILARITY:
+        CHAT_CACHE.inc(result="similar")
+        return best
+
+    CHAT_CACHE.inc(result="miss")
+    return None
+
+
+def store_response(key: tuple, message: str, response: str):
+    """응답 저장 (빈 응답은 저장하지 않음)"""
+    if not response:
+        return
+
+    question = _question_vector(message)
+    with _bucket_lock:
+        bucket = _cache.setdefault(key, [])
+        bucket[:] = [entry for entry in bucket if entry[0][0] != question[0]]
+        bucket.append((question, response))
+        del bucket[:-MAX_QUESTIONS_PER_BUCKET]
+
+
+def response_cache_stats() -> dict:
+    return _cache.stats()
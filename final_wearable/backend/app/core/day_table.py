@@ -0,0 +1,91 @@
+"""
+Day Table - 사용자별 날짜 × 지표 컬럼 테이블 (NumPy)
+
+"가장 많이 걸은 날", "최근 30일 평균 수면"처럼 지표를 집계하는 질문은
+임베딩 / 유사도 검색 없이 이 테이블의 배열 연산으로 바로 계산한다.
+
+- 행: 날짜 (오름차순, 날짜당 1행 - get_recent_summaries()의 중복 제거 결과)
+- 열: DailyHealthRecord 23개 지표 + health_score
+- 0 / 빈 값은 NaN (이 프로젝트에서 0은 "측정 안 됨")
+- 사용자별 데이터 버전 단위로 캐시 → 새 업로드 후 첫 조회 때 다시 생성 (Chroma 조회 1번)
+"""
+
+import numpy as np
+
+from app.config import DAY_TABLE_MAX_USERS, DAY_TABLE_TTL_SEC
+from app.core.vector_store import get_recent_summaries
+from app.utils.data_version import get_data_version
+from app.utils.health_record import METRIC_NAMES, metric_row
+from app.utils.lru_cache import LRUCache
+from app.utils.tracing import span
+
+# ============================================================
+# 1) 지표 정의 (열 순서 / 이름·단위는 health_record 공통 정의)
+# ============================================================
+METRICS = METRIC_NAMES
+METRIC_INDEX = {metric: i for i, metric in enumerate(METRICS)}
+
+# ============================================================
+# 2) 테이블
+# ============================================================
+class DayTable:
+    def __init__(self, dates, values, version: int = 0):
+        """
+        Args:
+            dates: (N,) datetime64[D] 오름차순
+            values: (N, len(METRICS)) float64, 측정 안 된 값은 NaN
+            version: 생성 시점의 사용자 데이터 버전
+        """
+        self.dates = dates
+        self.values = values
+        self.version = version
+
+    @classmethod
+    def from_summaries(cls, summaries: list, version: int = 0) -> "DayTable":
+        """get_recent_summaries() 결과 (날짜당 1건) → 테이블"""
+        summaries = sorted(
+            (s for s in summaries if s.get("date")), key=lambda s: s["date"]
+        )
+        dates = np.array([s["date"] for s in summaries], dtype="datetime64[D]")
+
+        values = np.empty((len(summaries), len(METRICS)), dtype=np.float64)
+        for row, summary in enumerate(summaries):
+            values[row] = metric_row(summary.get("raw"), summary.get("health_score"))
+        return cls(dates, values, version)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def window(self, metric: str, start: str = None, end: str = None) -> tuple:
+        """
+        기간 [start, end] 안의 (날짜 배열, 값 배열) - 측정 안 된 날은 제외
+
+        Raises:
+            KeyError: 알 수 없는 지표
+        """
+        column = self.values[:, METRIC_INDEX[metric]]
+        mask = ~np.isnan(column)
+        if start:
+            mask &= self.dates >= np.datetime64(start, "D")
+        if end:
+            mask &= self.dates <= np.datetime64(end, "D")
+        return self.dates[mask], column[mask]
+
+
+# ============================================================
+# 3) 사용자별 캐시 (데이터 버전 단위)
+# ============================================================
+_tables = LRUCache("day_table", max_size=DAY_TABLE_MAX_USERS, ttl=DAY_TABLE_TTL_SEC)
+
+
+def load_day_table(user_id: str) -> DayTable:
+    """사용자 테이블 (같은 데이터 버전이면 캐시, 아니면 VectorDB에서 1번 조회해 생성)"""
+    version = get_data_version(user_id)
+    table = _tables.get(user_id)
+    if table is not None and table.version == version:
+        return table
+
+    with span("day_table_build"):
+        table = DayTable.from_summaries(get_recent_summaries(user_id, limit=None), version)
+    _tables.set(user_id, table)
+    return table
@@ -11,8 +11,11 @@ calculate_health_score 함수(270번 줄~365번 줄)를 교체하세요.
 4. 등급 기준 조정 (더 세분화)
 """
 
+from functools import cached_property
 from typing import Dict, List, Tuple
 
+from app.utils.tracing import traced
+
 
 # ============================================================
 # 1) 수면 분석
@@ -470,11 +473,13 @@ def calculate_health_score(raw: dict) -> dict:
 # ============================================================
 def recommend_exercise_intensity(raw: dict) -> dict:
     """건강 데이터 기반 운동 강도 추천 - 안전 우선 로직"""
+    return HealthInterpretation(raw).exercise_recommendation
+
 
-    sleep_info = interpret_sleep(raw)
-    hr_info = interpret_heart_rate(raw)
-    activity_info = interpret_activity(raw)
-    health_score_info = calculate_health_score(raw)
+def _recommend_from_interpretation(
+    sleep_info: dict, hr_info: dict, activity_info: dict, health_score_info: dict
+) -> dict:
+    """이미 계산된 수면/심박/활동/점수 해석으로 운동 강도 결정"""
 
     base_intensity = 1.0
     reasons = []
@@ -543,40 +548,95 @@ def recommend_exercise_intensity(raw: dict) -> dict:
 # ============================================================
 # 8) 종합 해석 (메인 함수)
 # ============================================================
+class HealthInterpretation:
+    """
+    raw 1건에 대한 규칙 기반 종합 해석 (요청 단위 재사용용)
+
+    - 하위 해석(수면/심박/활동/BMI/산소/점수/강도)은 처음 접근할 때 1회만 계산
+    - 분석/챗봇 파이프라인에 이 객체를 넘기면 같은 규칙을 반복 평가하지 않음
+    """
+
+    def __init__(self, raw: dict):
+        self.raw = raw if raw is not None else {}
+
+    @cached_property
+    def sleep(self) -> dict:
+        return interpret_sleep(self.raw)
+
+    @cached_property
+    def heart_rate(self) -> dict:
+        return interpret_heart_rate(self.raw)
+
+    @cached_property
+    def activity(self) -> dict:
+        return interpret_activity(self.raw)
+
+    @cached_property
+    def bmi(self) -> dict:
+        return interpret_bmi(self.raw)
+
+    @cached_property
+    def oxygen(self) -> dict:
+        return interpret_oxygen(self.raw)
+
+    @cached_property
+    @traced("interpreter", fn="health_score")
+    def health_score(self) -> dict:
+        return calculate_health_score(self.raw)
+
+    @cached_property
+    @traced("interpreter", fn="exercise_recommendation")
+    def exercise_recommendation(self) -> dict:
+        return _recommend_from_interpretation(
+            self.sleep, self.heart_rate, self.activity, self.health_score
+        )
+
+    @cached_property
+    @traced("interpreter", fn="health_context")
+    def health_context(self) -> str:
+        return build_health_context_for_llm(self.raw, interpretation=self)
+
+    def as_dict(self) -> dict:
+        """interpret_health_data() 형식의 dict로 반환"""
+        return {
+            "sleep": self.sleep,
+            "heart_rate": self.heart_rate,
+            "activity": self.activity,
+            "bmi": self.bmi,
+            "oxygen": self.oxygen,
+            "health_score": self.health_score,
+            "exercise_recommendation": self.exercise_recommendation,
+        }
+
+
 def interpret_health_data(raw: dict) -> dict:
     """건강 데이터 종합 해석 - LLM 호출 없이 규칙 기반"""
-    return {
-        "sleep": interpret_sleep(raw),
-        "heart_rate": interpret_heart_rate(raw),
-        "activity": interpret_activity(raw),
-        "bmi": interpret_bmi(raw),
-        "oxygen": interpret_oxygen(raw),
-        "health_score": calculate_health_score(raw),
-        "exercise_recommendation": recommend_exercise_intensity(raw),
-    }
+    return HealthInterpretation(raw).as_dict()
 
 
 # ============================================================
 # 9) Fallback용 상세 분석 텍스트 생성 (v8 - 자연어 개선)
 # ============================================================
+@traced("interpreter", fn="build_analysis_text")
 def build_analysis_text(
     raw: dict,
     difficulty_level: str,
     duration_min: int,
     item_count: int,
     total_time_sec: int,
+    interpretation: HealthInterpretation = None,
 ) -> str:
     """
     규칙 기반 상세 분석 텍스트 생성 (LLM 호출 없음)
     v8: 자연어로 더 상세하고 친근하게 설명
     """
 
-    health_info = interpret_health_data(raw)
-    score_info = health_info["health_score"]
-    sleep_info = health_info["sleep"]
-    activity_info = health_info["activity"]
-    hr_info = health_info["heart_rate"]
-    exercise_rec = health_info["exercise_recommendation"]
+    health_info = interpretation or HealthInterpretation(raw)
+    score_info = health_info.health_score
+    sleep_info = health_info.sleep
+    activity_info = health_info.activity
+    hr_info = health_info.heart_rate
+    exercise_rec = health_info.exercise_recommendation
 
     lines = []
 
@@ -714,9 +774,11 @@ def build_analysis_text(
 # ============================================================
 # 10) LLM 프롬프트용 컨텍스트 생성
 # ============================================================
-def build_health_context_for_llm(raw: dict) -> str:
+def build_health_context_for_llm(
+    raw: dict, interpretation: HealthInterpretation = None
+) -> str:
     """LLM 프롬프트에 포함할 건강 상태 컨텍스트 문자열 생성"""
-    interpretation = interpret_health_data(raw)
+    interpretation = (interpretation or HealthInterpretation(raw)).as_dict()
 
     lines = []
 
@@ -763,6 +825,7 @@ def build_health_context_for_llm(raw: dict) -> str:
 # ============================================================
 # 11) RAG 유사 패턴 분석
 # ============================================================
+@traced("interpreter", fn="analyze_rag_patterns")
 def analyze_rag_patterns(similar_days: list) -> str:
     """
     RAG에서 가져온 과거 유사 패턴을
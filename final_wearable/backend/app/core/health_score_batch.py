@@ -0,0 +1,335 @@
+"""
+Health Score Batch - 여러 날짜 건강 점수 일괄 계산 (NumPy 벡터화)
+
+health_interpreter.calculate_health_score()와 완전히 같은 규칙을
+날짜 축(column) 배열 연산으로 계산한다.
+
+- 입력: 날짜별 raw dict 리스트 또는 (N, 8) 컬럼 배열
+- 출력: 점수 / 등급 인덱스 / 산정 요소 비트마스크
+- 결과는 스칼라 함수와 100% 동일해야 함 (benchmarks/bench_health_score.py로 검증)
+"""
+
+import numpy as np
+
+# ============================================================
+# 1) 컬럼 정의 (배열의 열 순서)
+# ============================================================
+SCORE_COLUMNS = (
+    "sleep_hr",
+    "steps",
+    "resting_heart_rate",
+    "heart_rate",
+    "bmi",
+    "oxygen_saturation",
+    "active_calories",
+    "exercise_min",
+)
+
+# ============================================================
+# 2) 산정 요소 (비트 순서 = calculate_health_score의 factors 순서)
+# ============================================================
+FACTOR_LABELS = (
+    # 수면 (bit 0~4)
+    "적정 수면 (+15)",
+    "양호한 수면 (+10)",
+    "약간 부족한 수면 (+3)",
+    "수면 부족 (-10)",
+    "과다 수면 (-3)",
+    # 활동량 (bit 5~10)
+    "활발한 활동량 (+15)",
+    "좋은 활동량 (+12)",
+    "적당한 활동량 (+8)",
+    "보통 활동량 (+5)",
+    "낮은 활동량 (0)",
+    "매우 낮은 활동량 (-5)",
+    # 심박수 (bit 11~15)
+    "우수한 심박수 (+10)",
+    "건강한 심박수 (+7)",
+    "정상 심박수 (+3)",
+    "약간 높은 심박수 (-3)",
+    "높은 심박수 (-8)",
+    # BMI (bit 16~21)
+    "정상 BMI (+10)",
+    "약간 높은 BMI (+5)",
+    "저체중 (0)",
+    "과체중 (-3)",
+    "비만 전단계 (-5)",
+    "비만 (-8)",
+    # 산소포화도 (bit 22~24)
+    "우수한 산소포화도 (+5)",
+    "정상 산소포화도 (+2)",
+    "낮은 산소포화도 (-5)",
+    # 활동 칼로리 (bit 25~26)
+    "높은 활동 칼로리 (+5)",
+    "적당한 활동 칼로리 (+2)",
+    # 운동 시간 (bit 27~28)
+    "충분한 운동 시간 (+5)",
+    "적당한 운동 시간 (+2)",
+)
+
+# 등급 구간 (np.digitize 경계값) → 인덱스 0 = F, 7 = A
+GRADE_BINS = np.array([40, 45, 50, 55, 60, 70, 80])
+GRADES = (
+    ("F", "주의 필요"),
+    ("D", "개선 필요"),
+    ("C-", "보통 이하"),
+    ("C", "보통"),
+    ("C+", "보통 이상"),
+    ("B", "양호"),
+    ("B+", "우수"),
+    ("A", "매우 우수"),
+)
+
+
+# ============================================================
+# 3) 입력 변환
+# ============================================================
+def raws_to_columns(raws: list) -> np.ndarray:
+    """날짜별 raw dict 리스트 → (N, len(SCORE_COLUMNS)) float64 배열"""
+    return np.array(
+        [[raw.get(col, 0) for col in SCORE_COLUMNS] for raw in raws],
+        dtype=np.float64,
+    ).reshape(len(raws), len(SCORE_COLUMNS))
+
+
+def _select(conditions: list, points: list, first_bit: int):
+    """
+    if/elif 체인을 np.select로 변환
+
+    Returns:
+        (점수 변화량 배열, 산정 요소 비트 배열)
+    """
+    delta = np.select(conditions, points, default=0)
+    bits = np.select(
+        conditions,
+        [np.uint32(1 << (first_bit + i)) for i in range(len(conditions))],
+        default=np.uint32(0),
+    ).astype(np.uint32)
+    return delta, bits
+
+
+# ============================================================
+# 4) 건강 점수 일괄 계산 (메인)
+# ============================================================
+def calculate_health_scores_batch(columns) -> dict:
+    """
+    규칙 기반 종합 건강 점수 일괄 계산 (calculate_health_score 벡터화)
+
+    Args:
+        columns: (N, 8) 배열 (SCORE_COLUMNS 순서) 또는 raw dict 리스트
+
+    Returns:
+        {
+            "score": int64[N],        # 0~100
+            "grade_index": int64[N],  # GRADES 인덱스
+            "factor_mask": uint32[N], # FACTOR_LABELS 비트마스크
+        }
+    """
+    if isinstance(columns, list):
+        columns = raws_to_columns(columns)
+
+    data = np.asarray(columns, dtype=np.float64)
+    (
+        sleep_hr,
+        steps,
+        resting_hr,
+        heart_rate,
+        bmi,
+        oxygen,
+        active_cal,
+        exercise_min,
+    ) = data.T
+
+    score = np.full(len(data), 50, dtype=np.int64)
+    mask = np.zeros(len(data), dtype=np.uint32)
+
+    # 수면 (데이터가 있을 때만 평가)
+    has_sleep = sleep_hr > 0
+    delta, bits = _select(
+        [
+            has_sleep & (sleep_hr >= 7) & (sleep_hr <= 9),
+            has_sleep & (sleep_hr >= 6) & (sleep_hr < 7),
+            has_sleep & (sleep_hr >= 5) & (sleep_hr < 6),
+            has_sleep & (sleep_hr < 5),
+            has_sleep & (sleep_hr > 9),
+        ],
+        [15, 10, 3, -10, -3],
+        0,
+    )
+    score += delta
+    mask |= bits
+
+    # 활동량
+    has_steps = steps > 0
+    delta, bits = _select(
+        [
+            has_steps & (steps >= 10000),
+            has_steps & (steps >= 8000),
+            has_steps & (steps >= 6000),
+            has_steps & (steps >= 4000),
+            has_steps & (steps >= 2000),
+            has_steps,
+        ],
+        [15, 12, 8, 5, 0, -5],
+        5,
+    )
+    score += delta
+    mask |= bits
+
+    # 심박수 (resting_heart_rate 없으면 heart_rate - 15 추정, 최소 50)
+    estimated = np.where(heart_rate > 0, np.maximum(50, heart_rate - 15), resting_hr)
+    resting = np.where(resting_hr == 0, estimated, resting_hr)
+    has_hr = resting > 0
+    delta, bits = _select(
+        [
+            has_hr & (resting >= 50) & (resting < 65),
+            has_hr & (resting >= 65) & (resting < 75),
+            has_hr & (resting >= 75) & (resting < 85),
+            has_hr & (resting >= 85) & (resting < 95),
+            has_hr & (resting >= 95),
+        ],
+        [10, 7, 3, -3, -8],
+        11,
+    )
+    score += delta
+    mask |= bits
+
+    # BMI
+    has_bmi = bmi > 0
+    delta, bits = _select(
+        [
+            has_bmi & (bmi >= 18.5) & (bmi < 23),
+            has_bmi & (bmi >= 23) & (bmi < 25),
+            has_bmi & (bmi >= 17) & (bmi < 18.5),
+            has_bmi & (bmi >= 25) & (bmi < 28),
+            has_bmi & (bmi >= 28) & (bmi < 30),
+            has_bmi & (bmi >= 30),
+        ],
+        [10, 5, 0, -3, -5, -8],
+        16,
+    )
+    score += delta
+    mask |= bits
+
+    # 산소포화도
+    has_oxygen = oxygen > 0
+    delta, bits = _select(
+        [
+            has_oxygen & (oxygen >= 98),
+            has_oxygen & (oxygen >= 95),
+            has_oxygen & (oxygen < 95),
+        ],
+        [5, 2, -5],
+        22,
+    )
+    score += delta
+    mask |= bits
+
+    # 활동 칼로리 보너스
+    delta, bits = _select([active_cal >= 300, active_cal >= 150], [5, 2], 25)
+    score += delta
+    mask |= bits
+
+    # 운동 시간 보너스
+    delta, bits = _select([exercise_min >= 30, exercise_min >= 15], [5, 2], 27)
+    score += delta
+    mask |= bits
+
+    score = np.clip(score, 0, 100)
+
+    return {
+        "score": score,
+        "grade_index": np.digitize(score, GRADE_BINS),
+        "factor_mask": mask,
+    }
+
+
+# ============================================================
+# 5) 운동 권장 강도 일괄 결정
+# ============================================================
+INTENSITY_LEVELS = ("하", "중", "상")
+
+
+def recommended_levels_batch(columns, score) -> np.ndarray:
+    """
+    HealthInterpretation.exercise_recommendation["recommended_level"] 벡터화
+
+    점수 / 수면 / 휴식기 심박 / 걸음수 배율을 스칼라 함수와 같은 순서로 곱해
+    (부동소수 결과까지 동일) 마지막 구간만 판정한다.
+
+    Args:
+        columns: (N, 8) 배열 (SCORE_COLUMNS 순서) 또는 raw dict 리스트
+        score: calculate_health_scores_batch()["score"]
+
+    Returns:
+        object[N]: "상" / "중" / "하"
+    """
+    if isinstance(columns, list):
+        columns = raws_to_columns(columns)
+
+    data = np.asarray(columns, dtype=np.float64).reshape(-1, len(SCORE_COLUMNS))
+    sleep_hr, steps, resting_hr, heart_rate = data[:, :4].T
+
+    # 1) 건강 점수
+    intensity = np.select([score < 40, score < 55, score < 70], [0.5, 0.6, 0.8], 1.0)
+
+    # 2) 수면 (interpret_sleep의 intensity_modifier, 1.0 미만일 때만)
+    has_sleep = sleep_hr > 0
+    modifier = np.select(
+        [
+            has_sleep & (sleep_hr < 5),
+            has_sleep & (sleep_hr < 6),
+            has_sleep & (sleep_hr < 7),
+            has_sleep & (sleep_hr > 9),
+        ],
+        [0.5, 0.7, 0.9, 0.85],
+        1.0,
+    )
+    intensity = np.where(modifier < 1.0, intensity * modifier, intensity)
+
+    # 3) 휴식기 심박 90 이상 → low_intensity, 심박 데이터 없음 → 0.75 이하
+    intensity = np.where(resting_hr >= 90, intensity * 0.7, intensity)
+    no_hr = (resting_hr == 0) & (heart_rate == 0)
+    intensity = np.where(no_hr, np.minimum(intensity, 0.75), intensity)
+
+    # 4) 활동량 (sedentary / low / very_active)
+    has_steps = steps > 0
+    intensity = intensity * np.select(
+        [has_steps & (steps < 3000), has_steps & (steps < 5000), steps >= 10000],
+        [0.5, 0.65, 0.85],
+        1.0,
+    )
+
+    index = np.select([intensity >= 0.85, intensity >= 0.6], [2, 1], 0)
+    return np.array(INTENSITY_LEVELS, dtype=object)[index]
+
+
+# ============================================================
+# 6) 결과 변환 (스칼라 함수 형식)
+# ============================================================
+def decode_factors(factor_mask: int) -> list:
+    """비트마스크 → factors 리스트 (calculate_health_score와 같은 순서)"""
+    factor_mask = int(factor_mask)
+    return [
+        label for bit, label in enumerate(FACTOR_LABELS) if factor_mask & (1 << bit)
+    ]
+
+
+def health_scores_to_dicts(batch: dict) -> list:
+    """calculate_health_scores_batch 결과 → calculate_health_score 형식 dict 리스트"""
+    results = []
+    for score, grade_index, factor_mask in zip(
+        batch["score"].tolist(),
+        batch["grade_index"].tolist(),
+        batch["factor_mask"].tolist(),
+    ):
+        grade, grade_text = GRADES[grade_index]
+        results.append(
+            {
+                "score": score,
+                "grade": grade,
+                "grade_text": grade_text,
+                "factors": decode_factors(factor_mask),
+            }
+        )
+    return results
@@ -10,6 +10,7 @@ LLM Analysis - 운동 추천 엔진 (개선 버전)
 
 import os
 import json
+import logging
 from dotenv import load_dotenv
 from openai import OpenAI
 
@@ -17,20 +18,28 @@ from app.config import LLM_MODEL_MAIN, LLM_TEMPERATURE, LLM_MAX_TOKENS
 from app.core.rag_query import (
     build_rag_query,
     classify_rag_strength,
+    rank_similar_days,
 )
 from app.core.vector_store import search_similar_summaries
+from app.core.rolling_stats import get_rolling_stats, format_trend_context
 from app.core.health_interpreter import (
-    interpret_health_data,
+    HealthInterpretation,
     build_health_context_for_llm,
     build_analysis_text,
     analyze_rag_patterns,
-    recommend_exercise_intensity,
     calculate_health_score,
 )
+from app.utils.single_flight import single_flight
+from app.utils.tracing import span, record_llm_usage
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# 루틴 분석에 함께 보낼 최근 추세 지표
+ANALYSIS_TREND_METRICS = ("health_score", "sleep_hr", "steps", "exercise_min", "active_calories")
+
 
 # ==========================================================
 # 1) 유틸 함수들
@@ -378,6 +387,34 @@ def check_data_quality(raw: dict) -> dict:
     }
 
 
+# ==========================================================
+# 6-1) Fallback 조건 판단
+# ==========================================================
+def decide_fallback(score: int, data_quality: dict) -> str:
+    """
+    Fallback(규칙 기반 루틴) 사용 여부 판단
+
+    Returns:
+        Fallback 사유 문자열 (LLM 호출이 가능하면 빈 문자열)
+    """
+    # 조건 1: 데이터 부족
+    if not data_quality["is_sufficient"]:
+        return "데이터 부족 (수면/활동량 없음)"
+
+    # 조건 2: 매우 낮은 점수 (안전 모드)
+    if score < 40:
+        return f"건강 점수 {score}점 (40점 미만, 안전 모드)"
+
+    # 조건 3: 데이터 품질이 낮고 점수도 낮음
+    if data_quality["quality_level"] == "low" and score < 50:
+        return f"데이터 품질 낮음 + 점수 {score}점"
+
+    # ✅ 개선: 점수 50 이상이면 LLM 시도
+    # 기존: auto_difficulty == "하" → 무조건 Fallback
+    # 개선: 점수 기반으로 판단
+    return ""
+
+
 # ==========================================================
 # 7) LLM 결과 검증
 # ==========================================================
@@ -388,7 +425,7 @@ def validate_routine(result: dict, settings: dict, target_min: int) -> bool:
         items = routine.get("items", [])
 
         if not items:
-            print("[WARN] 검증 실패: items 비어있음")
+            logger.warning("검증 실패: items 비어있음")
             return False
 
         # 1) 시간 검증 (±20% 허용)
@@ -401,7 +438,7 @@ def validate_routine(result: dict, settings: dict, target_min: int) -> bool:
 
         target_sec = target_min * 60
         if not (target_sec * 0.8 <= total_sec <= target_sec * 1.2):
-            print(f"[WARN] 검증 실패: 시간 {total_sec}초 (목표 {target_sec}±20%)")
+            logger.warning("검증 실패: 시간 %s초 (목표 %s±20%%)", total_sec, target_sec)
             return False
 
         # 2) MET 범위 검증 (settings 기반)
@@ -412,23 +449,25 @@ def validate_routine(result: dict, settings: dict, target_min: int) -> bool:
             item_met = item.get("met", 0)
             # 약간의 여유 허용 (±0.5)
             if not (min_met - 0.5 <= item_met <= max_met + 0.5):
-                print(f"[WARN] 검증 실패: MET {item_met} (범위 {min_met}-{max_met})")
+                logger.warning("검증 실패: MET %s (범위 %s-%s)", item_met, min_met, max_met)
                 return False
 
         return True
 
     except Exception as e:
-        print(f"[ERROR] 검증 중 오류: {str(e)}")
+        logger.error("검증 중 오류: %s", e)
         return False
 
 
 # ==========================================================
 # 8) 상세 건강 리포트 생성
 # ==========================================================
-def build_detailed_health_analysis(raw: dict) -> str:
+def build_detailed_health_analysis(
+    raw: dict, interpretation: HealthInterpretation = None
+) -> str:
     """상세한 건강 상태 분석 텍스트 생성"""
 
-    interpretation = interpret_health_data(raw)
+    interpretation = (interpretation or HealthInterpretation(raw)).as_dict()
     lines = []
 
     score_info = interpretation["health_score"]
@@ -472,7 +511,12 @@ def build_detailed_health_analysis(raw: dict) -> str:
 # ==========================================================
 # 9) 점수 기반 Fallback 루틴 생성 (완전 동적)
 # ==========================================================
-def get_fallback_routine(score: int, duration_min: int, raw: dict = None) -> dict:
+def get_fallback_routine(
+    score: int,
+    duration_min: int,
+    raw: dict = None,
+    interpretation: HealthInterpretation = None,
+) -> dict:
     """
     점수 기반 동적 Fallback 루틴 생성
 
@@ -601,6 +645,7 @@ def get_fallback_routine(score: int, duration_min: int, raw: dict = None) -> dic
             duration_min=actual_time_min,
             item_count=len(items),
             total_time_sec=total_sec,
+            interpretation=interpretation,
         )
     else:
         analysis = (
@@ -661,11 +706,26 @@ SEED_JSON = """
 # ==========================================================
 # 11) 메인 LLM 분석 함수 (개선 버전)
 # ==========================================================
+def _candidates_digest(candidates: list | None):
+    """유사 날짜 후보 → single-flight 키 (후보가 다르면 결과도 다름)"""
+    if candidates is None:
+        return None
+    return tuple((day.get("date"), day.get("updated_at")) for day in candidates)
+
+
+# interpretation은 summary의 raw에서 다시 만들어지므로 키에 넣지 않음
+@single_flight(
+    "llm_analysis",
+    params=("summary", "difficulty_level", "duration_min"),
+    digests={"candidates": _candidates_digest},
+)
 def run_llm_analysis(
     summary: dict,
     user_id: str,
     difficulty_level: str,
     duration_min: int,
+    interpretation: HealthInterpretation = None,
+    candidates: list = None,
 ) -> dict:
     """
     LLM 기반 운동 분석 엔진 (개선 버전)
@@ -675,72 +735,38 @@ def run_llm_analysis(
     2. Fallback 조건 세분화
     3. 데이터 품질에 따른 LLM 사용 결정
     4. 하드코딩 완전 제거
+    5. 규칙 기반 해석은 요청당 1회 (interpretation 재사용)
+    6. 호출자가 이미 조회한 날짜(candidates)가 있으면 그 안에서 유사 날짜 선택 (VectorDB 재검색 없음)
+       - 임베딩 검색 대신 수치 거리 기준 (rank_similar_days), summary["date"] 자신은 제외
+    7. 최근 7 / 30 / 90일 추세는 누적 통계(rolling_stats)에서 바로 읽음
     """
 
     raw = summary.get("raw", {})
 
+    # 같은 raw에 대한 해석 결과를 전 단계에서 공유
+    if interpretation is None or interpretation.raw is not raw:
+        interpretation = HealthInterpretation(raw)
+
     # 1) 건강 점수 및 설정 계산
-    health_score_info = calculate_health_score(raw)
+    health_score_info = interpretation.health_score
     score = health_score_info.get("score", 50)
     settings = get_exercise_settings_by_score(score)
 
     # 2) 데이터 품질 확인
     data_quality = check_data_quality(raw)
 
-    # 3) RAG 검색
-    rag_query = build_rag_query(raw)
-    rag_result = search_similar_summaries(
-        query_dict=rag_query,
-        user_id=user_id,
-        top_k=3,
-    )
-    similar_days = rag_result.get("similar_days", [])
-    rag_strength = classify_rag_strength(similar_days)
-
-    # 4) 규칙 기반 건강 해석
-    health_context = build_health_context_for_llm(raw)
-    exercise_rec = recommend_exercise_intensity(raw)
-
-    # 시스템 권장 강도 (점수 기반)
+    # 3) 시스템 권장 강도 (점수 기반)
     auto_intensity = settings["intensity"]
 
-    if rag_strength == "none":
-        rag_context = ""
-    elif rag_strength == "weak":
-        rag_context = (
-            "📚 과거에 유사한 기록이 일부 있었으나, 참고 수준으로만 반영했습니다."
-        )
-    else:
-        rag_context = analyze_rag_patterns(similar_days)
-
     # ============================================
-    # 5) Fallback 조건 판단 (세분화)
+    # 4) Fallback 조건 판단 (세분화)
     # ============================================
-    use_fallback = False
-    fallback_reason = ""
-
-    # 조건 1: 데이터 부족
-    if not data_quality["is_sufficient"]:
-        use_fallback = True
-        fallback_reason = f"데이터 부족 (수면/활동량 없음)"
-
-    # 조건 2: 매우 낮은 점수 (안전 모드)
-    elif score < 40:
-        use_fallback = True
-        fallback_reason = f"건강 점수 {score}점 (40점 미만, 안전 모드)"
+    # Fallback 루틴은 RAG 결과를 쓰지 않으므로 검색 전에 판단한다
+    fallback_reason = decide_fallback(score, data_quality)
 
-    # 조건 3: 데이터 품질이 낮고 점수도 낮음
-    elif data_quality["quality_level"] == "low" and score < 50:
-        use_fallback = True
-        fallback_reason = f"데이터 품질 낮음 + 점수 {score}점"
-
-    # ✅ 개선: 점수 50 이상이면 LLM 시도
-    # 기존: auto_difficulty == "하" → 무조건 Fallback
-    # 개선: 점수 기반으로 판단
-
-    if use_fallback:
-        print(f"[INFO] Fallback 사용: {fallback_reason}")
-        result = get_fallback_routine(score, duration_min, raw)
+    if fallback_reason:
+        logger.info("Fallback 사용: %s", fallback_reason)
+        result = get_fallback_routine(score, duration_min, raw, interpretation)
         result["health_context"] = {
             "health_score": health_score_info,
             "recommended_intensity": auto_intensity,
@@ -749,10 +775,43 @@ def run_llm_analysis(
         }
         return result
 
+    # 5) RAG 검색
+    rag_query = build_rag_query(raw, interpretation)
+    if candidates is not None:
+        similar_days = rank_similar_days(
+            rag_query, candidates, top_k=3, exclude_date=summary.get("date")
+        )
+    else:
+        rag_result = search_similar_summaries(
+            query_dict=rag_query,
+            user_id=user_id,
+            top_k=3,
+        )
+        similar_days = rag_result.get("similar_days", [])
+    rag_strength = classify_rag_strength(similar_days)
+
+    # 규칙 기반 건강 해석
+    health_context = interpretation.health_context
+
+    if rag_strength == "none":
+        rag_context = ""
+    elif rag_strength == "weak":
+        rag_context = (
+            "📚 과거에 유사한 기록이 일부 있었으나, 참고 수준으로만 반영했습니다."
+        )
+    else:
+        rag_context = analyze_rag_patterns(similar_days)
+
+    # 유사 날짜 3개 외에 최근 7 / 30 / 90일 추세 (업로드 시 갱신된 누적 통계)
+    # 호출자가 조회한 최근 날짜(candidates)가 있으면 통계가 메모리에 없어도 VectorDB 재조회 없음
+    trend_context = format_trend_context(
+        get_rolling_stats(user_id, recent_days=candidates), ANALYSIS_TREND_METRICS
+    )
+
     # ============================================
     # 6) LLM 호출
     # ============================================
-    detailed_report = build_detailed_health_analysis(raw)
+    detailed_report = build_detailed_health_analysis(raw, interpretation)
     weight = estimate_weight(raw)
 
     raw_block = f"""[사용자 건강 데이터]
@@ -843,6 +902,8 @@ def run_llm_analysis(
 
 {rag_context}
 
+{trend_context}
+
 ---
 • 사용자 요청 난이도: {difficulty_level}
 • 시스템 권장 강도: {auto_intensity} (건강 점수 기반, 반드시 준수!)
@@ -855,15 +916,17 @@ def run_llm_analysis(
 JSON만 출력. 시간/칼로리 계산 정확히!"""
 
     try:
-        resp = client.chat.completions.create(
-            model=LLM_MODEL_MAIN,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=LLM_MAX_TOKENS,
-            temperature=LLM_TEMPERATURE,
-        )
+        with span("llm", operation="llm_analysis"):
+            resp = client.chat.completions.create(
+                model=LLM_MODEL_MAIN,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                max_tokens=LLM_MAX_TOKENS,
+                temperature=LLM_TEMPERATURE,
+            )
+        record_llm_usage("llm_analysis", resp)
 
         raw_text = resp.choices[0].message.content
         cleaned = clean_json_text(raw_text)
@@ -882,13 +945,13 @@ JSON만 출력. 시간/칼로리 계산 정확히!"""
                     "llm_validated": True,
                     "data_quality": data_quality,
                 }
-                print(
-                    f"[INFO] LLM 결과 검증 성공 (점수: {score}, 강도: {auto_intensity})"
+                logger.debug(
+                    "LLM 결과 검증 성공 (점수: %s, 강도: %s)", score, auto_intensity
                 )
                 return parsed
             else:
-                print(f"[WARN] LLM 결과 검증 실패 → Fallback 사용")
-                result = get_fallback_routine(score, duration_min, raw)
+                logger.warning("LLM 결과 검증 실패 → Fallback 사용")
+                result = get_fallback_routine(score, duration_min, raw, interpretation)
                 result["health_context"] = {
                     "health_score": health_score_info,
                     "recommended_intensity": auto_intensity,
@@ -897,8 +960,8 @@ JSON만 출력. 시간/칼로리 계산 정확히!"""
                 }
                 return result
 
-        print(f"[WARN] LLM JSON 파싱 실패 → Fallback 사용")
-        result = get_fallback_routine(score, duration_min, raw)
+        logger.warning("LLM JSON 파싱 실패 → Fallback 사용")
+        result = get_fallback_routine(score, duration_min, raw, interpretation)
         result["health_context"] = {
             "health_score": health_score_info,
             "recommended_intensity": auto_intensity,
@@ -908,8 +971,8 @@ JSON만 출력. 시간/칼로리 계산 정확히!"""
         return result
 
     except Exception as e:
-        print(f"[ERROR] LLM 호출 실패: {str(e)} → Fallback 사용")
-        result = get_fallback_routine(score, duration_min, raw)
+        logger.error("LLM 호출 실패: %s → Fallback 사용", e)
+        result = get_fallback_routine(score, duration_min, raw, interpretation)
         result["health_context"] = {
             "health_score": health_score_info,
             "recommended_intensity": auto_intensity,
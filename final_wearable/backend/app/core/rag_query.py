@@ -1,10 +1,7 @@
-from app.core.health_interpreter import (
-    calculate_health_score,
-    recommend_exercise_intensity,
-)
+from app.core.health_interpreter import HealthInterpretation
 
 
-def build_rag_query(raw: dict) -> dict:
+def build_rag_query(raw: dict, interpretation: HealthInterpretation = None) -> dict:
     """
     RAG 검색용 query dict 생성
 
@@ -13,8 +10,9 @@ def build_rag_query(raw: dict) -> dict:
     - 수치 원본이 아니라 상태/판단 중심
     """
 
-    health_score = calculate_health_score(raw)
-    exercise_rec = recommend_exercise_intensity(raw)
+    interpretation = interpretation or HealthInterpretation(raw)
+    health_score = interpretation.health_score
+    exercise_rec = interpretation.exercise_recommendation
 
     steps = raw.get("steps", 0)
 
@@ -53,3 +51,44 @@ def classify_rag_strength(similar_days: list) -> str:
         return "weak" if not has_core else "medium"
 
     return "strong"
+
+
+# 유사 날짜 선택에 쓰는 rag query 수치 항목 → 정규화 기준값
+SIMILARITY_SCALES = {"sleep_hr": 8.0, "steps": 10000.0, "health_score": 100.0}
+
+
+def _day_value(day: dict, key: str) -> float:
+    value = day.get(key) if key == "health_score" else (day.get("raw") or {}).get(key)
+    return float(value or 0)
+
+
+def rank_similar_days(
+    query_dict: dict, candidates: list, top_k: int = 3, exclude_date: str = None
+) -> list:
+    """
+    이미 조회한 날짜들 중에서 rag query와 비슷한 날짜 선택 (VectorDB 재검색 / 임베딩 호출 없음)
+
+    ⚠️ search_similar_summaries()(요약 텍스트 임베딩 거리)와는 다른 수치 거리 기준:
+    - 거리: 수면 / 걸음수 / 건강 점수를 기준값으로 나눈 차이의 제곱합 (나머지 지표는 반영 안 함)
+    - 가까운 max(top_k * 3, 10)개 → 최신 날짜순 → top_k (후보를 고른 뒤 정렬하는 방식만 같음)
+    - 분석 대상 날짜(exclude_date) 자신은 후보에서 제외
+
+    Args:
+        query_dict: build_rag_query() 결과
+        candidates: 날짜별 summary 목록 ({"date", "raw", "health_score", ...})
+        exclude_date: 분석 대상 날짜 (YYYY-MM-DD)
+    """
+    if exclude_date:
+        candidates = [day for day in candidates if day.get("date") != exclude_date]
+    if not candidates:
+        return []
+
+    def distance(day):
+        return sum(
+            ((_day_value(day, key) - float(query_dict.get(key) or 0)) / scale) ** 2
+            for key, scale in SIMILARITY_SCALES.items()
+        )
+
+    nearest = sorted(candidates, key=distance)[: max(top_k * 3, 10)]
+    nearest.sort(key=lambda day: day.get("date", ""), reverse=True)
+    return nearest[:top_k]
@@ -0,0 +1,366 @@
+"""
+Rolling Stats - 사용자별 최근 7 / 30 / 90일 누적 통계 (업로드마다 증분 갱신)
+
+주간 리포트 / 걸음수 / 수면 리포트, 챗봇 추세 컨텍스트, 운동 루틴 분석이
+요청마다 최근 summary를 다시 읽어 합계·평균을 계산하지 않도록
+사용자별 통계를 메모리에 유지하고 저장 시점에 바뀐 날짜만 반영한다.
+
+- 지표: DailyHealthRecord 23개 + health_score (0 / 빈 값은 "측정 안 됨" → 제외)
+- 창(7 / 30 / 90일, 최신 날짜 기준 달력 일수)마다 합계 / 기록 일수 / 최소 / 최대
+- 연속 일수: 지표별 연속 기록 일수 + 목표 연속 달성 일수 (STREAK_GOALS, 최대 90일)
+- 최근 90일 값은 ring buffer에 보관
+  * 새 날짜 추가: 창을 벗어나는 날을 빼고 새 날을 더함 (날짜당 O(1))
+  * 같은 날짜 재업로드 / 90일 이내 과거 날짜: 이전 값을 빼고 새 값을 더함
+  * 최소 / 최대는 빠지는 값이 현재 최소 / 최대였을 때만 ring buffer에서 다시 계산
+- 처음 조회할 때는 날짜 테이블(day_table)에서 생성 (Chroma 조회 1번, 이후 업로드는 증분)
+
+사용 예:
+    stats = get_rolling_stats(user_id)
+    stats.window("steps", 7)  # {"days": 6, "total": 48210.0, "mean": 8035.0, "min": ..., "max": ...}
+    format_trend_context(stats, ("steps", "sleep_hr"))
+"""
+
+import logging
+import threading
+from datetime import date
+
+import numpy as np
+
+from app.config import ROLLING_STATS_MAX_USERS, ROLLING_STATS_TTL_SEC
+from app.core.day_table import load_day_table
+from app.utils.data_version import get_data_version
+from app.utils.health_record import METRIC_NAMES, metric_label, metric_row
+from app.utils.lru_cache import LRUCache
+from app.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# 1) 창 / 목표 정의
+# ============================================================
+WINDOWS = (7, 30, 90)
+HISTORY_DAYS = max(WINDOWS)
+
+METRIC_INDEX = {metric: i for i, metric in enumerate(METRIC_NAMES)}
+
+# 목표 연속 달성 기준 (건강 점수 규칙의 "좋음" 구간)
+STREAK_GOALS = {
+    "steps": 8000,
+    "sleep_hr": 7,
+    "exercise_min": 30,
+    "active_calories": 300,
+}
+_GOAL_COLUMNS = np.array([METRIC_INDEX[metric] for metric in STREAK_GOALS])
+_GOAL_VALUES = np.array(list(STREAK_GOALS.values()), dtype=np.float64)
+
+# 정수로 표시할 지표
+_INTEGER_METRICS = {"steps", "flights", "active_calories", "total_calories", "calories_intake"}
+
+
+# ============================================================
+# 2) 사용자 통계
+# ============================================================
+class RollingStats:
+    def __init__(self, version: int = 0):
+        n = len(METRIC_NAMES)
+        self.version = version  # 반영된 사용자 데이터 버전
+        self.lock = threading.Lock()
+        self.latest = None  # 가장 최근 날짜 (ordinal)
+
+        # ring buffer: 날짜 ordinal % HISTORY_DAYS 위치에 값 / 날짜 보관
+        self._values = np.full((HISTORY_DAYS, n), np.nan)
+        self._ordinals = np.full(HISTORY_DAYS, -1, dtype=np.int64)
+
+        self._sum = {w: np.zeros(n) for w in WINDOWS}
+        self._count = {w: np.zeros(n, dtype=np.int64) for w in WINDOWS}
+        self._min = {w: np.full(n, np.nan) for w in WINDOWS}
+        self._max = {w: np.full(n, np.nan) for w in WINDOWS}
+
+        # 연속 일수: [지표별 기록 n개 | 목표 달성 len(STREAK_GOALS)개]
+        self._streaks = np.zeros(n + len(STREAK_GOALS), dtype=np.int64)
+
+    # ------ 1) 갱신 ------
+    def update(self, day: str, row: np.ndarray):
+        """
+        날짜 1개 반영 (metric_row() 결과, 같은 날짜가 있으면 덮어쓰기)
+
+        최신 날짜보다 90일 이상 과거인 날짜는 어느 창에도 속하지 않으므로 무시
+        """
+        ordinal = date.fromisoformat(day[:10]).toordinal()
+        if self.latest is not None and ordinal <= self.latest - HISTORY_DAYS:
+            return
+
+        previous = self.latest
+        stale = set()  # 최소 / 최대를 다시 계산할 창
+        if previous is None or ordinal > previous:
+            self._advance(ordinal, stale)
+
+        slot = ordinal % HISTORY_DAYS
+        old = self._values[slot].copy() if self._ordinals[slot] == ordinal else None
+
+        for w in WINDOWS:
+            if ordinal > self.latest - w:
+                if old is not None:
+                    self._remove(w, old, stale)
+                self._add(w, row)
+
+        self._values[slot] = row
+        self._ordinals[slot] = ordinal
+        for w in stale:
+            self._refresh_extremes(w)
+
+        if old is None and ordinal == self.latest:
+            # 최신 날짜 추가: 하루 차이면 이어서 +1, 비어 있는 날이 있으면 새로 시작
+            met = self._conditions(row)
+            if previous is not None and ordinal == previous + 1:
+                self._streaks = np.where(met, np.minimum(self._streaks + 1, HISTORY_DAYS), 0)
+            else:
+                self._streaks = met.astype(np.int64)
+        else:
+            self._recount_streaks()
+
+    def _advance(self, ordinal: int, stale: set):
+        """최신 날짜를 ordinal로 옮기면서 창을 벗어나는 날짜 제거"""
+        if self.latest is None:
+            self.latest = ordinal
+            return
+
+        gap = ordinal - self.latest
+        for w in WINDOWS:
+            if gap >= w:
+                self._reset_window(w)
+                continue
+            for leaving in range(self.latest - w + 1, ordinal - w + 1):
+                slot = leaving % HISTORY_DAYS
+                if self._ordinals[slot] == leaving:
+                    self._remove(w, self._values[slot], stale)
+
+        # 새 날짜들이 들어갈 자리 비우기 (이전 값은 위에서 90일 창에서 빠짐)
+        if gap >= HISTORY_DAYS:
+            self._values[:] = np.nan
+            self._ordinals[:] = -1
+        else:
+            for entering in range(self.latest + 1, ordinal + 1):
+                slot = entering % HISTORY_DAYS
+                self._values[slot] = np.nan
+                self._ordinals[slot] = -1
+
+        self.latest = ordinal
+
+    def _add(self, w: int, row: np.ndarray):
+        measured = ~np.isnan(row)
+        self._sum[w][measured] += row[measured]
+        self._count[w] += measured
+        self._min[w] = np.fmin(self._min[w], row)
+        self._max[w] = np.fmax(self._max[w], row)
+
+    def _remove(self, w: int, row: np.ndarray, stale: set):
+        measured = ~np.isnan(row)
+        self._sum[w][measured] -= row[measured]
+        self._count[w] -= measured
+        # 기록이 모두 빠진 지표는 부동소수 오차 없이 0으로
+        self._sum[w][self._count[w] == 0] = 0.0
+        if np.any(measured & ((row == self._min[w]) | (row == self._max[w]))):
+            stale.add(w)
+
+    def _reset_window(self, w: int):
+        self._sum[w][:] = 0.0
+        self._count[w][:] = 0
+        self._min[w][:] = np.nan
+        self._max[w][:] = np.nan
+
+    def _in_window(self, w: int) -> np.ndarray:
+        return self._ordinals > self.latest - w
+
+    def _refresh_extremes(self, w: int):
+        rows = self._values[self._in_window(w)]
+        if len(rows):
+            self._min[w] = np.fmin.reduce(rows, axis=0)
+            self._max[w] = np.fmax.reduce(rows, axis=0)
+        else:
+            self._min[w][:] = np.nan
+            self._max[w][:] = np.nan
+
+    @staticmethod
+    def _conditions(row: np.ndarray) -> np.ndarray:
+        """[지표별 기록 여부 | 목표 달성 여부] (NaN은 미달성)"""
+        with np.errstate(invalid="ignore"):
+            goals = row[_GOAL_COLUMNS] >= _GOAL_VALUES
+        return np.concatenate([~np.isnan(row), goals])
+
+    def _recount_streaks(self):
+        """과거 날짜가 바뀐 경우: 최신 날짜부터 거꾸로 ring buffer를 다시 셈"""
+        streaks = np.zeros_like(self._streaks)
+        running = np.ones(len(streaks), dtype=bool)
+        for ordinal in range(self.latest, self.latest - HISTORY_DAYS, -1):
+            slot = ordinal % HISTORY_DAYS
+            if self._ordinals[slot] != ordinal:
+                break
+            running &= self._conditions(self._values[slot])
+            if not running.any():
+                break
+            streaks += running
+        self._streaks = streaks
+
+    # ------ 2) 조회 (O(1)) ------
+    @property
+    def latest_date(self) -> str | None:
+        return date.fromordinal(self.latest).isoformat() if self.latest is not None else None
+
+    def window(self, metric: str, days: int) -> dict:
+        """
+        최신 날짜 기준 최근 days일 (7 / 30 / 90) 통계
+
+        Returns:
+            {"days": 기록 일수, "total", "mean", "min", "max"} (기록이 없으면 값은 None)
+
+        Raises:
+            KeyError: 알 수 없는 지표 / 창
+        """
+        col = METRIC_INDEX[metric]
+        count = int(self._count[days][col])
+        if not count:
+            return {"days": 0, "total": None, "mean": None, "min": None, "max": None}
+
+        total = float(self._sum[days][col])
+        return {
+            "days": count,
+            "total": total,
+            "mean": total / count,
+            "min": float(self._min[days][col]),
+            "max": float(self._max[days][col]),
+        }
+
+    def streak(self, metric: str) -> int:
+        """최신 날짜까지 연속으로 기록된 일수"""
+        return int(self._streaks[METRIC_INDEX[metric]])
+
+    def goal_streak(self, metric: str) -> int:
+        """최신 날짜까지 STREAK_GOALS 기준을 연속으로 달성한 일수"""
+        index = list(STREAK_GOALS).index(metric)
+        return int(self._streaks[len(METRIC_NAMES) + index])
+
+
+# ============================================================
+# 3) 사용자별 저장소
+# ============================================================
+_stats = LRUCache("rolling_stats", max_size=ROLLING_STATS_MAX_USERS, ttl=ROLLING_STATS_TTL_SEC)
+
+
+def _build(user_id: str) -> RollingStats:
+    """날짜 테이블의 최근 90일로 생성"""
+    table = load_day_table(user_id)
+    stats = RollingStats(table.version)
+    if len(table):
+        since = table.dates[-1] - np.timedelta64(HISTORY_DAYS - 1, "D")
+        for day, row in zip(table.dates, table.values):
+            if day >= since:
+                stats.update(str(day), row)
+    return stats
+
+
+def get_rolling_stats(user_id: str, recent_days: list = None) -> RollingStats:
+    """
+    사용자 통계 (메모리에 없거나 반영 안 된 데이터가 있으면 날짜 테이블에서 생성)
+
+    Args:
+        recent_days: 호출자가 이미 조회한 최근 날짜들 ({"date", "raw", "health_score"})
+            → 메모리에 최신 통계가 없으면 이 날짜들로 임시 통계 생성 (VectorDB 조회 없음, 저장 안 함)
+    """
+    version = get_data_version(user_id)
+    stats = _stats.get(user_id)
+    if stats is not None and stats.version == version:
+        return stats
+
+    if recent_days is not None:
+        stats = RollingStats(version)
+        for day in sorted(recent_days, key=lambda d: d.get("date") or ""):
+            if day.get("date"):
+                stats.update(day["date"], metric_row(day.get("raw") or {}, day.get("health_score")))
+        return stats
+
+    with span("rolling_stats_build"):
+        stats = _build(user_id)
+    _stats.set(user_id, stats)
+    return stats
+
+
+def record_days(user_id: str, days, version: int):
+    """
+    저장 직후 호출: 바뀐 날짜만 통계에 반영 (vector_store의 upsert 뒤)
+
+    Args:
+        days: (date "YYYY-MM-DD", raw, health_score) iterable
+        version: 이 저장으로 올라간 데이터 버전
+
+    아직 통계가 없는 사용자는 건너뜀 (첫 조회 때 전체 데이터로 생성)
+    통계가 바로 이전 버전이 아니면 (다른 워커 / 스레드의 저장이 사이에 있음) 버리고 다음 조회 때 생성
+    """
+    stats = _stats.get(user_id)
+    if stats is None:
+        return
+
+    days = sorted(days, key=lambda d: d[0])
+    with stats.lock:
+        if stats.version != version - 1:
+            _stats.pop(user_id)
+            logger.debug("누적 통계 폐기 (버전 %s → %s): %s", stats.version, version, user_id)
+            return
+        for day, raw, health_score in days:
+            stats.update(day, metric_row(raw, health_score))
+        stats.version = version
+
+    logger.debug("누적 통계 갱신: %s (%d일)", user_id, len(days))
+
+
+def rolling_stats_info() -> dict:
+    return _stats.stats()
+
+
+# ============================================================
+# 4) LLM 컨텍스트 포맷팅
+# ============================================================
+def _format_value(metric: str, value: float) -> str:
+    _, unit = metric_label(metric)
+    text = f"{value:,.0f}" if metric in _INTEGER_METRICS else f"{value:,.1f}"
+    return f"{text}{unit}"
+
+
+def format_trend_context(stats: RollingStats, metrics: tuple) -> str:
+    """
+    지표별 7 / 30 / 90일 평균 + 연속 일수 → LLM 프롬프트용 텍스트 (기록 없으면 "")
+
+    예:
+        [최근 추세 (2026-10-19 기준)]
+        - 걸음수: 7일 평균 8,035보 (기록 6일, 최저 3,210보 / 최고 12,000보), 30일 평균 7,512보,
+          90일 평균 7,204보 / 8,000보 이상 3일 연속
+    """
+    lines = []
+    for metric in metrics:
+        label, _ = metric_label(metric)
+        week = stats.window(metric, 7)
+        parts = []
+        if week["days"]:
+            parts.append(
+                f"7일 평균 {_format_value(metric, week['mean'])} "
+                f"(기록 {week['days']}일, 최저 {_format_value(metric, week['min'])} / "
+                f"최고 {_format_value(metric, week['max'])})"
+            )
+        for days in WINDOWS[1:]:
+            summary = stats.window(metric, days)
+            if summary["days"]:
+                parts.append(f"{days}일 평균 {_format_value(metric, summary['mean'])}")
+        if not parts:
+            continue
+
+        line = f"- {label}: " + ", ".join(parts)
+        if metric in STREAK_GOALS and stats.goal_streak(metric):
+            line += (
+                f" / {_format_value(metric, STREAK_GOALS[metric])} 이상 "
+                f"{stats.goal_streak(metric)}일 연속"
+            )
+        lines.append(line)
+
+    if not lines:
+        return ""
+    return f"[최근 추세 ({stats.latest_date} 기준)]\n" + "\n".join(lines)
@@ -5,15 +5,22 @@ VectorDB 중복 방지 + 검색 개선 버전
 - 날짜 필터링 함수 추가 (개선)
 """
 
-import os, json, chromadb
+import os, json, base64, logging, chromadb
 from chromadb import PersistentClient
 from openai import OpenAI
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.utils.preprocess_for_embedding import summary_to_natural_text
-from app.core.health_interpreter import (
-    calculate_health_score,
-    recommend_exercise_intensity,
+from app.utils.health_record import DailyHealthRecord, json_default
+from app.core.health_interpreter import HealthInterpretation
+from app.core.health_score_batch import (
+    calculate_health_scores_batch,
+    raws_to_columns,
+    recommended_levels_batch,
 )
+from app.utils.tracing import span, record_embedding_usage
+from app.utils.data_version import bump_data_version
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------------------------------------
@@ -51,7 +58,11 @@ def embed_text(text: str):
         text = text[:8000]
 
     client = get_openai_client()
-    response = client.embeddings.create(input=text, model="text-embedding-3-small")
+    with span("embedding", mode="single"):
+        response = client.embeddings.create(
+            input=text, model="text-embedding-3-small"
+        )
+    record_embedding_usage(response, 1)
     return response.data[0].embedding
 
 
@@ -77,13 +88,71 @@ def batch_embed_texts(texts: list[str]):
             processed_texts.append(text)
 
     client = get_openai_client()
-    response = client.embeddings.create(
-        input=processed_texts, model="text-embedding-3-small"
-    )
+    with span("embedding", mode="batch"):
+        response = client.embeddings.create(
+            input=processed_texts, model="text-embedding-3-small"
+        )
+    record_embedding_usage(response, len(processed_texts))
 
     return [item.embedding for item in response.data]
 
 
+# ------------------------------------------------
+# 3-1) Summary ↔ Metadata 직렬화
+# ------------------------------------------------
+def summary_to_metadata_fields(summary: dict) -> dict:
+    """
+    summary → Chroma metadata 필드
+
+    - raw_bin: DailyHealthRecord 바이너리 (base64) → 조회 시 JSON 파싱 없이 복원
+    - summary_json: raw를 제외한 나머지 (created_at, summary_text, platform)
+    - 바이너리 변환이 불가능한 raw는 기존처럼 summary_json에 포함
+    """
+    raw = summary.get("raw", {})
+    fields = {}
+
+    try:
+        record = DailyHealthRecord.from_mapping(raw)
+        fields["raw_bin"] = base64.b64encode(record.to_bytes()).decode("ascii")
+        summary = {k: v for k, v in summary.items() if k != "raw"}
+    except (TypeError, ValueError) as e:
+        logger.warning("raw 바이너리 직렬화 실패, JSON으로 저장: %s", e)
+
+    try:
+        fields["summary_json"] = json.dumps(
+            summary, ensure_ascii=False, default=json_default
+        )
+    except Exception as e:
+        logger.warning("Summary JSON 직렬화 실패: %s", e)
+        fields["summary_json"] = str(summary)
+
+    return fields
+
+
+def summary_from_metadata(metadata: dict) -> tuple:
+    """
+    Chroma metadata → (raw, summary_text)
+
+    raw_bin이 없는 이전 데이터는 summary_json의 raw(dict)를 그대로 사용
+    """
+    try:
+        summary_dict = json.loads(metadata.get("summary_json", "{}"))
+    except:
+        summary_dict = {}
+
+    raw_bin = metadata.get("raw_bin")
+    if raw_bin:
+        try:
+            raw = DailyHealthRecord.from_bytes(base64.b64decode(raw_bin))
+        except Exception as e:
+            logger.warning("raw 바이너리 복원 실패: %s", e)
+            raw = summary_dict.get("raw", {})
+    else:
+        raw = summary_dict.get("raw", {})
+
+    return raw, summary_dict.get("summary_text", "")
+
+
 # ------------------------------------------------
 # 4) Summary 단일 저장 (중복 방지!)
 # ------------------------------------------------
@@ -97,8 +166,9 @@ def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
     """
     raw = summary.get("raw", {})
 
-    health_score = calculate_health_score(raw)
-    intensity = recommend_exercise_intensity(raw)
+    interpretation = HealthInterpretation(raw)
+    health_score = interpretation.health_score
+    intensity = interpretation.exercise_recommendation
 
     created_at = summary.get("created_at")
     if not created_at:
@@ -118,13 +188,6 @@ def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
     # 임베딩 생성
     embedding = get_cached_embedding(embedding_text)
 
-    # Metadata 준비
-    try:
-        summary_json = json.dumps(summary, ensure_ascii=False)
-    except Exception as e:
-        print(f"[WARN] Summary JSON 직렬화 실패: {e}")
-        summary_json = str(summary)
-
     # 현재 시간 (업데이트 시간)
     update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
@@ -135,21 +198,26 @@ def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
         "health_score": health_score.get("score", 0),
         "recommended_intensity": intensity.get("recommended_level", "중"),
         "fallback": False,
-        "summary_json": summary_json,
+        **summary_to_metadata_fields(summary),
         "source": source,
         "platform": platform,
         "updated_at": update_timestamp,  # ✅ 마지막 업데이트 시간
     }
 
     # ✅ upsert: 같은 doc_id면 덮어쓰기, 없으면 추가
-    collection.upsert(
-        ids=[doc_id],
-        embeddings=[embedding],
-        documents=[embedding_text],
-        metadatas=[metadata],
+    with span("chroma", op="upsert", fn="save_daily_summary"):
+        collection.upsert(
+            ids=[doc_id],
+            embeddings=[embedding],
+            documents=[embedding_text],
+            metadatas=[metadata],
+        )
+    versions = bump_data_version(user_id)
+    _record_rolling_stats(
+        {user_id: [(date, summary.get("raw", {}), metadata["health_score"])]}, versions
     )
 
-    print(f"[INFO] VectorDB 저장: {doc_id} (플랫폼: {platform})")
+    logger.debug("VectorDB 저장: %s (플랫폼: %s)", doc_id, platform)
 
     return {
         "status": "saved",
@@ -164,33 +232,32 @@ def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
 # ------------------------------------------------
 # 5) Summary 배치 저장 (중복 방지!)
 # ------------------------------------------------
-def save_daily_summaries_batch(
+def prepare_summaries_for_upsert(
     summaries: list[dict], user_id: str, source: str = "zip"
-):
-    """
-    여러 요약 데이터를 한 번에 VectorDB에 저장 (중복 방지 개선!)
+) -> dict:
     """
-    if not summaries:
-        print("[WARN] summaries가 비어 있어서 저장하지 않습니다.")
-        return {"status": "skipped", "reason": "empty summaries"}
+    배치 저장용 ids / documents / metadatas 준비 (네트워크 호출 없음)
 
+    Returns:
+        {"ids": [...], "documents": [...], "metadatas": [...]}
+        documents = 임베딩할 자연어 텍스트
+    """
     ids = []
-    embeddings_list = []
     documents = []
     metadatas = []
-    embedding_texts = []
 
     update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
-    # 1단계: 데이터 준비
-    for summary in summaries:
-        raw = summary.get("raw", {})
-        health_score = calculate_health_score(raw)
-        intensity = recommend_exercise_intensity(raw)
+    # 건강 점수 / 권장 강도 일괄 계산 (날짜별 반복 대신 벡터화)
+    columns = raws_to_columns([summary.get("raw", {}) for summary in summaries])
+    scores = calculate_health_scores_batch(columns)["score"]
+    levels = recommended_levels_batch(columns, scores).tolist()
+
+    for summary, score, level in zip(summaries, scores.tolist(), levels):
 
         created_at = summary.get("created_at")
         if not created_at:
-            print(f"[WARN] summary에 created_at이 없어서 건너뜁니다")
+            logger.warning("summary에 created_at이 없어서 건너뜁니다")
             continue
 
         date = created_at[:10]
@@ -201,59 +268,113 @@ def save_daily_summaries_batch(
         ids.append(doc_id)
 
         # Natural embedding 텍스트
-        embedding_text = summary_to_natural_text(summary)
-        embedding_texts.append(embedding_text)
-        documents.append(embedding_text)
+        documents.append(summary_to_natural_text(summary))
 
         # Metadata
-        try:
-            summary_json = json.dumps(summary, ensure_ascii=False)
-        except Exception as e:
-            print(f"[WARN] Summary JSON 직렬화 실패: {e}")
-            summary_json = str(summary)
-
         metadata = {
             "user_id": user_id,
             "date": date,
             "timestamp": int(date.replace("-", "")),
-            "health_score": health_score.get("score", 0),
-            "recommended_intensity": intensity.get("recommended_level", "중"),
+            "health_score": score,
+            "recommended_intensity": level,
             "fallback": False,
-            "summary_json": summary_json,
+            **summary_to_metadata_fields(summary),
             "source": source,
             "platform": platform,
             "updated_at": update_timestamp,
         }
         metadatas.append(metadata)
 
-    if not ids:
-        print("[WARN] 유효한 summary가 없어서 저장하지 않습니다.")
-        return {"status": "skipped", "reason": "no valid summaries"}
+    return {"ids": ids, "documents": documents, "metadatas": metadatas}
 
-    # 2단계: 배치 임베딩 생성
-    print(f"[INFO] 배치 임베딩 생성 중... ({len(embedding_texts)}개)")
-    embeddings_list = batch_embed_texts(embedding_texts)
-
-    # 3단계: ChromaDB에 한 번에 저장 (upsert로 중복 방지)
-    print(f"[INFO] ChromaDB에 {len(ids)}개 데이터 저장 중...")
-    collection.upsert(
-        ids=ids,
-        embeddings=embeddings_list,
-        documents=documents,
-        metadatas=metadatas,
+
+def upsert_prepared_summaries(prepared: dict, embeddings: list):
+    """prepare_summaries_for_upsert() 결과 + 임베딩을 ChromaDB에 저장"""
+    with span("chroma", op="upsert", fn="upsert_prepared_summaries"):
+        collection.upsert(
+            ids=prepared["ids"],
+            embeddings=embeddings,
+            documents=prepared["documents"],
+            metadatas=prepared["metadatas"],
+        )
+    versions = bump_data_version(*(metadata["user_id"] for metadata in prepared["metadatas"]))
+
+    # raw 복원은 누적 통계가 메모리에 있는 사용자만 (generator → record_days에서 소비)
+    metadatas_by_user = {}
+    for metadata in prepared["metadatas"]:
+        metadatas_by_user.setdefault(metadata["user_id"], []).append(metadata)
+    _record_rolling_stats(
+        {
+            user_id: (
+                (m["date"], summary_from_metadata(m)[0], m["health_score"])
+                for m in metadatas
+            )
+            for user_id, metadatas in metadatas_by_user.items()
+        },
+        versions,
     )
 
+
+def _record_rolling_stats(days_by_user: dict, versions: dict):
+    """저장된 날짜를 사용자별 누적 통계(7 / 30 / 90일)에 증분 반영 (versions: 저장 후 데이터 버전)"""
+    # rolling_stats는 app.config(OPENAI_API_KEY 필수)를 읽으므로 호출 시점에 import
+    from app.core.rolling_stats import record_days
+
+    for user_id, days in days_by_user.items():
+        try:
+            record_days(user_id, days, versions[user_id])
+        except Exception as e:
+            logger.warning("누적 통계 갱신 실패 (%s): %s", user_id, e)
+
+
+def save_daily_summaries_batch(
+    summaries: list[dict], user_id: str, source: str = "zip", batch_size: int = 100
+):
+    """
+    여러 요약 데이터를 VectorDB에 저장 (중복 방지 개선!)
+
+    batch_size개씩 준비 → 임베딩 1회 → upsert 1회 (임베딩 요청 크기 / 메모리 제한)
+    """
+    if not summaries:
+        logger.warning("summaries가 비어 있어서 저장하지 않습니다.")
+        return {"status": "skipped", "reason": "empty summaries"}
+
+    batch_size = max(1, batch_size)
+    saved = 0
+    dates = set()
+    platform = "unknown"
+
+    for start in range(0, len(summaries), batch_size):
+        # 1단계: 데이터 준비
+        prepared = prepare_summaries_for_upsert(
+            summaries[start : start + batch_size], user_id, source
+        )
+        if not prepared["ids"]:
+            continue
+
+        # 2단계: 배치 임베딩 생성
+        logger.debug("배치 임베딩 생성 중... (%s개)", len(prepared["ids"]))
+        embeddings_list = batch_embed_texts(prepared["documents"])
+
+        # 3단계: ChromaDB에 저장 (upsert로 중복 방지)
+        upsert_prepared_summaries(prepared, embeddings_list)
+
+        saved += len(prepared["ids"])
+        dates.update(m["date"] for m in prepared["metadatas"])
+        platform = prepared["metadatas"][0].get("platform", "unknown")
+
+    if not saved:
+        logger.warning("유효한 summary가 없어서 저장하지 않습니다.")
+        return {"status": "skipped", "reason": "no valid summaries"}
+
     # ✅ 중복 체크
-    unique_dates = len(set([m["date"] for m in metadatas]))
-    print(f"[SUCCESS] {len(ids)}개 데이터 VectorDB 저장 완료")
-    print(
-        f"[INFO] 고유 날짜: {unique_dates}개 (플랫폼: {metadatas[0].get('platform', 'unknown')})"
-    )
+    logger.info("%s개 데이터 VectorDB 저장 완료", saved)
+    logger.debug("고유 날짜: %s개 (플랫폼: %s)", len(dates), platform)
 
     return {
         "status": "batch_saved",
-        "count": len(ids),
-        "unique_dates": unique_dates,
+        "count": saved,
+        "unique_dates": len(dates),
         "user_id": user_id,
         "source": source,
     }
@@ -284,11 +405,12 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
         # 더 많이 가져와서 중복 제거 후 top_k 반환
         fetch_count = max(top_k * 3, 10)
 
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=fetch_count,
-            where={"user_id": user_id},
-        )
+        with span("chroma", op="query", fn="search_similar_summaries"):
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=fetch_count,
+                where={"user_id": user_id},
+            )
 
         # 1단계: 결과 파싱
         raw_results = []
@@ -300,14 +422,7 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
                     results["distances"][0][i] if "distances" in results else None
                 )
 
-                summary_json = metadata.get("summary_json", "{}")
-                try:
-                    summary_dict = json.loads(summary_json)
-                except:
-                    summary_dict = {}
-
-                raw = summary_dict.get("raw", {})
-                summary_text = summary_dict.get("summary_text", "")
+                raw, summary_text = summary_from_metadata(metadata)
 
                 raw_results.append(
                     {
@@ -342,10 +457,7 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
         return {"similar_days": similar_days, "query": query_text}
 
     except Exception as e:
-        print(f"[ERROR] VectorDB 검색 실패: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("VectorDB 검색 실패: %s", e)
         return {"similar_days": [], "query": query_dict, "error": str(e)}
 
 
@@ -383,11 +495,14 @@ def _deduplicate_by_date(results: list) -> list:
             latest = max(items, key=lambda x: x.get("updated_at", ""))
             deduplicated.append(latest)
 
-            # 로그 출력 (디버깅용)
-            sources = [
-                f"{i.get('source')}({i.get('updated_at', '')[:8]})" for i in items
-            ]
-            print(f"[INFO] {date} 중복 제거: {sources} → {latest.get('source')}")
+            # 로그 출력 (디버깅용, DEBUG 레벨일 때만 문자열 생성)
+            if logger.isEnabledFor(logging.DEBUG):
+                sources = [
+                    f"{i.get('source')}({i.get('updated_at', '')[:8]})" for i in items
+                ]
+                logger.debug(
+                    "%s 중복 제거: %s → %s", date, sources, latest.get("source")
+                )
 
     return deduplicated
 
@@ -402,17 +517,18 @@ def get_recent_summaries(user_id: str, limit: int = 7) -> list:
 
     Args:
         user_id: 사용자 ID
-        limit: 가져올 개수 (기본 7일)
+        limit: 가져올 개수 (기본 7일, None이면 전체)
 
     Returns:
         최신 날짜순 정렬된 summary 리스트
     """
     try:
         # 전체 데이터 조회 (해당 사용자)
-        results = collection.get(
-            where={"user_id": user_id},
-            include=["metadatas", "documents"],
-        )
+        with span("chroma", op="get", fn="get_recent_summaries"):
+            results = collection.get(
+                where={"user_id": user_id},
+                include=["metadatas", "documents"],
+            )
 
         if not results or not results["ids"]:
             return []
@@ -433,10 +549,7 @@ def get_recent_summaries(user_id: str, limit: int = 7) -> list:
         return sorted_items[:limit]
 
     except Exception as e:
-        print(f"[ERROR] 최신 데이터 조회 실패: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("최신 데이터 조회 실패: %s", e)
         return []
 
 
@@ -458,10 +571,11 @@ def get_summaries_by_date(user_id: str, target_date: str) -> list:
         # timestamp 변환 (YYYYMMDD 정수)
         target_timestamp = int(target_date.replace("-", ""))
 
-        results = collection.get(
-            where={"$and": [{"user_id": user_id}, {"timestamp": target_timestamp}]},
-            include=["metadatas", "documents"],
-        )
+        with span("chroma", op="get", fn="get_summaries_by_date"):
+            results = collection.get(
+                where={"$and": [{"user_id": user_id}, {"timestamp": target_timestamp}]},
+                include=["metadatas", "documents"],
+            )
 
         if not results or not results["ids"]:
             return []
@@ -475,10 +589,7 @@ def get_summaries_by_date(user_id: str, target_date: str) -> list:
         return deduplicated
 
     except Exception as e:
-        print(f"[ERROR] 특정 날짜 데이터 조회 실패: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("특정 날짜 데이터 조회 실패: %s", e)
         return []
 
 
@@ -502,16 +613,17 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
         start_timestamp = int(start_date.replace("-", ""))
         end_timestamp = int(end_date.replace("-", ""))
 
-        results = collection.get(
-            where={
-                "$and": [
-                    {"user_id": user_id},
-                    {"timestamp": {"$gte": start_timestamp}},
-                    {"timestamp": {"$lte": end_timestamp}},
-                ]
-            },
-            include=["metadatas", "documents"],
-        )
+        with span("chroma", op="get", fn="get_summaries_by_date_range"):
+            results = collection.get(
+                where={
+                    "$and": [
+                        {"user_id": user_id},
+                        {"timestamp": {"$gte": start_timestamp}},
+                        {"timestamp": {"$lte": end_timestamp}},
+                    ]
+                },
+                include=["metadatas", "documents"],
+            )
 
         if not results or not results["ids"]:
             return []
@@ -532,10 +644,7 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
         return sorted_items
 
     except Exception as e:
-        print(f"[ERROR] 날짜 범위 데이터 조회 실패: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("날짜 범위 데이터 조회 실패: %s", e)
         return []
 
 
@@ -558,14 +667,7 @@ def _parse_collection_results(results: dict) -> list:
         doc_id = results["ids"][i]
         metadata = results["metadatas"][i]
 
-        summary_json = metadata.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
-
-        raw = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
+        raw, summary_text = summary_from_metadata(metadata)
 
         all_items.append(
             {
@@ -584,3 +686,84 @@ def _parse_collection_results(results: dict) -> list:
         )
 
     return all_items
+
+
+# ------------------------------------------------
+# 11) 여러 사용자 최신 데이터 일괄 조회 (배치 분석용)
+# ------------------------------------------------
+def _latest_metadata_by_user(where: dict) -> dict:
+    """where 조건의 메타데이터만 읽어 사용자별 최신 1건 (id, metadata) 선택"""
+    with span("chroma", op="get", fn="get_latest_summaries_for_users"):
+        results = collection.get(where=where, include=["metadatas"])
+
+    latest = {}
+    if not results or not results["ids"]:
+        return latest
+
+    for doc_id, metadata in zip(results["ids"], results["metadatas"]):
+        user_id = metadata.get("user_id")
+        sort_key = (metadata.get("timestamp", 0), metadata.get("updated_at", ""))
+
+        current = latest.get(user_id)
+        if current is None or sort_key > current[0]:
+            latest[user_id] = (sort_key, doc_id, metadata)
+
+    return {u: (doc_id, metadata) for u, (_, doc_id, metadata) in latest.items()}
+
+
+def get_latest_summaries_for_users(user_ids: list[str]) -> dict:
+    """
+    여러 사용자의 최신 날짜 데이터를 한 번의 조회로 가져오기
+
+    사용자마다 collection.get()을 반복하지 않고
+    $in 필터 한 번으로 최근 BATCH_LATEST_LOOKBACK_DAYS일만 읽은 뒤 사용자별 최신 1건만 남긴다.
+    - documents는 읽지 않음 (summary_text는 메타데이터에서 복원)
+    - raw_bin 디코딩은 사용자별로 남은 1건만
+    - 최근 범위에 데이터가 없는 사용자만 전체 기간에서 다시 조회
+
+    Args:
+        user_ids: 사용자 ID 리스트
+
+    Returns:
+        {user_id: 최신 summary(dict)} (데이터 없는 사용자는 제외)
+    """
+    if not user_ids:
+        return {}
+
+    from app.config import BATCH_LATEST_LOOKBACK_DAYS
+
+    user_ids = list(dict.fromkeys(user_ids))
+    cutoff = int(
+        (datetime.now() - timedelta(days=BATCH_LATEST_LOOKBACK_DAYS - 1)).strftime(
+            "%Y%m%d"
+        )
+    )
+
+    try:
+        latest = _latest_metadata_by_user(
+            {
+                "$and": [
+                    {"user_id": {"$in": user_ids}},
+                    {"timestamp": {"$gte": cutoff}},
+                ]
+            }
+        )
+
+        missing = [u for u in user_ids if u not in latest]
+        if missing:
+            latest.update(_latest_metadata_by_user({"user_id": {"$in": missing}}))
+
+        if not latest:
+            return {}
+
+        doc_ids, metadatas = zip(*latest.values())
+        return {
+            item["user_id"]: item
+            for item in _parse_collection_results(
+                {"ids": list(doc_ids), "metadatas": list(metadatas)}
+            )
+        }
+
+    except Exception as e:
+        logger.exception("사용자별 최신 데이터 일괄 조회 실패: %s", e)
+        return {}
@@ -1,12 +1,16 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.file_upload_api import router as file_upload_router
+from app.api.file_upload_api import job_service as upload_job_service
 from app.api.auto_upload_api import router as auto_upload_router
 from app.api.similar_api import router as similar_router
 from app.api.chat_api import router as chat_router
@@ -14,12 +18,46 @@ from app.api.user_api import router as user_router
 
 from fastapi import APIRouter
 from app.core.vector_store import collection, search_similar_summaries
+from app.utils.tracing import request_trace, render_metrics
+from app.utils.logger import setup_logging
+from app.core.chatbot_engine.intent_classifier import set_intent_model
+from app.core.chatbot_engine.intent_model import IntentModel
+from app.config import INTENT_MODEL_PATH, INTENT_MODEL_MIN_CONFIDENCE
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-print("🔥🔥 FASTAPI SERVER LOADED: VERSION TEST 🔥🔥")
+setup_logging()
+logger = logging.getLogger(__name__)
+logger.info("FastAPI 서버 로드 완료")
+
+
+def load_intent_model(path: str):
+    """로컬 intent 모델 로드 (실패해도 규칙 기반으로 계속 동작)"""
+    try:
+        model = IntentModel.load(path)
+    except Exception as e:
+        logger.warning("intent 모델 로드 실패 → 규칙 기반 사용: path=%s error=%s", path, e)
+        return
+    set_intent_model(model, INTENT_MODEL_MIN_CONFIDENCE)
+    logger.info(
+        "intent 모델 로드: path=%s n_grams=%d min_confidence=%.2f",
+        path, len(model.vocab), INTENT_MODEL_MIN_CONFIDENCE,
+    )
+
+
+# ==========================
+# 0) 앱 수명주기 (업로드 job worker 시작/종료)
+# ==========================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if INTENT_MODEL_PATH:
+        load_intent_model(INTENT_MODEL_PATH)
+    await upload_job_service.start()
+    yield
+    await upload_job_service.stop()
+
 
 # ==========================
 # 1) FastAPI 앱 생성
@@ -29,6 +67,7 @@ app = FastAPI(
     description="DB → JSON → AI 분석 트레이너 서비스",
     version="0.1.0",
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # ==========================
@@ -42,6 +81,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# ==========================
+# 2-1) 요청 추적 (trace_id + 라우트별 지연 시간)
+# ==========================
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    with request_trace(
+        request.method, request.url.path, request.headers.get("x-request-id")
+    ) as trace:
+        response = await call_next(request)
+        trace["status"] = response.status_code
+
+        # 히스토그램 라벨은 실제 경로 대신 라우트 템플릿 사용 (/api/file/jobs/{job_id})
+        route = request.scope.get("route")
+        if route is not None:
+            trace["route"] = route.path
+
+    response.headers["X-Request-ID"] = trace["trace_id"]
+    return response
+
+
 # ==========================
 # 3) 기존 라우터 등록
 # ==========================
@@ -138,6 +201,14 @@ def root():
     return {"message": "API is running (VectorDB mode)"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 수집용 지표 (지연 시간 히스토그램 / LLM·임베딩 호출 수, 토큰)"""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ==========================
 # 5) Global Exception Handlers
 # ==========================
@@ -159,6 +230,7 @@ async def validation_exception_handler(request, exc):
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
+    logger.exception("처리되지 않은 오류: %s %s", request.method, request.url.path)
     return JSONResponse(
         status_code=500,
         content={
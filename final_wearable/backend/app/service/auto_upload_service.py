@@ -1,21 +1,31 @@
 import uuid
 import asyncio
+import logging
 from fastapi import HTTPException
 from concurrent.futures import ThreadPoolExecutor
 
-from app.utils.preprocess import preprocess_health_json
+from app.config import (
+    AUTO_ANALYSIS_DEBOUNCE_SEC,
+    AUTO_ANALYSIS_MAX_WAIT_SEC,
+    EMBEDDING_BATCH_SIZE,
+)
+from app.utils.preprocess import preprocess_health_json, preprocess_health_batch
 from app.utils.platform_detection import detect_platform
-from app.core.vector_store import save_daily_summary
+from app.core.vector_store import save_daily_summary, save_daily_summaries_batch
 from app.core.llm_analysis import run_llm_analysis
+from app.service.fixed_report_service import fixed_report_service
+from app.utils.tracing import bind_context
 
 
+logger = logging.getLogger(__name__)
+
 executor = ThreadPoolExecutor(max_workers=4)
 
 
 async def run_blocking(func, *args):
     """동기 함수를 비동기로 실행"""
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(executor, lambda: func(*args))
+    return await loop.run_in_executor(executor, bind_context(func, *args))
 
 
 class AutoUploadService:
@@ -26,8 +36,21 @@ class AutoUploadService:
     1. 날짜별 개별 처리 (ZIP과 동일한 방식)
     2. 각 날짜마다 VectorDB에 별도 저장
     3. platform 자동 감지 (samsung/apple)
+    4. 사용자별 분석 병합: 동기화 중 연속 업로드는 저장만 즉시 하고,
+       업로드가 잠잠해지면 가장 최근 날짜로 LLM 분석 1회 실행
+       (같은 난이도 / 운동 시간으로 대기 중인 요청은 모두 같은 분석 결과를 공유)
     """
 
+    def __init__(
+        self,
+        debounce_sec: float = AUTO_ANALYSIS_DEBOUNCE_SEC,
+        max_wait_sec: float = AUTO_ANALYSIS_MAX_WAIT_SEC,
+    ):
+        self.debounce_sec = debounce_sec
+        self.max_wait_sec = max_wait_sec
+        self._pending = {}  # (user_id, 난이도, 시간) → 대기 중인 분석 (아직 시작 전)
+        self._running = set()  # 실행 중인 분석 task (GC 방지)
+
     @staticmethod
     def get_or_create_user_id(user_id: str | None):
         if not user_id or not user_id.strip():
@@ -47,18 +70,15 @@ class AutoUploadService:
         # ✅ 플랫폼 자동 감지
         platform = detect_platform(json_data)
 
-        print(f"\n{'='*60}")
-        print(f"📥 API 데이터 처리 시작: {date}")
-        print(f"{'='*60}")
-        print(f"User ID: {user_id}")
-        print(f"Date: {date}")
-        print(f"Platform: {platform}")  # ✅ 감지된 플랫폼 출력
-        print(f"Difficulty: {difficulty}, Duration: {duration}분")
-        print(f"Raw data keys: {list(json_data.keys())}")
+        logger.info(
+            "API 데이터 처리 시작: date=%s platform=%s user=%s difficulty=%s duration=%s분",
+            date, platform, user_id, difficulty, duration,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw data keys: %s", list(json_data.keys()))
 
         # 1️⃣ Summary 생성 (날짜 포함)
         try:
-            print(f"\n[STEP 1] Summary 생성 중... (날짜: {date})")
 
             # ✅ 날짜 문자열을 date_int로 변환 (YYYYMMDD)
             # 예: "2025-12-17" → 20251217
@@ -71,70 +91,253 @@ class AutoUploadService:
                 platform,  # ✅ 자동 감지된 플랫폼 사용
             )
 
-            print(f"✅ Summary 생성 완료")
-            print(f"   created_at: {latest_summary.get('created_at')}")
-            print(f"   platform: {platform}")
-            print(f"   date: {date}")
+            logger.debug(
+                "Summary 생성 완료: created_at=%s", latest_summary.get("created_at")
+            )
 
         except Exception as e:
-            print(f"❌ Summary 생성 실패: {str(e)}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Summary 생성 실패: %s", e)
             raise HTTPException(500, f"Summary 생성 실패: {str(e)}")
 
         # 2️⃣ Vector DB 저장
         try:
-            print(f"\n[STEP 2] Vector DB 저장 중...")
-
             # ✅ 플랫폼별 source 구분
             source = f"api_{platform}"  # "api_samsung" or "api_apple"
 
-            print(f"   플랫폼: {platform}")
-            print(f"   Source: {source}")
-
             save_result = await run_blocking(
                 save_daily_summary, latest_summary, user_id, source
             )
-            print(f"✅ Vector DB 저장 완료 (source: {source}): {save_result}")
+            logger.debug("Vector DB 저장 완료 (source: %s): %s", source, save_result)
 
         except Exception as e:
-            print(f"❌ Vector DB 저장 실패: {str(e)}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Vector DB 저장 실패: %s", e)
             raise HTTPException(500, f"Vector DB 저장 실패: {str(e)}")
 
-        # 3️⃣ LLM 분석
+        # 3️⃣ LLM 분석 (사용자별 병합 → 최신 날짜 1회)
+        llm_result, analysis_date = await self.request_analysis(
+            user_id, date, latest_summary, difficulty, duration
+        )
+
+        # 4️⃣ 최종 응답
+        logger.info(
+            "%s 데이터 처리 완료 (플랫폼: %s, 분석 날짜: %s)",
+            date, platform, analysis_date,
+        )
+
+        return {
+            "success": True,
+            "user_id": user_id,
+            "date": date,
+            "platform": platform,  # ✅ 응답에 플랫폼 포함
+            "summary": latest_summary,
+            "analysis_date": analysis_date,  # 분석에 사용된 날짜 (병합 시 최신 날짜)
+            "analysis": llm_result.get("analysis", ""),
+            "ai_recommended_routine": llm_result.get("ai_recommended_routine", {}),
+            "detailed_health_report": llm_result.get("detailed_health_report", ""),
+        }
+
+    async def process_bulk_json(
+        self,
+        days: list[dict],
+        user_id: str | None,
+        difficulty: str = "중",
+        duration: int = 30,
+    ):
+        """
+        여러 날짜 데이터를 한 번에 처리 (앱 동기화용)
+
+        - 전처리: 플랫폼별 1회 (preprocess_health_batch)
+        - 임베딩/저장: 플랫폼별 EMBEDDING_BATCH_SIZE씩 (save_daily_summaries_batch)
+        - LLM 분석: 가장 최근 날짜 1회만
+
+        Args:
+            days: [{"date": "YYYY-MM-DD", "raw_json": {...}}, ...]
+                  (같은 날짜가 여러 번 오면 마지막 값 사용)
+        """
+        user_id = self.get_or_create_user_id(user_id)
+
+        raw_by_date = {}
+        for day in days:
+            raw_by_date[day["date"]] = day["raw_json"]
+
+        if not raw_by_date:
+            raise HTTPException(400, "업로드할 날짜 데이터가 없습니다.")
+
+        dates = sorted(raw_by_date.keys())
+        latest_date = dates[-1]
+
+        logger.info(
+            "API 데이터 일괄 처리 시작: %d일 (%s ~ %s) user=%s difficulty=%s duration=%s분",
+            len(dates), dates[0], latest_date, user_id, difficulty, duration,
+        )
+
+        # 1️⃣ Summary 일괄 생성 (플랫폼별로 묶어서 1회씩)
+        try:
+
+            # {platform: {date_int: raw_json}}
+            raw_by_platform = {}
+            for date in dates:
+                raw_json = raw_by_date[date]
+                platform = detect_platform(raw_json)
+                date_int = int(date.replace("-", ""))
+                raw_by_platform.setdefault(platform, {})[date_int] = raw_json
+
+            summaries_by_platform = {}
+            for platform, raw_by_day in raw_by_platform.items():
+                summaries_by_platform[platform] = await run_blocking(
+                    preprocess_health_batch, raw_by_day, platform
+                )
+
+            latest_date_int = int(latest_date.replace("-", ""))
+            latest_platform = next(
+                platform
+                for platform, summaries in summaries_by_platform.items()
+                if latest_date_int in summaries
+            )
+            latest_summary = summaries_by_platform[latest_platform][latest_date_int]
+
+            logger.debug(
+                "Summary %d일 생성 완료 (플랫폼: %s)",
+                len(dates), list(summaries_by_platform),
+            )
+
+        except Exception as e:
+            logger.exception("Summary 생성 실패: %s", e)
+            raise HTTPException(500, f"Summary 생성 실패: {str(e)}")
+
+        # 2️⃣ Vector DB 일괄 저장 (EMBEDDING_BATCH_SIZE씩 임베딩 + upsert)
         try:
-            print(f"\n[STEP 3] LLM 분석 시작...")
-            print(f"   summary keys: {list(latest_summary.keys())}")
-            print(f"   user_id: {user_id}")
-            print(f"   difficulty: {difficulty}")
-            print(f"   duration: {duration}")
+            for platform, summaries in summaries_by_platform.items():
+                source = f"api_{platform}"
+                save_result = await run_blocking(
+                    save_daily_summaries_batch,
+                    list(summaries.values()),
+                    user_id,
+                    source,
+                    EMBEDDING_BATCH_SIZE,
+                )
+                logger.debug(
+                    "Vector DB 저장 완료 (source: %s): %s", source, save_result
+                )
+
+        except Exception as e:
+            logger.exception("Vector DB 저장 실패: %s", e)
+            raise HTTPException(500, f"Vector DB 저장 실패: {str(e)}")
+
+        # 3️⃣ LLM 분석 (가장 최근 날짜만, 단건 업로드와 병합)
+        llm_result, analysis_date = await self.request_analysis(
+            user_id, latest_date, latest_summary, difficulty, duration
+        )
+
+        # 4️⃣ 최종 응답
+        logger.info("%d일 데이터 일괄 처리 완료 (분석 날짜: %s)", len(dates), analysis_date)
+
+        return {
+            "success": True,
+            "user_id": user_id,
+            "dates_saved": dates,
+            "latest_date": latest_date,
+            "platform": latest_platform,
+            "summary": latest_summary,
+            "analysis_date": analysis_date,
+            "analysis": llm_result.get("analysis", ""),
+            "ai_recommended_routine": llm_result.get("ai_recommended_routine", {}),
+            "detailed_health_report": llm_result.get("detailed_health_report", ""),
+        }
+
+    # ------------------------------------------------------------
+    # 사용자별 분석 병합 (debounce + single-flight)
+    # ------------------------------------------------------------
+    async def request_analysis(
+        self,
+        user_id: str,
+        date: str,
+        summary: dict,
+        difficulty: str,
+        duration: int,
+    ) -> tuple:
+        """
+        사용자별 LLM 분석 요청 (짧은 시간 내 요청은 1회로 병합)
+
+        - 같은 사용자 + 같은 난이도 / 운동 시간 요청만 병합
+          (다른 조건으로 요청한 쪽이 남의 조건으로 만든 루틴을 받지 않도록)
+        - 대기 중인 분석이 있으면 합류하고, 더 최근 날짜면 분석 대상 교체
+        - 요청이 올 때마다 debounce 타이머 재시작
+          (단, 첫 요청 후 max_wait_sec가 지나면 바로 시작)
+        - 병합된 요청은 모두 같은 결과를 받음
+
+        Returns:
+            (llm_result, 분석에 사용된 날짜)
+        """
+        loop = asyncio.get_running_loop()
+        key = (user_id, difficulty, duration)
+        pending = self._pending.get(key)
+
+        if pending is None:
+            future = loop.create_future()
+            # 요청한 쪽이 모두 취소돼도 "exception was never retrieved" 경고 방지
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            pending = {
+                "future": future,
+                "user_id": user_id,
+                "date": date,
+                "summary": summary,
+                "difficulty": difficulty,
+                "duration": duration,
+                "requests": 0,
+                "first_at": loop.time(),
+                "timer": None,
+            }
+            self._pending[key] = pending
+        elif date >= pending["date"]:
+            pending.update(date=date, summary=summary)
+
+        pending["requests"] += 1
+
+        if pending["timer"] is not None:
+            pending["timer"].cancel()
+        remaining = pending["first_at"] + self.max_wait_sec - loop.time()
+        delay = max(0.0, min(self.debounce_sec, remaining))
+        pending["timer"] = loop.call_later(delay, self._start_analysis, key)
+
+        # 한 요청이 취소돼도 공유 분석은 계속 진행
+        return await asyncio.shield(pending["future"])
+
+    def _start_analysis(self, key: tuple):
+        """debounce 타이머 만료 → 대기 목록에서 꺼내 분석 시작"""
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        task = asyncio.ensure_future(self._run_analysis(pending))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_analysis(self, pending: dict):
+        future = pending["future"]
+        logger.info(
+            "LLM 분석 시작: user=%s date=%s (병합 요청 %d건)",
+            pending["user_id"], pending["date"], pending["requests"],
+        )
 
+        try:
             llm_result = await run_blocking(
                 run_llm_analysis,
-                latest_summary,
-                user_id,
-                difficulty,
-                duration,
+                pending["summary"],
+                pending["user_id"],
+                pending["difficulty"],
+                pending["duration"],
             )
 
-            print(f"✅ LLM 분석 완료")
-            print(f"   result keys: {list(llm_result.keys())}")
+            logger.debug("LLM 분석 완료: result keys=%s", list(llm_result))
 
             # 결과 검증
             if "analysis" not in llm_result:
-                print("[WARN] LLM 결과에 'analysis' 필드가 없습니다.")
+                logger.warning("LLM 결과에 'analysis' 필드가 없습니다.")
             if "ai_recommended_routine" not in llm_result:
-                print("[WARN] LLM 결과에 'ai_recommended_routine' 필드가 없습니다.")
+                logger.warning("LLM 결과에 'ai_recommended_routine' 필드가 없습니다.")
 
         except Exception as e:
-            print(f"❌ LLM 분석 실패: {str(e)}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("LLM 분석 실패: %s", e)
             # ✅ LLM 분석 실패해도 데이터는 저장됨
             llm_result = {
                 "analysis": "LLM 분석 실패",
@@ -142,18 +345,8 @@ class AutoUploadService:
                 "detailed_health_report": "",
             }
 
-        # 4️⃣ 최종 응답
-        print(f"\n{'='*60}")
-        print(f"✅ {date} 데이터 처리 완료 (플랫폼: {platform})")
-        print(f"{'='*60}\n")
+        if not future.done():
+            future.set_result((llm_result, pending["date"]))
 
-        return {
-            "success": True,
-            "user_id": user_id,
-            "date": date,
-            "platform": platform,  # ✅ 응답에 플랫폼 포함
-            "summary": latest_summary,
-            "analysis": llm_result.get("analysis", ""),
-            "ai_recommended_routine": llm_result.get("ai_recommended_routine", {}),
-            "detailed_health_report": llm_result.get("detailed_health_report", ""),
-        }
+        # 업로드가 잠잠해진 시점 → 고정형 챗봇 리포트 미리 생성 (백그라운드)
+        fixed_report_service.schedule(pending["user_id"])
@@ -0,0 +1,170 @@
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import BATCH_LLM_CONCURRENCY
+from app.utils.health_record import json_default
+from app.core.vector_store import get_latest_summaries_for_users
+from app.core.health_score_batch import (
+    calculate_health_scores_batch,
+    health_scores_to_dicts,
+)
+from app.core.llm_analysis import (
+    run_llm_analysis,
+    check_data_quality,
+    decide_fallback,
+    get_exercise_settings_by_score,
+    get_fallback_routine,
+)
+from app.utils.tracing import bind_context
+
+
+logger = logging.getLogger(__name__)
+
+# LLM 호출 전용 Executor (동시 호출 수 = 세마포어 크기)
+executor = ThreadPoolExecutor(max_workers=BATCH_LLM_CONCURRENCY)
+
+
+async def run_blocking(func, *args):
+    """동기 함수를 비동기로 실행"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, bind_context(func, *args))
+
+
+def _to_ndjson(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=json_default) + "\n"
+
+
+class BatchAnalysisService:
+    """
+    여러 사용자의 최신 분석 + 운동 추천을 한 번에 처리하는 서비스
+
+    처리 순서:
+    1. VectorDB 1회 조회로 전체 사용자의 최신 날짜 데이터 수집
+    2. 건강 점수 / 운동 설정 / Fallback 여부를 규칙 기반으로 일괄 계산
+    3. Fallback 대상은 LLM 없이 즉시 루틴 생성 → 바로 스트리밍
+    4. 나머지만 동시 호출 수가 제한된 LLM 풀에서 분석
+    5. 결과는 완료되는 순서대로 NDJSON 한 줄씩 반환
+    """
+
+    def __init__(self, max_llm_concurrency: int = BATCH_LLM_CONCURRENCY):
+        self.max_llm_concurrency = max(1, max_llm_concurrency)
+
+    @staticmethod
+    def _build_result(user_id: str, day: dict, llm_result: dict, mode: str) -> dict:
+        """/api/user/latest-analysis 응답과 같은 형식으로 정리"""
+        return {
+            "success": True,
+            "user_id": user_id,
+            "date": day.get("date", ""),
+            "mode": mode,  # "rule_based" or "llm"
+            "summary": {
+                "summary_text": day.get("summary_text", ""),
+                "raw": day.get("raw", {}),
+            },
+            "analysis": llm_result.get("analysis", ""),
+            "ai_recommended_routine": llm_result.get("ai_recommended_routine", {}),
+            "detailed_health_report": llm_result.get("detailed_health_report", ""),
+        }
+
+    @staticmethod
+    def _build_error(user_id: str, message: str) -> dict:
+        return {"success": False, "user_id": user_id, "error": message}
+
+    async def stream_analyses(
+        self, user_ids: list[str], difficulty: str = "중", duration: int = 30
+    ):
+        """
+        사용자별 분석 결과를 NDJSON 문자열로 하나씩 yield
+
+        Args:
+            user_ids: 분석할 사용자 ID 리스트 (중복은 1회만 처리)
+            difficulty: 요청 난이도
+            duration: 목표 운동 시간 (분)
+        """
+        # 순서 유지 + 중복 제거
+        user_ids = list(dict.fromkeys(u for u in user_ids if u and u.strip()))
+
+        logger.info("배치 분석 요청: %s명", len(user_ids))
+
+        # 1️⃣ VectorDB 1회 조회
+        latest_by_user = await run_blocking(get_latest_summaries_for_users, user_ids)
+
+        for user_id in user_ids:
+            day = latest_by_user.get(user_id)
+            if not day or not day.get("raw"):
+                latest_by_user.pop(user_id, None)
+                yield _to_ndjson(
+                    self._build_error(user_id, "업로드된 데이터가 없습니다.")
+                )
+
+        # 2️⃣ 규칙 기반 일괄 판단 (건강 점수는 벡터화 계산)
+        found_users = [u for u in user_ids if u in latest_by_user]
+        score_infos = health_scores_to_dicts(
+            calculate_health_scores_batch(
+                [latest_by_user[u]["raw"] for u in found_users]
+            )
+        )
+
+        llm_targets = []
+        rule_based_count = 0
+
+        for user_id, health_score_info in zip(found_users, score_infos):
+            day = latest_by_user[user_id]
+            raw = day["raw"]
+            score = health_score_info["score"]
+            settings = get_exercise_settings_by_score(score)
+            data_quality = check_data_quality(raw)
+            fallback_reason = decide_fallback(score, data_quality)
+
+            if not fallback_reason:
+                llm_targets.append((user_id, day))
+                continue
+
+            # 3️⃣ Fallback 대상 → LLM 없이 즉시 생성
+            result = get_fallback_routine(score, duration, raw)
+            result["health_context"] = {
+                "health_score": health_score_info,
+                "recommended_intensity": settings["intensity"],
+                "fallback_reason": fallback_reason,
+                "data_quality": data_quality,
+            }
+            rule_based_count += 1
+            yield _to_ndjson(self._build_result(user_id, day, result, "rule_based"))
+
+        logger.info(
+            "배치 분석: 규칙 기반 %d명, LLM 대상 %d명", rule_based_count, len(llm_targets)
+        )
+
+        if not llm_targets:
+            return
+
+        # 4️⃣ 동시 호출 수가 제한된 LLM 풀
+        semaphore = asyncio.Semaphore(self.max_llm_concurrency)
+
+        async def analyze(user_id: str, day: dict) -> dict:
+            summary = {
+                "created_at": day.get("date", ""),
+                "summary_text": day.get("summary_text", ""),
+                "raw": day.get("raw", {}),
+            }
+            async with semaphore:
+                try:
+                    llm_result = await run_blocking(
+                        run_llm_analysis, summary, user_id, difficulty, duration
+                    )
+                except Exception as e:
+                    logger.error("배치 LLM 분석 실패 (%s): %s", user_id, e)
+                    return self._build_error(user_id, f"AI 분석 중 오류: {str(e)}")
+            return self._build_result(user_id, day, llm_result, "llm")
+
+        tasks = [asyncio.create_task(analyze(u, d)) for u, d in llm_targets]
+
+        # 5️⃣ 완료되는 순서대로 스트리밍
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield _to_ndjson(await finished)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,4 +1,5 @@
 from app.core.chatbot_engine.chat_generator import ChatGenerator
+from app.core.chatbot_engine.chat_session import get_or_create_session, save_session
 from app.core.chatbot_engine.fixed_responses import generate_fixed_response
 
 # 새 캐릭터 3종만 허용
@@ -17,19 +18,34 @@ class ChatService:
     # -------------------------------------------
     # 1) 자유형 (intent → sentiment → RAG → LLM)
     # -------------------------------------------
-    def handle_chat(self, user_id: str, message: str, character: str):
+    def handle_chat(
+        self, user_id: str, message: str, character: str, session_id: str = None
+    ):
 
         # 캐릭터 정규화(허용되지 않으면 기본 → booster_coach)
         persona_key = character if character in VALID_PERSONAS else "booster_coach"
 
-        # ChatGenerator 내부에서 persona_prompt + LLM 호출 수행
-        response = self.generator.generate(
-            user_id=user_id,
-            message=message,
-            character=persona_key,
-        )
-
-        return {"character": persona_key, "response": response}
+        # 대화 세션 (없거나 만료됐으면 새 세션 → 응답의 session_id로 이어서 대화)
+        session = get_or_create_session(session_id, user_id, persona_key)
+
+        # 같은 세션의 턴은 순서대로 (날짜 / 조회 결과 / 대화 기록 공유)
+        with session.lock:
+            # ChatGenerator 내부에서 persona_prompt + LLM 호출 수행
+            response = self.generator.generate(
+                user_id=user_id,
+                message=message,
+                character=persona_key,
+                session=session,
+                session_id=session.session_id,
+            )
+            session.add_turn(message, response)
+        save_session(session)
+
+        return {
+            "character": persona_key,
+            "response": response,
+            "session_id": session.session_id,
+        }
 
     # -------------------------------------------
     # 2) 고정형
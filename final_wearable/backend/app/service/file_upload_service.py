@@ -1,4 +1,5 @@
-import os, shutil, tempfile, uuid
+import os, shutil, tempfile, time, uuid, logging
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
@@ -9,9 +10,18 @@ from app.core.unzipper import extract_zip_to_temp
 from app.core.db_to_json import db_to_json
 from app.core.db_parser import parse_db_json_to_raw_data_by_day
 
-from app.utils.preprocess import preprocess_health_json
-from app.core.vector_store import save_daily_summaries_batch
+from app.config import EMBEDDING_BATCH_SIZE
+from app.utils.preprocess import preprocess_health_batch
+from app.core.vector_store import (
+    batch_embed_texts,
+    prepare_summaries_for_upsert,
+    upsert_prepared_summaries,
+)
 from app.core.llm_analysis import run_llm_analysis
+from app.service.fixed_report_service import fixed_report_service
+from app.utils.tracing import span, bind_context
+
+logger = logging.getLogger(__name__)
 
 # 비동기 처리용 Executor
 executor = ThreadPoolExecutor(max_workers=4)
@@ -29,6 +39,77 @@ UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# ============================================================
+# 단계별 진행 기록
+# ============================================================
+class StageTracker:
+    """
+    업로드 파이프라인 단계별 상태 / 소요 시간 기록
+
+    - 기본 구현은 메모리에만 기록
+    - 하위 클래스에서 _on_change()로 저장소에 반영 (업로드 job 큐)
+    """
+
+    STAGES = ("extract", "parse", "preprocess", "vector_store", "llm_analysis")
+
+    def __init__(self, stages: list = None):
+        self.stages = {name: {"name": name, "status": "pending"} for name in self.STAGES}
+        for saved in stages or []:
+            if saved.get("name") in self.stages:
+                self.stages[saved["name"]] = dict(saved)
+
+    def is_done(self, name: str) -> bool:
+        return self.stages[name]["status"] == "done"
+
+    @property
+    def current(self) -> str | None:
+        for info in self.stages.values():
+            if info["status"] == "running":
+                return info["name"]
+        return None
+
+    def as_list(self) -> list:
+        return [dict(info) for info in self.stages.values()]
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        with tracker.stage("parse") as info:
+            ...
+            info["days"] = 100  # 단계별 부가 정보
+        """
+        info = {
+            "name": name,
+            "status": "running",
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.stages[name] = info
+        self._on_change()
+
+        start = time.perf_counter()
+        try:
+            with span("upload.stage", stage=name):
+                yield info
+        except BaseException as e:
+            info["status"] = "failed"
+            info["error"] = str(getattr(e, "detail", e))
+            raise
+        else:
+            info["status"] = "done"
+        finally:
+            info["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            info["finished_at"] = datetime.now().isoformat(timespec="seconds")
+            self._on_change()
+
+    def update(self, name: str, **detail):
+        """진행 중인 단계의 부가 정보 갱신 (예: 처리된 날짜 수)"""
+        self.stages[name].update(detail)
+        self._on_change()
+
+    def _on_change(self):
+        """단계 상태 변경 시 호출 (기본: 아무것도 안 함)"""
+
+
 class FileUploadService:
     """
     ZIP/DB 파일 업로드 처리 서비스 (날짜 및 플랫폼 정보 개선 버전)
@@ -50,7 +131,7 @@ class FileUploadService:
     async def run_blocking(func, *args):
         """동기 함수를 비동기로 실행"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(executor, lambda: func(*args))
+        return await loop.run_in_executor(executor, bind_context(func, *args))
 
     @staticmethod
     def detect_platform(filename: str, db_json: dict) -> str:
@@ -89,15 +170,21 @@ class FileUploadService:
 
         return "unknown"
 
-    async def process_file(
-        self,
-        file: UploadFile,
-        user_id: str | None,
-        difficulty: str,
-        duration: int,
-    ):
+    # ============================================================
+    # 1) 업로드 파일 저장 (요청 처리 중에 수행)
+    # ============================================================
+    async def save_upload(self, file: UploadFile, user_id: str | None) -> dict:
+        """
+        업로드 파일을 추출 폴더 + uploads/ 폴더에 저장
+
+        Returns:
+            파이프라인 실행에 필요한 경로 정보 (job 재시작 시에도 그대로 사용)
+        """
         user_id = self.get_or_create_user_id(user_id)
 
+        if not file.filename.lower().endswith((".zip", ".db")):
+            raise HTTPException(400, "ZIP 또는 DB 파일만 업로드 가능합니다.")
+
         # 사용자별 타임스탬프 디렉토리
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         user_short = user_id.replace("@", "_").replace(".", "_")
@@ -107,115 +194,136 @@ class FileUploadService:
 
         temp_path = os.path.join(temp_dir, file.filename)
 
-        try:
-            print(f"[INFO] 파일 업로드 시작: {file.filename}")
+        logger.info("파일 업로드 시작: %s", file.filename)
+
+        # 1️⃣ 파일 저장
+        with open(temp_path, "wb") as buffer:
+            buffer.write(await file.read())
+
+        # ============================================================
+        # 📌 수정: ZIP/DB 모두 uploads/ 폴더에 원본 저장
+        # ============================================================
+        original_save_name = f"{user_short}_{timestamp}_{file.filename}"
+        original_save_path = UPLOADS_DIR / original_save_name
+        shutil.copy2(temp_path, original_save_path)
+        logger.info("원본 파일 저장: %s", original_save_path)
+
+        return {
+            "user_id": user_id,
+            "filename": file.filename,
+            "user_short": user_short,
+            "temp_dir": temp_dir,
+            "temp_path": temp_path,
+            "original_save_name": original_save_name,
+            "original_save_path": str(original_save_path),
+        }
+
+    # ============================================================
+    # 2) 분석 파이프라인 (추출 → 파싱 → 전처리 → VectorDB → LLM)
+    # ============================================================
+    async def run_pipeline(
+        self,
+        upload: dict,
+        difficulty: str,
+        duration: int,
+        tracker: "StageTracker" = None,
+    ) -> dict:
+        """
+        저장된 업로드 파일을 분석
+
+        Args:
+            upload: save_upload() 결과
+            tracker: 단계별 진행 기록 (재시작 시 완료된 vector_store 단계는 건너뜀)
+        """
+        tracker = tracker or StageTracker()
 
-            # 1️⃣ 파일 저장
-            with open(temp_path, "wb") as buffer:
-                buffer.write(await file.read())
+        user_id = upload["user_id"]
+        filename = upload["filename"]
+        temp_dir = upload["temp_dir"]
+        temp_path = upload["temp_path"]
+        original_save_path = upload["original_save_path"]
 
-            # ============================================================
-            # 📌 수정: ZIP/DB 모두 uploads/ 폴더에 원본 저장
-            # ============================================================
-            original_save_name = f"{user_short}_{timestamp}_{file.filename}"
-            original_save_path = UPLOADS_DIR / original_save_name
-            shutil.copy2(temp_path, original_save_path)
-            print(f"[INFO] 원본 파일 저장: {original_save_path}")
+        try:
+            # 재시작 시 추출 폴더가 정리됐으면 원본에서 복구
+            if not os.path.exists(temp_path):
+                if not os.path.exists(original_save_path):
+                    raise HTTPException(404, "업로드 파일을 찾을 수 없습니다.")
+                os.makedirs(temp_dir, exist_ok=True)
+                shutil.copy2(original_save_path, temp_path)
 
             # 2️⃣ ZIP 또는 DB 판별
-            if file.filename.lower().endswith(".zip"):
-                print("[INFO] ZIP 파일 압축 해제 중...")
-                db_path = await self.run_blocking(extract_zip_to_temp, temp_path)
-            elif file.filename.lower().endswith(".db"):
-                db_path = temp_path
-            else:
-                raise HTTPException(400, "ZIP 또는 DB 파일만 업로드 가능합니다.")
-
-            if not db_path:
-                raise HTTPException(500, "DB 파일 경로를 찾을 수 없습니다.")
+            with tracker.stage("extract"):
+                if filename.lower().endswith(".zip"):
+                    logger.debug("ZIP 파일 압축 해제 중...")
+                    db_path = await self.run_blocking(extract_zip_to_temp, temp_path)
+                elif filename.lower().endswith(".db"):
+                    db_path = temp_path
+                else:
+                    raise HTTPException(400, "ZIP 또는 DB 파일만 업로드 가능합니다.")
+
+                if not db_path:
+                    raise HTTPException(500, "DB 파일 경로를 찾을 수 없습니다.")
 
             # 3️⃣ DB → JSON (비동기 처리)
-            print("[INFO] DB 파싱 중...")
-            raw_db_json = await self.run_blocking(db_to_json, db_path)
+            with tracker.stage("parse") as stage:
+                logger.debug("DB 파싱 중...")
+                raw_db_json = await self.run_blocking(db_to_json, db_path)
+
+                # ✅ 개선: 플랫폼 감지
+                platform = self.detect_platform(filename, raw_db_json)
+                logger.debug("감지된 플랫폼: %s", platform)
+
+                # 4️⃣ 날짜별 raw 추출
+                logger.debug("날짜별 데이터 추출 중...")
+                raw_by_day = await self.run_blocking(
+                    parse_db_json_to_raw_data_by_day, raw_db_json
+                )
 
-            # ✅ 개선: 플랫폼 감지
-            platform = self.detect_platform(file.filename, raw_db_json)
-            print(f"[INFO] 감지된 플랫폼: {platform}")
+                if not raw_by_day:
+                    raise HTTPException(
+                        500, "DB Parser가 건강 데이터를 추출하지 못했습니다."
+                    )
 
-            # 4️⃣ 날짜별 raw 추출
-            print("[INFO] 날짜별 데이터 추출 중...")
-            raw_by_day = await self.run_blocking(
-                parse_db_json_to_raw_data_by_day, raw_db_json
-            )
-
-            if not raw_by_day:
-                raise HTTPException(
-                    500, "DB Parser가 건강 데이터를 추출하지 못했습니다."
-                )
+                stage["days"] = len(raw_by_day)
+                stage["platform"] = platform
 
             total_days = len(raw_by_day)
-            print(f"[INFO] 총 {total_days}일치 데이터 추출 완료")
+            logger.info("총 %s일치 데이터 추출 완료", total_days)
 
             # 날짜 범위 출력
             dates = sorted(raw_by_day.keys())
             if dates:
-                print(f"[INFO] 날짜 범위: {dates[0]} ~ {dates[-1]}")
+                logger.debug("날짜 범위: %s ~ %s", dates[0], dates[-1])
 
             # 5️⃣ 최신 날짜 결정
             latest_date = max(raw_by_day.keys())
-            latest_raw = raw_by_day[latest_date]
-
-            # 6️⃣ 최신 1일치 summary (분석용)
-            print("[INFO] 최신 데이터 전처리 중...")
-            latest_summary = await self.run_blocking(
-                preprocess_health_json, latest_raw, latest_date, platform
-            )
-
-            # 7️⃣ 전체 날짜 summary → Vector DB 배치 저장
-            print(f"[INFO] VectorDB에 {total_days}일치 데이터 배치 저장 중...")
-
-            all_summaries = []
-            for date_int, raw in raw_by_day.items():
-                daily_summary = await self.run_blocking(
-                    preprocess_health_json,
-                    raw,
-                    date_int,
-                    platform,
-                )
-                all_summaries.append(daily_summary)
 
+            # 6️⃣~8️⃣ 전처리 → 임베딩 → VectorDB 저장 / 최신 날짜 LLM 분석
+            #        (배치 단위 파이프라인 + LLM 분석 동시 실행)
             source = f"zip_{platform}"
-            await self.run_blocking(
-                save_daily_summaries_batch, all_summaries, user_id, source
-            )
-
-            print(
-                f"[SUCCESS] {total_days}일치 데이터 VectorDB 저장 완료 (플랫폼: {platform})"
-            )
-
-            # 8️⃣ LLM 분석 (최신 데이터만)
-            print("[INFO] LLM 분석 실행 중...")
-            llm_result = await self.run_blocking(
-                run_llm_analysis,
-                latest_summary,
+            latest_summary, llm_result = await self._run_streaming_stages(
+                raw_by_day,
+                latest_date,
+                platform,
                 user_id,
+                source,
                 difficulty,
                 duration,
+                tracker,
             )
 
-            print("[SUCCESS] 분석 완료")
+            # 9️⃣ 고정형 챗봇 리포트 미리 생성 (백그라운드, 응답은 기다리지 않음)
+            fixed_report_service.schedule(user_id)
 
             # ============================================================
             # 📌 수정: 저장 경로 정보 로그
             # ============================================================
-            print(f"\n{'='*70}")
-            print(f"📦 파일 저장 정보:")
-            print(f"  • 파일 타입: {file.filename.split('.')[-1].upper()}")
-            print(f"  • 원본 파일: {original_save_path}")
-            print(f"  • 압축 해제: {temp_dir}")
-            print(f"  • 플랫폼: {platform}")
-            print(f"  • 날짜 범위: {dates[0]} ~ {dates[-1]}")
-            print(f"{'='*70}\n")
+            logger.info(
+                "분석 완료: %s (%s, 플랫폼: %s, 날짜 범위: %s ~ %s)",
+                filename, filename.split(".")[-1].upper(), platform,
+                dates[0], dates[-1],
+            )
+            logger.debug("원본 파일: %s, 압축 해제: %s", original_save_path, temp_dir)
 
             return {
                 "message": "ZIP/DB 업로드 및 분석 성공",
@@ -227,7 +335,7 @@ class FileUploadService:
                 "summary": latest_summary,
                 "llm_result": llm_result,
                 "file_info": {
-                    "file_type": file.filename.split(".")[-1],
+                    "file_type": filename.split(".")[-1],
                     "original_path": str(original_save_path),
                     "extract_dir": temp_dir,
                 },
@@ -236,45 +344,205 @@ class FileUploadService:
         except HTTPException:
             raise
         except Exception as e:
-            print(f"[ERROR] 처리 중 오류: {str(e)}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("처리 중 오류: %s", e)
             raise HTTPException(500, f"ZIP/DB 처리 중 오류 발생: {str(e)}")
 
-        finally:
-            # 9️⃣ 이전 데이터 정리 + 현재 데이터 보존
-            try:
-                # 1. 현재 사용자의 모든 추출 디렉토리 찾기
-                user_pattern = f"{user_short}_*"
-                user_dirs = list(EXTRACTED_DIR.glob(user_pattern))
-
-                # 2. 현재 디렉토리 제외
-                current_dir = Path(temp_dir)
-                old_dirs = [d for d in user_dirs if d != current_dir]
-
-                # 3. 이전 추출 디렉토리 삭제
-                for old_dir in old_dirs:
-                    print(f"[INFO] 이전 데이터 삭제: {old_dir.name}")
-                    shutil.rmtree(old_dir)
-
-                # ============================================================
-                # 📌 수정: 모든 파일 타입에 대해 이전 원본 삭제
-                # ============================================================
-                # 4. 같은 유저의 이전 원본 파일 삭제 (ZIP/DB 모두)
-                file_pattern = f"{user_short}_*.*"  # 모든 확장자
-                old_files = list(UPLOADS_DIR.glob(file_pattern))
-
-                # 현재 파일 제외
-                current_file = UPLOADS_DIR / original_save_name
-                old_files = [f for f in old_files if f != current_file]
-
-                for old_file in old_files:
-                    print(f"[INFO] 이전 원본 파일 삭제: {old_file.name}")
-                    old_file.unlink()
-
-                print(f"[INFO] 최신 데이터 보존: {temp_dir}")
-                print(f"[INFO] 최신 원본 보존: {original_save_path}")
-
-            except Exception as e:
-                print(f"[WARN] 이전 데이터 정리 중 오류 (무시): {str(e)}")
+    async def _run_streaming_stages(
+        self,
+        raw_by_day: dict,
+        latest_date: int,
+        platform: str,
+        user_id: str,
+        source: str,
+        difficulty: str,
+        duration: int,
+        tracker: "StageTracker",
+    ) -> tuple:
+        """
+        전처리 / 임베딩 / VectorDB 저장을 배치 단위로 겹쳐서 실행
+
+            전처리 배치 k+2 → 임베딩 배치 k+1 → upsert 배치 k
+                 └─ 최신 날짜 전처리 직후 → LLM 분석 (저장과 동시에)
+
+        - 최신 날짜부터 처리 (최근 데이터가 먼저 검색 가능)
+        - 단계 사이 큐는 크기 제한 → 느린 단계 기준으로 속도가 맞춰짐
+        - 전체 소요 시간 ≈ 가장 느린 단계 (합이 아님)
+
+        Returns:
+            (latest_summary, llm_result)
+        """
+        dates = sorted(raw_by_day.keys(), reverse=True)
+        batches = [
+            dates[i : i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(dates), EMBEDDING_BATCH_SIZE)
+        ]
+
+        store_done = tracker.is_done("vector_store")
+        if store_done:
+            logger.info("VectorDB 저장은 이전 실행에서 완료됨 (건너뜀)")
+
+        embed_queue = asyncio.Queue(maxsize=2)
+        upsert_queue = asyncio.Queue(maxsize=2)
+        latest_ready = asyncio.get_running_loop().create_future()
+
+        # ------ 1) 전처리 (배치) ------
+        async def preprocess():
+            processed = 0
+            with tracker.stage("preprocess"):
+                for batch in batches:
+                    summaries_by_day = await self.run_blocking(
+                        preprocess_health_batch,
+                        {d: raw_by_day[d] for d in batch},
+                        platform,
+                    )
+                    if not latest_ready.done():
+                        latest_ready.set_result(summaries_by_day[latest_date])
+
+                    if not store_done:
+                        prepared = await self.run_blocking(
+                            prepare_summaries_for_upsert,
+                            list(summaries_by_day.values()),
+                            user_id,
+                            source,
+                        )
+                        await embed_queue.put(prepared)
+
+                    processed += len(batch)
+                    tracker.update("preprocess", days=processed)
+
+            await embed_queue.put(None)
+
+        # ------ 2) 임베딩 → 3) upsert (배치) ------
+        async def embed():
+            while True:
+                prepared = await embed_queue.get()
+                if prepared is None:
+                    break
+                if prepared["ids"]:
+                    embeddings = await self.run_blocking(
+                        batch_embed_texts, prepared["documents"]
+                    )
+                    await upsert_queue.put((prepared, embeddings))
+            await upsert_queue.put(None)
+
+        async def upsert():
+            saved = 0
+            while True:
+                item = await upsert_queue.get()
+                if item is None:
+                    break
+                await self.run_blocking(upsert_prepared_summaries, *item)
+                saved += len(item[0]["ids"])
+                tracker.update("vector_store", saved=saved)
+            return saved
+
+        async def store():
+            with tracker.stage("vector_store"):
+                logger.debug(
+                    "VectorDB에 %d일치 데이터 저장 중 (배치 %d개)...",
+                    len(dates), len(batches),
+                )
+                _, saved = await asyncio.gather(embed(), upsert())
+            logger.info("%d일치 데이터 VectorDB 저장 완료 (플랫폼: %s)", saved, platform)
+
+        # ------ 4) LLM 분석 (최신 날짜 준비되는 즉시) ------
+        async def analyze():
+            latest_summary = await latest_ready
+            with tracker.stage("llm_analysis"):
+                logger.debug("LLM 분석 실행 중...")
+                llm_result = await self.run_blocking(
+                    run_llm_analysis,
+                    latest_summary,
+                    user_id,
+                    difficulty,
+                    duration,
+                )
+            return latest_summary, llm_result
+
+        tasks = [asyncio.create_task(preprocess()), asyncio.create_task(analyze())]
+        if not store_done:
+            tasks.append(asyncio.create_task(store()))
+
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return results[1]
+
+    # ============================================================
+    # 3) 이전 업로드 정리
+    # ============================================================
+    @staticmethod
+    def cleanup_previous_uploads(upload: dict, keep: set = frozenset()):
+        """
+        같은 사용자의 이전 추출 폴더 / 원본 파일 삭제 (현재 데이터 보존)
+
+        현재 업로드보다 오래된 것만 삭제한다.
+        (이름이 "{user_short}_{timestamp}" 로 시작하므로 문자열 비교 = 시간 비교)
+        대기 중인 더 최신 업로드 job의 파일은 건드리지 않는다.
+
+        Args:
+            keep: 삭제하지 않을 추출 폴더 / 원본 파일 이름
+                  (아직 끝나지 않은 이전 업로드 job의 파일)
+        """
+        # 9️⃣ 이전 데이터 정리 + 현재 데이터 보존
+        try:
+            user_short = upload["user_short"]
+            temp_dir = upload["temp_dir"]
+
+            # 1. 현재 사용자의 모든 추출 디렉토리 찾기
+            user_pattern = f"{user_short}_*"
+            user_dirs = list(EXTRACTED_DIR.glob(user_pattern))
+
+            # 2. 현재 디렉토리 이전 것만
+            current_dir = Path(temp_dir)
+            old_dirs = [
+                d for d in user_dirs if d.name < current_dir.name and d.name not in keep
+            ]
+
+            # 3. 이전 추출 디렉토리 삭제
+            for old_dir in old_dirs:
+                logger.debug("이전 데이터 삭제: %s", old_dir.name)
+                shutil.rmtree(old_dir)
+
+            # ============================================================
+            # 📌 수정: 모든 파일 타입에 대해 이전 원본 삭제
+            # ============================================================
+            # 4. 같은 유저의 이전 원본 파일 삭제 (ZIP/DB 모두)
+            file_pattern = f"{user_short}_*.*"  # 모든 확장자
+            old_files = list(UPLOADS_DIR.glob(file_pattern))
+
+            # 현재 파일 이전 것만
+            current_file = UPLOADS_DIR / upload["original_save_name"]
+            old_files = [
+                f for f in old_files if f.name < current_file.name and f.name not in keep
+            ]
+
+            for old_file in old_files:
+                logger.debug("이전 원본 파일 삭제: %s", old_file.name)
+                old_file.unlink()
+
+            logger.debug("최신 데이터 보존: %s", temp_dir)
+            logger.debug("최신 원본 보존: %s", upload["original_save_path"])
+
+        except Exception as e:
+            logger.warning("이전 데이터 정리 중 오류 (무시): %s", e)
+
+    # ============================================================
+    # 4) 동기 처리 (업로드 → 분석 결과를 한 요청에서 반환)
+    # ============================================================
+    async def process_file(
+        self,
+        file: UploadFile,
+        user_id: str | None,
+        difficulty: str,
+        duration: int,
+    ):
+        upload = await self.save_upload(file, user_id)
+        result = await self.run_pipeline(upload, difficulty, duration)
+        # 실패한 업로드는 이전 데이터를 지우지 않음
+        self.cleanup_previous_uploads(upload)
+        return result
@@ -0,0 +1,53 @@
+"""
+Fixed Report Service - 업로드 후 고정형 챗봇 리포트 미리 생성
+
+업로드(ZIP / 앱 자동 업로드)가 끝나면 사용자별로 백그라운드에서
+고정형 질문 6종 × 캐릭터 3종 리포트를 생성해 둔다 (precompute_fixed_responses).
+/api/chat/fixed는 저장된 리포트를 조회만 하고, 아직 없으면 그때 생성한다.
+
+- 사용자별 1개씩만 실행 (실행 중 추가 업로드가 오면 끝난 뒤 1번 더 실행)
+- 업로드 응답은 기다리지 않음 (fire-and-forget, 실패는 로그만)
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.chatbot_engine.fixed_responses import precompute_fixed_responses
+from app.utils.tracing import bind_context
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=2)
+
+
+class FixedReportService:
+    def __init__(self):
+        self._running = {}  # user_id → 실행 중인 task
+        self._rerun = set()  # 실행 중 새 업로드가 들어온 사용자
+
+    def schedule(self, user_id: str):
+        """리포트 생성 예약 (이벤트 루프에서 호출)"""
+        if user_id in self._running:
+            self._rerun.add(user_id)
+            return
+        self._running[user_id] = asyncio.ensure_future(self._run(user_id))
+
+    async def _run(self, user_id: str):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self._rerun.discard(user_id)
+                try:
+                    await loop.run_in_executor(
+                        executor, bind_context(precompute_fixed_responses, user_id)
+                    )
+                except Exception as e:
+                    logger.exception("고정형 리포트 생성 실패: user_id=%s error=%s", user_id, e)
+                if user_id not in self._rerun:
+                    break
+        finally:
+            self._running.pop(user_id, None)
+
+
+fixed_report_service = FixedReportService()
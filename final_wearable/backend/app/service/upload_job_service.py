@@ -0,0 +1,484 @@
+"""
+Upload Job Service - ZIP/DB 업로드 백그라운드 처리
+
+/api/file/upload 요청은 파일 저장 후 job id만 즉시 반환하고,
+추출 → 파싱 → 전처리 → VectorDB 저장 → LLM 분석은 worker가 처리한다.
+
+- job 상태 / 단계별 진행 / 결과는 로컬 SQLite에 저장
+  * 이벤트 루프에서는 전용 스레드 1개로 기록 (요청 처리 차단 없음, 기록 순서 유지)
+  * 배치 진행 상황은 UPLOAD_JOB_PROGRESS_INTERVAL_SEC 간격으로만 저장
+- 서버 재시작 시 끝나지 않은 job(queued/running)은 다시 대기열에 등록
+  * 실행 전 SQLite UPDATE 1번으로 job 점유 (queued 또는 점유 기간이 지난 running만)
+    → 같은 zip_data를 쓰는 워커 프로세스가 여러 개여도 job은 한 곳에서만 실행
+  * 실행 중에는 점유 기간(UPLOAD_JOB_LEASE_SEC)을 계속 연장, 연장이 끊긴 job은 주기적으로 다시 가져감
+  * UPLOAD_JOB_MAX_ATTEMPTS번 실행되고도 끝나지 않은 job은 failed 처리
+- 재실행 시 이미 완료된 vector_store 단계는 건너뜀 (임베딩 중복 호출 방지)
+- 성공한 job만 같은 사용자의 이전 업로드 파일 정리 (끝나지 않은 job의 파일은 보존)
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import asyncio
+import sqlite3
+import threading
+from functools import partial
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import UploadFile
+
+from app.config import (
+    UPLOAD_JOB_DB,
+    UPLOAD_JOB_WORKERS,
+    UPLOAD_JOB_MAX_ATTEMPTS,
+    UPLOAD_JOB_LEASE_SEC,
+    UPLOAD_JOB_PROGRESS_INTERVAL_SEC,
+)
+from app.service.file_upload_service import (
+    FileUploadService,
+    StageTracker,
+    ZIP_DATA_DIR,
+)
+from app.utils.health_record import json_default
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_PATH = UPLOAD_JOB_DB or str(ZIP_DATA_DIR / "upload_jobs.sqlite3")
+
+UNFINISHED_STATUSES = ("queued", "running")
+
+# 이 프로세스의 job 점유 표시 (디버깅용)
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# ============================================================
+# 1) Job 저장소 (SQLite)
+# ============================================================
+class UploadJobStore:
+    """업로드 job 상태 저장소 (스레드 안전)"""
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # 이벤트 루프에서의 기록은 이 스레드 1개에서 순서대로 실행
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-job-db")
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS upload_jobs (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    duration INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    current_stage TEXT,
+                    upload_json TEXT NOT NULL,
+                    stages_json TEXT NOT NULL DEFAULT '[]',
+                    result_json TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+                """
+            )
+            # 이전 버전 DB에 점유 컬럼 추가
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(upload_jobs)")}
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE upload_jobs ADD COLUMN owner TEXT")
+            if "lease_until" not in columns:
+                self._conn.execute("ALTER TABLE upload_jobs ADD COLUMN lease_until REAL")
+
+    def create(self, upload: dict, difficulty: str, duration: int) -> str:
+        job_id = uuid.uuid4().hex
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO upload_jobs
+                    (id, user_id, filename, difficulty, duration, status,
+                     upload_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    upload["user_id"],
+                    upload["filename"],
+                    difficulty,
+                    duration,
+                    json.dumps(upload, ensure_ascii=False),
+                    now,
+                    now,
+                ),
+            )
+        return job_id
+
+    # ------ 이벤트 루프용 (전용 스레드에서 실행) ------
+    async def run(self, method, *args, **kwargs):
+        """저장소 메서드를 전용 스레드에서 실행하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, partial(method, *args, **kwargs))
+
+    def update_later(self, job_id: str, **fields):
+        """기다리지 않는 갱신 (단계 진행 기록용, 이후 run() 호출보다 먼저 반영됨)"""
+        future = self._writer.submit(self.update, job_id, **fields)
+        future.add_done_callback(_log_write_error)
+
+    def update(self, job_id: str, **fields):
+        """컬럼 값 갱신 (stages / result는 JSON으로 변환해서 저장)"""
+        if "stages" in fields:
+            fields["stages_json"] = json.dumps(
+                fields.pop("stages"), ensure_ascii=False
+            )
+        if "result" in fields:
+            fields["result_json"] = json.dumps(
+                fields.pop("result"), ensure_ascii=False, default=json_default
+            )
+        fields["updated_at"] = _now()
+
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE upload_jobs SET {columns} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def claim(self, job_id: str, owner: str, lease_sec: float) -> dict | None:
+        """
+        job 점유 후 실행 횟수 +1 (UPDATE 1번, 워커 프로세스 간에도 한 곳만 성공)
+
+        Returns:
+            점유한 job (queued가 아니고 다른 곳이 점유 중이거나 이미 끝났으면 None)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """
+                UPDATE upload_jobs
+                SET status = 'running', attempts = attempts + 1, owner = ?,
+                    lease_until = ?, started_at = COALESCE(started_at, ?),
+                    error = NULL, updated_at = ?
+                WHERE id = ? AND (
+                    status = 'queued'
+                    OR (status = 'running' AND (lease_until IS NULL OR lease_until < ?))
+                )
+                """,
+                (owner, now + lease_sec, _now(), _now(), job_id, now),
+            )
+        if cursor.rowcount == 0:
+            return None
+        return self.get(job_id)
+
+    def extend_lease(self, job_id: str, owner: str, lease_sec: float):
+        """실행 중 점유 기간 연장 (다른 곳이 가져간 job은 그대로)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE upload_jobs SET lease_until = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time() + lease_sec, job_id, owner),
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM upload_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["upload"] = json.loads(job.pop("upload_json"))
+        job["stages"] = json.loads(job.pop("stages_json") or "[]")
+        result_json = job.pop("result_json")
+        job["result"] = json.loads(result_json) if result_json else None
+        return job
+
+    def list_unfinished(self) -> list:
+        """다시 처리할 job id (queued + 점유 기간이 지난 running, 생성 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM upload_jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND (lease_until IS NULL OR lease_until < ?)) "
+                "ORDER BY created_at",
+                (time.time(),),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def unfinished_uploads(self, user_id: str, exclude_job_id: str = None) -> list:
+        """같은 사용자의 끝나지 않은 (queued/running) job 업로드 정보"""
+        placeholders = ", ".join("?" for _ in UNFINISHED_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT upload_json FROM upload_jobs WHERE user_id = ? "
+                f"AND status IN ({placeholders}) AND id != ?",
+                (user_id, *UNFINISHED_STATUSES, exclude_job_id or ""),
+            ).fetchall()
+        return [json.loads(row["upload_json"]) for row in rows]
+
+
+def _log_write_error(future):
+    error = future.exception()
+    if error is not None:
+        logger.error("업로드 job 상태 저장 실패: %s", error)
+
+
+# ============================================================
+# 2) 단계 기록 → 저장소 반영
+# ============================================================
+class JobStageTracker(StageTracker):
+    """
+    단계 상태가 바뀔 때마다 job 저장소에 기록 (기다리지 않음)
+
+    - 단계 시작 / 종료: 항상 기록
+    - 배치 진행 상황 (update): UPLOAD_JOB_PROGRESS_INTERVAL_SEC 간격으로만 기록
+    """
+
+    def __init__(self, store: UploadJobStore, job_id: str, stages: list = None):
+        super().__init__(stages)
+        self.store = store
+        self.job_id = job_id
+        self._last_progress = 0.0
+
+    def update(self, name: str, **detail):
+        self.stages[name].update(detail)
+        now = time.monotonic()
+        if now - self._last_progress >= UPLOAD_JOB_PROGRESS_INTERVAL_SEC:
+            self._last_progress = now
+            self._on_change()
+
+    def _on_change(self):
+        self.store.update_later(
+            self.job_id, stages=self.as_list(), current_stage=self.current
+        )
+
+
+# ============================================================
+# 3) Job 큐 + Worker
+# ============================================================
+class UploadJobService:
+    """
+    업로드 job 큐
+
+    사용 순서:
+    1. 앱 시작 시 start() → worker 실행 + 미완료 job 재등록 (이후 주기적으로 점유 끊긴 job 확인)
+    2. submit()으로 파일 저장 후 job 등록 (즉시 반환)
+    3. get_job()으로 진행 상황 조회
+    """
+
+    def __init__(
+        self,
+        store: UploadJobStore = None,
+        file_service: FileUploadService = None,
+        workers: int = UPLOAD_JOB_WORKERS,
+    ):
+        self.store = store or UploadJobStore()
+        self.file_service = file_service or FileUploadService()
+        self.workers = max(1, workers)
+        self._queue = None
+        self._queued = set()  # 대기열에 있는 job id (중복 등록 방지)
+        self._worker_tasks = []
+
+    # ------ 1) 시작 / 종료 ------
+    async def start(self):
+        if self._worker_tasks:
+            return
+
+        self._queue = asyncio.Queue()
+
+        resumed = await self._enqueue_unfinished()
+        if resumed:
+            logger.info("미완료 업로드 job %s건 재등록", resumed)
+
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        self._worker_tasks.append(asyncio.create_task(self._recover_loop()))
+        logger.info("업로드 job worker %s개 시작", self.workers)
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    # ------ 2) 등록 / 조회 ------
+    async def submit(
+        self,
+        file: UploadFile,
+        user_id: str | None,
+        difficulty: str,
+        duration: int,
+    ) -> dict:
+        """파일 저장 + job 등록 후 바로 반환"""
+        await self.start()
+
+        upload = await self.file_service.save_upload(file, user_id)
+        job_id = await self.store.run(self.store.create, upload, difficulty, duration)
+        self._enqueue(job_id)
+
+        logger.info("업로드 job 등록: %s (%s)", job_id, upload["filename"])
+
+        return {
+            "job_id": job_id,
+            "status": "queued",
+            "user_id": upload["user_id"],
+            "status_url": f"/api/file/jobs/{job_id}",
+        }
+
+    def get_job(self, job_id: str) -> dict | None:
+        """job 상태 조회 (API 응답 형식)"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+
+        stages = job["stages"] or StageTracker().as_list()
+        done = sum(1 for stage in stages if stage["status"] == "done")
+
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "user_id": job["user_id"],
+            "filename": job["filename"],
+            "current_stage": job["current_stage"],
+            "progress": {"done": done, "total": len(stages)},
+            "stages": stages,
+            "attempts": job["attempts"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+            "updated_at": job["updated_at"],
+            "result": job["result"],
+            "error": job["error"],
+        }
+
+    # ------ 3) Worker ------
+    def _enqueue(self, job_id: str):
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _enqueue_unfinished(self) -> int:
+        """queued / 점유 끊긴 running job을 대기열에 등록 (실행 여부는 claim()에서 결정)"""
+        job_ids = await self.store.run(self.store.list_unfinished)
+        for job_id in job_ids:
+            self._enqueue(job_id)
+        return len(job_ids)
+
+    async def _recover_loop(self):
+        """다른 워커 프로세스가 실행 도중 종료된 job을 점유 기간이 지나면 다시 가져감"""
+        while True:
+            await asyncio.sleep(UPLOAD_JOB_LEASE_SEC)
+            try:
+                await self._enqueue_unfinished()
+            except Exception as e:
+                logger.warning("미완료 업로드 job 확인 실패: %s", e)
+
+    async def _keep_lease(self, job_id: str):
+        """실행 중 job 점유 기간 연장 (실행이 끝나면 취소됨)"""
+        while True:
+            await asyncio.sleep(UPLOAD_JOB_LEASE_SEC / 3)
+            try:
+                await self.store.run(
+                    self.store.extend_lease, job_id, WORKER_ID, UPLOAD_JOB_LEASE_SEC
+                )
+            except Exception as e:
+                logger.warning("업로드 job 점유 연장 실패 (%s): %s", job_id, e)
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.exception("업로드 job worker %s 오류 (%s): %s", index, job_id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        # 점유 실패 = 다른 worker / 프로세스가 실행 중이거나 이미 끝남
+        job = await self.store.run(
+            self.store.claim, job_id, WORKER_ID, UPLOAD_JOB_LEASE_SEC
+        )
+        if job is None:
+            return
+
+        upload = job["upload"]
+
+        # 실행 도중 프로세스가 죽는 job이 재시작마다 반복 실행되지 않도록
+        if job["attempts"] > UPLOAD_JOB_MAX_ATTEMPTS:
+            logger.error(
+                "업로드 job 최대 실행 횟수 초과: %s (%s회)", job_id, job["attempts"] - 1
+            )
+            await self.store.run(
+                self.store.update,
+                job_id,
+                status="failed",
+                current_stage=None,
+                error=f"최대 실행 횟수({UPLOAD_JOB_MAX_ATTEMPTS}회)를 넘어 중단했습니다.",
+                finished_at=_now(),
+            )
+            return
+
+        tracker = JobStageTracker(self.store, job_id, job["stages"])
+
+        logger.info("업로드 job 시작: %s (시도 %s회차)", job_id, job["attempts"])
+
+        lease = asyncio.create_task(self._keep_lease(job_id))
+        try:
+            result = await self.file_service.run_pipeline(
+                upload, job["difficulty"], job["duration"], tracker
+            )
+        except Exception as e:
+            error = str(getattr(e, "detail", e))
+            logger.error("업로드 job 실패: %s - %s", job_id, error)
+            await self.store.run(
+                self.store.update,
+                job_id,
+                status="failed",
+                current_stage=None,
+                error=error,
+                finished_at=_now(),
+            )
+            return
+        finally:
+            lease.cancel()
+
+        await self.store.run(
+            self.store.update,
+            job_id,
+            status="done",
+            current_stage=None,
+            result=result,
+            finished_at=_now(),
+        )
+        logger.info("업로드 job 완료: %s", job_id)
+
+        # 성공한 경우에만 이전 업로드 정리 (끝나지 않은 이전 job의 파일은 보존)
+        active = await self.store.run(
+            self.store.unfinished_uploads, upload["user_id"], job_id
+        )
+        keep = {
+            name
+            for other in active
+            for name in (
+                Path(other["temp_dir"]).name,
+                other["original_save_name"],
+            )
+        }
+        await self.file_service.run_blocking(
+            self.file_service.cleanup_previous_uploads, upload, keep
+        )
@@ -0,0 +1,79 @@
+"""
+Data Version - 사용자별 건강 데이터 버전 (SQLite, 워커 프로세스 간 공유)
+
+VectorDB에 사용자 데이터가 저장될 때마다 버전을 올린다.
+캐시 key에 버전을 포함하면 새 데이터 업로드 후에는 이전 캐시가 자동으로 무시된다.
+
+- 버전은 DATA_VERSION_DB(기본: ./chroma_data/data_versions.sqlite3)에 저장
+  → 같은 ChromaDB를 쓰는 uvicorn 워커 여러 개가 같은 버전을 봄
+    (다른 워커에서 업로드해도 이 워커의 캐시가 무효화됨)
+- 증가는 SQLite 트랜잭션 1번 (워커 간 동시 증가도 누락 없음)
+
+사용 예:
+    key = (user_id, get_data_version(user_id), ...)
+    bump_data_version(user_id)  # 저장 후
+"""
+
+import os
+import sqlite3
+import threading
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _connect() -> sqlite3.Connection:
+    """첫 사용 시 연결 (호출 측은 _lock 보유)"""
+    global _conn
+    if _conn is None:
+        # vector_store가 이 모듈을 import하므로 config(OPENAI_API_KEY 필수)는 호출 시점에 import
+        from app.config import DATA_VERSION_DB
+
+        os.makedirs(os.path.dirname(os.path.abspath(DATA_VERSION_DB)), exist_ok=True)
+        conn = sqlite3.connect(DATA_VERSION_DB, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS data_versions (
+                    user_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                )
+                """
+            )
+        _conn = conn
+    return _conn
+
+
+def get_data_version(user_id: str) -> int:
+    """현재 버전 (저장 이력이 없으면 0)"""
+    with _lock:
+        row = _connect().execute(
+            "SELECT version FROM data_versions WHERE user_id = ?", (user_id,)
+        ).fetchone()
+    return row[0] if row else 0
+
+
+def bump_data_version(*user_ids: str) -> dict:
+    """
+    사용자 데이터 변경 → 버전 +1
+
+    Returns:
+        {user_id: 증가 후 버전}
+    """
+    versions = {}
+    with _lock:
+        conn = _connect()
+        with conn:
+            for user_id in set(user_ids):
+                conn.execute(
+                    """
+                    INSERT INTO data_versions (user_id, version) VALUES (?, 1)
+                    ON CONFLICT(user_id) DO UPDATE SET version = version + 1
+                    """,
+                    (user_id,),
+                )
+                versions[user_id] = conn.execute(
+                    "SELECT version FROM data_versions WHERE user_id = ?", (user_id,)
+                ).fetchone()[0]
+    return versions
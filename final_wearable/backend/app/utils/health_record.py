@@ -0,0 +1,209 @@
+"""
+DailyHealthRecord - 하루치 정규화 건강 데이터 (고정 필드 + 바이너리 직렬화)
+
+normalize_raw() 결과를 dict 대신 __slots__ 기반 dataclass로 보관한다.
+
+- 필드는 normalize_raw()의 23개 키와 같은 이름/순서
+- Mapping 인터페이스 지원 → 기존 raw.get("steps", 0), raw["sleep_hr"] 코드 그대로 동작
+- to_bytes()/from_bytes(): 고정 길이(189 bytes) struct 직렬화 (JSON 대비 빠르고 작음)
+- 정수로 들어온 값(걸음수 등)은 int로 복원 (f"{steps:,}" 출력 유지)
+"""
+
+import struct
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+# ============================================================
+# 1) 필드 정의 (순서 = 바이너리 레이아웃 순서)
+# ============================================================
+FIELD_NAMES = (
+    "sleep_min",
+    "sleep_hr",
+    "weight",
+    "height_m",
+    "bmi",
+    "body_fat",
+    "lean_body",
+    "distance_km",
+    "steps",
+    "steps_cadence",
+    "exercise_min",
+    "flights",
+    "active_calories",
+    "total_calories",
+    "calories_intake",
+    "oxygen_saturation",
+    "heart_rate",
+    "resting_heart_rate",
+    "walking_heart_rate",
+    "hrv",
+    "systolic",
+    "diastolic",
+    "glucose",
+)
+
+_FIELD_SET = frozenset(FIELD_NAMES)
+
+# 바이너리 포맷: 버전(1) + 정수 필드 비트마스크(4) + 값(8 × 23)
+FORMAT_VERSION = 1
+_STRUCT = struct.Struct(f"<BI{len(FIELD_NAMES)}d")
+
+
+# ============================================================
+# 2) 레코드
+# ============================================================
+@dataclass(slots=True, eq=False)
+class DailyHealthRecord(Mapping):
+    """하루치 정규화 건강 데이터"""
+
+    sleep_min: float = 0
+    sleep_hr: float = 0
+    weight: float = 0
+    height_m: float = 0
+    bmi: float = 0
+    body_fat: float = 0
+    lean_body: float = 0
+    distance_km: float = 0
+    steps: float = 0
+    steps_cadence: float = 0
+    exercise_min: float = 0
+    flights: float = 0
+    active_calories: float = 0
+    total_calories: float = 0
+    calories_intake: float = 0
+    oxygen_saturation: float = 0
+    heart_rate: float = 0
+    resting_heart_rate: float = 0
+    walking_heart_rate: float = 0
+    hrv: float = 0
+    systolic: float = 0
+    diastolic: float = 0
+    glucose: float = 0
+
+    # ------ Mapping 인터페이스 (기존 dict 코드 호환) ------
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(FIELD_NAMES)
+
+    def __len__(self):
+        return len(FIELD_NAMES)
+
+    def get(self, key, default=None):
+        # Mapping.get()의 예외 처리 경로를 거치지 않는 빠른 버전
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        return default
+
+    # ------ 변환 ------
+    @classmethod
+    def from_mapping(cls, raw: Mapping) -> "DailyHealthRecord":
+        """dict(또는 레코드) → DailyHealthRecord (없는 키/None은 0)"""
+        if isinstance(raw, cls):
+            return raw
+        values = []
+        for name in FIELD_NAMES:
+            value = raw.get(name, 0)
+            values.append(value if value is not None else 0)
+        return cls(*values)
+
+    def to_dict(self) -> dict:
+        """JSON 응답/저장용 dict"""
+        return {name: getattr(self, name) for name in FIELD_NAMES}
+
+    def to_bytes(self) -> bytes:
+        """
+        고정 길이 바이너리 직렬화
+
+        Raises:
+            TypeError/ValueError: 숫자로 변환할 수 없는 값이 있는 경우
+        """
+        values = [getattr(self, name) for name in FIELD_NAMES]
+        int_mask = 0
+        for i, value in enumerate(values):
+            if isinstance(value, int):
+                int_mask |= 1 << i
+        return _STRUCT.pack(FORMAT_VERSION, int_mask, *map(float, values))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DailyHealthRecord":
+        """to_bytes() 결과 → DailyHealthRecord"""
+        version, int_mask, *values = _STRUCT.unpack(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 DailyHealthRecord 포맷 버전: {version}")
+        return cls(
+            *(
+                int(value) if int_mask & (1 << i) else value
+                for i, value in enumerate(values)
+            )
+        )
+
+
+# 정의 순서가 FIELD_NAMES와 어긋나면 바이너리 레이아웃이 깨지므로 import 시점에 확인
+assert tuple(f.name for f in fields(DailyHealthRecord)) == FIELD_NAMES
+
+
+def json_default(obj):
+    """json.dumps(default=...)용: DailyHealthRecord는 dict로, 나머지는 문자열로"""
+    if isinstance(obj, DailyHealthRecord):
+        return obj.to_dict()
+    return str(obj)
+
+
+# ============================================================
+# 3) 지표 배열 (날짜 테이블 / 누적 통계 공통 열 순서)
+# ============================================================
+METRIC_NAMES = FIELD_NAMES + ("health_score",)
+
+# 응답용 이름 / 단위 (없는 지표는 키 이름 그대로)
+METRIC_LABELS = {
+    "sleep_hr": ("수면 시간", "시간"),
+    "sleep_min": ("수면 시간", "분"),
+    "steps": ("걸음수", "보"),
+    "distance_km": ("이동거리", "km"),
+    "exercise_min": ("운동 시간", "분"),
+    "flights": ("오른 계단", "층"),
+    "active_calories": ("활동 칼로리", "kcal"),
+    "total_calories": ("총 소모 칼로리", "kcal"),
+    "calories_intake": ("섭취 칼로리", "kcal"),
+    "heart_rate": ("평균 심박수", "bpm"),
+    "resting_heart_rate": ("안정 시 심박수", "bpm"),
+    "walking_heart_rate": ("걷기 심박수", "bpm"),
+    "hrv": ("HRV", "ms"),
+    "oxygen_saturation": ("산소포화도", "%"),
+    "systolic": ("수축기 혈압", "mmHg"),
+    "diastolic": ("이완기 혈압", "mmHg"),
+    "glucose": ("혈당", "mg/dL"),
+    "weight": ("체중", "kg"),
+    "bmi": ("BMI", ""),
+    "body_fat": ("체지방", "%"),
+    "lean_body": ("제지방", "kg"),
+    "health_score": ("건강 점수", "점"),
+}
+
+
+def metric_label(metric: str) -> tuple:
+    """지표 → (이름, 단위)"""
+    return METRIC_LABELS.get(metric, (metric, ""))
+
+
+def metric_row(raw, health_score=0) -> np.ndarray:
+    """
+    raw + 건강 점수 → (len(METRIC_NAMES),) float64 배열
+
+    0 / 빈 값 / 숫자가 아닌 값은 NaN (이 프로젝트에서 0은 "측정 안 됨")
+    """
+    raw = raw or {}
+    row = np.zeros(len(METRIC_NAMES), dtype=np.float64)
+    for col, name in enumerate(FIELD_NAMES):
+        value = raw.get(name)
+        if isinstance(value, (int, float)):
+            row[col] = value
+    row[-1] = health_score or 0
+    row[row == 0] = np.nan
+    return row
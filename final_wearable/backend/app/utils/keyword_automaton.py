@@ -0,0 +1,99 @@
+"""
+Keyword Automaton - 여러 키워드 목록을 한 번에 검색 (Aho–Corasick)
+
+카테고리별 키워드 목록을 하나의 automaton으로 미리 컴파일하고,
+메시지를 한 번만 순회하면서 모든 카테고리의 매칭 결과를 얻는다.
+(키워드마다 `kw in msg`를 반복하는 대신 메시지 길이에 비례하는 비용)
+
+- 전이표는 실패 링크까지 미리 펼쳐 둠 → 검색은 문자당 dict 조회 1번
+- 겹치는 매칭도 모두 찾음 ("오늘 운동" 안의 "오늘"과 "운동" 등)
+- 카테고리별로 "목록에서 가장 앞선 키워드"를 반환
+  → 목록 순서대로 `kw in msg`를 검사해서 처음 걸린 키워드와 동일
+
+사용 예:
+    automaton = KeywordAutomaton({"health": ["수면", "잠"], "time": ["오늘", "어제"]})
+    automaton.scan("어제 잠 몇 시간 잤어?")
+    # → {"health": 1, "time": 1}  (카테고리 → 키워드 목록 index)
+"""
+
+from collections import deque
+
+
+class KeywordAutomaton:
+    """카테고리별 키워드 목록 → 단일 Aho–Corasick automaton (생성 후 읽기 전용)"""
+
+    def __init__(self, keywords_by_category: dict):
+        """
+        Args:
+            keywords_by_category: {category: [keyword, ...]} (목록 순서 = 우선순위)
+        """
+        self.keywords = {
+            category: list(keywords)
+            for category, keywords in keywords_by_category.items()
+        }
+
+        # 상태별 trie 전이 / 출력 ((category, index), ...)
+        self._goto = [{}]
+        outputs = [[]]
+
+        # 1) trie 구성
+        for category, keywords in self.keywords.items():
+            for index, keyword in enumerate(keywords):
+                state = 0
+                for ch in keyword:
+                    next_state = self._goto[state].get(ch)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto.append({})
+                        outputs.append([])
+                        self._goto[state][ch] = next_state
+                    state = next_state
+                outputs[state].append((category, index))
+
+        # 2) 실패 링크 (BFS) + 실패 링크 쪽 출력 병합
+        #    → 전이표를 실패 링크까지 펼쳐 둠 (검색 시 문자당 dict 조회 1번)
+        fail = [0] * len(self._goto)
+        self._next = [dict(transitions) for transitions in self._goto]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = self._next[fail[state]]
+            for ch, next_state in fallback.items():
+                self._next[state].setdefault(ch, next_state)
+            for ch, next_state in self._goto[state].items():
+                fail[next_state] = fallback.get(ch, 0)
+                outputs[next_state] += outputs[fail[next_state]]
+                queue.append(next_state)
+        del self._goto
+
+        # 상태별 출력은 카테고리마다 가장 작은 index만
+        self._outputs = []
+        for output in outputs:
+            best = {}
+            for category, index in output:
+                if index < best.get(category, index + 1):
+                    best[category] = index
+            self._outputs.append(tuple(best.items()))
+
+    def scan(self, text: str) -> dict:
+        """
+        text에 포함된 키워드를 카테고리별로 검색
+
+        Returns:
+            {category: 매칭된 키워드 중 가장 작은 index} (매칭 없는 카테고리는 없음)
+        """
+        transitions, outputs = self._next, self._outputs
+        best = {}
+        state = 0
+
+        for ch in text:
+            state = transitions[state].get(ch, 0)
+            if outputs[state]:
+                for category, index in outputs[state]:
+                    if index < best.get(category, index + 1):
+                        best[category] = index
+
+        return best
+
+    def keyword(self, category: str, index: int) -> str:
+        return self.keywords[category][index]
@@ -0,0 +1,143 @@
+"""
+Logging - 구조화 로그 + 비동기(큐) 핸들러
+
+- 모듈에서는 logging.getLogger(__name__)만 사용 ("app.*" 로거)
+- 로그 호출 스레드는 레코드를 큐에 넣기만 하고,
+  포맷 / stdout / 파일 쓰기는 별도 listener 스레드에서 처리
+- LOG_LEVEL 미만 레벨은 호출 즉시 버려짐
+  → logger.debug("... %s", value)처럼 인자로 넘기면 문자열 생성 비용도 없음
+- 모든 레코드에 trace_id (요청 단위, app.utils.tracing) 포함
+- LOG_FILE은 JSON lines, 콘솔은 LOG_FORMAT(text/json)에 따름
+
+사용 예:
+    logger = logging.getLogger(__name__)
+    logger.info("VectorDB 저장 완료: %d일", saved, extra={"user_id": user_id})
+"""
+
+import json
+import copy
+import queue
+import atexit
+import logging
+import logging.handlers
+
+from app.utils.tracing import current_trace_id
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s [%(trace_id)s] %(name)s - %(message)s"
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 골라내기 위함)
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "trace_id",
+}
+
+_listener = None
+
+
+# ============================================================
+# 1) 레코드 가공
+# ============================================================
+class TraceIdFilter(logging.Filter):
+    """현재 요청의 trace_id를 레코드에 추가 (로그 호출 스레드에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id() or "-"
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    메시지 인자 병합 + 예외 텍스트만 미리 계산해서 큐에 넣음
+    (기본 QueueHandler는 포맷까지 호출 스레드에서 수행)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (ts, level, logger, trace_id, msg, extra 필드, exc)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        ts = self.formatTime(record, "%Y-%m-%dT%H:%M:%S")
+        payload = {
+            "ts": f"{ts}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "trace_id": getattr(record, "trace_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                payload[key] = value
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+# ============================================================
+# 2) 설정
+# ============================================================
+def setup_logging(
+    level: str = None, log_file: str = None, console_format: str = None
+):
+    """
+    "app" 로거에 큐 핸들러 연결 + listener 스레드 시작 (여러 번 호출해도 1회만)
+
+    Args:
+        level: 기본 LOG_LEVEL
+        log_file: 기본 LOG_FILE (빈 문자열이면 파일 기록 안 함)
+        console_format: "text" 또는 "json" (기본 LOG_FORMAT)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    from app.config import LOG_LEVEL, LOG_FILE, LOG_FORMAT
+
+    level = (level or LOG_LEVEL).upper()
+    log_file = LOG_FILE if log_file is None else log_file
+    console_format = console_format or LOG_FORMAT
+
+    console = logging.StreamHandler()
+    console.setFormatter(
+        JsonFormatter() if console_format == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    handlers = [console]
+
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(TraceIdFilter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level)
+    app_logger.handlers = [queue_handler]
+    app_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 listener 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,103 @@
+"""
+LRU Cache - 크기 제한 + TTL 인메모리 캐시 (스레드 안전)
+
+오래 실행되는 서버에서 캐시가 계속 커지지 않도록
+- 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- TTL이 지난 항목은 조회 시 제거
+- 조회 hit/miss, 제거 수, 현재 항목 수 → stats() / /metrics (app_cache_*{cache=name})
+
+사용 예:
+    cache = LRUCache("intent", max_size=2048, ttl=300)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+from app.utils.tracing import CACHES
+
+
+class LRUCache:
+    def __init__(self, name: str, max_size: int, ttl: float = None):
+        """
+        Args:
+            name: metric 라벨 (cache=name)
+            max_size: 최대 항목 수
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key → (value, 저장 시각)
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        CACHES.register(self)
+
+    def get(self, key, default=None):
+        """값 조회 (hit이면 최근 사용으로 갱신, 만료됐으면 제거 후 default)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None:
+                if time.monotonic() - entry[1] > self.ttl:
+                    del self._data[key]
+                    self._stats["expirations"] += 1
+                    entry = None
+
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """값 저장 (최대 크기 초과 시 가장 오래 사용하지 않은 항목 제거)"""
+        with self._lock:
+            self._set_locked(key, value)
+
+    def setdefault(self, key, default):
+        """유효한 값이 있으면 반환, 없으면 default 저장 후 반환 (hit/miss 통계 제외)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (
+                self.ttl is None or time.monotonic() - entry[1] <= self.ttl
+            ):
+                self._data.move_to_end(key)
+                return entry[0]
+            self._set_locked(key, default)
+            return default
+
+    def _set_locked(self, key, value):
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """항목 수 / 최대 크기 / hit·miss·제거 수 / hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._data)
+        stats["max_size"] = self.max_size
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -7,8 +7,15 @@ Health Data Preprocessing 모듈 (None 값 안전 처리 버전)
 - Infinity/NaN → null → None 처리
 """
 
+import logging
 from datetime import datetime, timezone, timedelta
 
+import numpy as np
+
+from app.utils.health_record import DailyHealthRecord
+
+logger = logging.getLogger(__name__)
+
 
 def epoch_day_to_date_string(epoch_day: int) -> str:
     """
@@ -29,13 +36,16 @@ def epoch_day_to_date_string(epoch_day: int) -> str:
     return target_date.strftime("%Y-%m-%d")
 
 
-def normalize_raw(raw_json: dict) -> dict:
+def normalize_raw(raw_json: dict) -> DailyHealthRecord:
     """
     ✅ None 값 안전 처리 추가
 
     JSON에서 null (Python의 None)이 올 수 있는 경우:
     - JavaScript에서 NaN/Infinity → JSON null
     - 빈 값 → null
+
+    Returns:
+        DailyHealthRecord (dict처럼 raw["steps"], raw.get(...) 사용 가능)
     """
     platform = raw_json.get("platform", "samsung")
 
@@ -115,34 +125,34 @@ def normalize_raw(raw_json: dict) -> dict:
     # ---------------------------------------------------------
     # 7) 나머지 필드들 (✅ 모두 safe_get 사용)
     # ---------------------------------------------------------
-    return {
-        "sleep_min": sleep_min,
-        "sleep_hr": sleep_hr,
-        "weight": weight,
-        "height_m": height_m,
-        "bmi": bmi,
-        "body_fat": safe_get("body_fat", 0),
-        "lean_body": safe_get("lean_body", 0),
-        "distance_km": distance_km,
-        "steps": safe_get("steps", 0),
-        "steps_cadence": safe_get("steps_cadence", 0),
-        "exercise_min": safe_get("exercise_min", 0),
-        "flights": safe_get("flights", 0),
-        "active_calories": active_cal,
-        "total_calories": total_cal,
-        "calories_intake": calories_intake,
-        "oxygen_saturation": safe_get("oxygen_saturation", 0),
-        "heart_rate": safe_get("heart_rate", 0),
-        "resting_heart_rate": safe_get("resting_heart_rate", 0),
-        "walking_heart_rate": safe_get("walking_heart_rate", 0),
-        "hrv": safe_get("hrv", 0),
-        "systolic": safe_get("systolic", 0),
-        "diastolic": safe_get("diastolic", 0),
-        "glucose": safe_get("glucose", 0),
-    }
-
-
-def generate_summary_text(raw: dict) -> str:
+    return DailyHealthRecord(
+        sleep_min=sleep_min,
+        sleep_hr=sleep_hr,
+        weight=weight,
+        height_m=height_m,
+        bmi=bmi,
+        body_fat=safe_get("body_fat", 0),
+        lean_body=safe_get("lean_body", 0),
+        distance_km=distance_km,
+        steps=safe_get("steps", 0),
+        steps_cadence=safe_get("steps_cadence", 0),
+        exercise_min=safe_get("exercise_min", 0),
+        flights=safe_get("flights", 0),
+        active_calories=active_cal,
+        total_calories=total_cal,
+        calories_intake=calories_intake,
+        oxygen_saturation=safe_get("oxygen_saturation", 0),
+        heart_rate=safe_get("heart_rate", 0),
+        resting_heart_rate=safe_get("resting_heart_rate", 0),
+        walking_heart_rate=safe_get("walking_heart_rate", 0),
+        hrv=safe_get("hrv", 0),
+        systolic=safe_get("systolic", 0),
+        diastolic=safe_get("diastolic", 0),
+        glucose=safe_get("glucose", 0),
+    )
+
+
+def generate_summary_text(raw: DailyHealthRecord) -> str:
     """요약 텍스트 생성 (0이 아닌 값만)"""
     parts = []
 
@@ -181,6 +191,44 @@ def generate_summary_text(raw: dict) -> str:
     return " / ".join(parts) if parts else "데이터 없음"
 
 
+def date_int_to_created_at(date_int: int = None, verbose: bool = True) -> str:
+    """
+    날짜 정수 → created_at (ISO 8601)
+
+    Args:
+        date_int: YYYYMMDD 또는 Epoch Day (없으면 현재 시간)
+        verbose: 변환 DEBUG 로그 출력 여부 (WARN/ERROR는 항상 출력)
+    """
+    if not date_int:
+        # API 호출 - 현재 시간 사용
+        return datetime.now(timezone.utc).isoformat()
+
+    date_str = str(date_int)
+
+    if len(date_str) == 8:
+        # ✅ YYYYMMDD (8자리)
+        year = date_str[:4]
+        month = date_str[4:6]
+        day = date_str[6:8]
+        if verbose:
+            logger.debug("날짜 변환: %s → %s-%s-%s", date_int, year, month, day)
+        return f"{year}-{month}-{day}T00:00:00+00:00"
+
+    if len(date_str) <= 5:
+        # ✅ Epoch Day (Samsung Health Connect ZIP)
+        try:
+            date_formatted = epoch_day_to_date_string(date_int)
+            if verbose:
+                logger.debug("Epoch Day 변환: %s → %s", date_int, date_formatted)
+            return f"{date_formatted}T00:00:00+00:00"
+        except Exception as e:
+            logger.error("Epoch Day 변환 실패: %s, 오류: %s", date_int, e)
+            return datetime.now(timezone.utc).isoformat()
+
+    logger.warning("잘못된 date_int 형식: %s, 현재 시간 사용", date_int)
+    return datetime.now(timezone.utc).isoformat()
+
+
 def preprocess_health_json(
     raw_json: dict, date_int: int = None, platform: str = "unknown"
 ) -> dict:
@@ -193,47 +241,19 @@ def preprocess_health_json(
         platform: 플랫폼 ('samsung', 'apple', 'unknown')
 
     Returns:
-        전처리된 데이터 딕셔너리
+        전처리된 데이터 딕셔너리 ("raw"는 DailyHealthRecord)
     """
     # ✅ 플랫폼 정보 추가
     raw_json["platform"] = platform
 
     # 1. 날짜 처리
-    if date_int:
-        date_str = str(date_int)
-
-        if len(date_str) == 8:
-            # ✅ YYYYMMDD (8자리)
-            year = date_str[:4]
-            month = date_str[4:6]
-            day = date_str[6:8]
-            created_at = f"{year}-{month}-{day}T00:00:00+00:00"
-            print(f"[INFO] 날짜 변환: {date_int} → {year}-{month}-{day}")
-
-        elif len(date_str) <= 5:
-            # ✅ Epoch Day (Samsung Health Connect ZIP)
-            try:
-                date_formatted = epoch_day_to_date_string(date_int)
-                created_at = f"{date_formatted}T00:00:00+00:00"
-                print(f"[INFO] Epoch Day 변환: {date_int} → {date_formatted}")
-            except Exception as e:
-                print(f"[ERROR] Epoch Day 변환 실패: {date_int}, 오류: {e}")
-                created_at = datetime.now(timezone.utc).isoformat()
-        else:
-            print(f"[WARN] 잘못된 date_int 형식: {date_int}, 현재 시간 사용")
-            created_at = datetime.now(timezone.utc).isoformat()
-    else:
-        # API 호출 - 현재 시간 사용
-        created_at = datetime.now(timezone.utc).isoformat()
+    created_at = date_int_to_created_at(date_int)
 
     # 2. 데이터 정규화 (✅ None 안전 처리 포함)
     try:
         raw_norm = normalize_raw(raw_json)
     except Exception as e:
-        print(f"[ERROR] normalize_raw 실패: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("normalize_raw 실패: %s", e)
         raise
 
     # 3. 요약 텍스트 생성
@@ -246,3 +266,181 @@ def preprocess_health_json(
         "raw": raw_norm,
         "platform": platform,
     }
+
+
+
+# ============================================================
+# 배치 전처리 (ZIP 업로드: 전체 날짜를 한 번에)
+# ============================================================
+def _column(raws: list, key: str) -> list:
+    """날짜별 raw에서 한 필드만 추출 (None → 0, normalize_raw의 safe_get과 동일)"""
+    values = []
+    for raw in raws:
+        value = raw.get(key)
+        values.append(value if value is not None else 0)
+    return values
+
+
+def normalize_raw_batch(raws: list, platform: str = "unknown") -> list:
+    """
+    normalize_raw()의 배치 버전
+
+    단위 변환(수면 분↔시간, 키 cm→m, BMI, 거리 m→km)은 NumPy 배열로 한 번에 계산하고
+    변환되지 않은 값은 원본 객체를 그대로 사용한다 (int/float 타입 유지).
+    결과는 normalize_raw()와 동일하다.
+    """
+    if not raws:
+        return []
+
+    sleep_min = _column(raws, "sleep_min")
+    sleep_hr = _column(raws, "sleep_hr")
+    weight = _column(raws, "weight")
+    height_m = _column(raws, "height_m")
+    height = _column(raws, "height")
+    bmi_in = _column(raws, "bmi")
+    distance_km = _column(raws, "distance_km")
+    distance = _column(raws, "distance")
+
+    try:
+        a_sleep_min = np.asarray(sleep_min, dtype=np.float64)
+        a_sleep_hr = np.asarray(sleep_hr, dtype=np.float64)
+        a_weight = np.asarray(weight, dtype=np.float64)
+        a_height_m = np.asarray(height_m, dtype=np.float64)
+        a_height = np.asarray(height, dtype=np.float64)
+        a_bmi = np.asarray(bmi_in, dtype=np.float64)
+        a_distance_km = np.asarray(distance_km, dtype=np.float64)
+        a_distance = np.asarray(distance, dtype=np.float64)
+    except (TypeError, ValueError):
+        # 숫자가 아닌 값이 섞여 있으면 날짜별 처리로 대체
+        return [normalize_raw({**raw, "platform": platform}) for raw in raws]
+
+    # ---------------------------------------------------------
+    # 1) 수면 시간 (분 ↔ 시간)
+    # ---------------------------------------------------------
+    fill_min = (a_sleep_min == 0) & (a_sleep_hr > 0)
+    fill_hr = ~fill_min & (a_sleep_hr == 0) & (a_sleep_min > 0)
+
+    sleep_min_out = [
+        (int(calc) if isinstance(hr, int) else calc) if fill else orig
+        for fill, calc, hr, orig in zip(
+            fill_min.tolist(), (a_sleep_hr * 60).tolist(), sleep_hr, sleep_min
+        )
+    ]
+    sleep_hr_out = [
+        calc if fill else orig
+        for fill, calc, orig in zip(fill_hr.tolist(), (a_sleep_min / 60).tolist(), sleep_hr)
+    ]
+
+    # ---------------------------------------------------------
+    # 2) 키 (cm → m) : height_m이 0일 때만 height로 계산
+    # ---------------------------------------------------------
+    from_cm = (a_height_m == 0) & (a_height >= 30) & (a_height <= 250)
+    from_height = (a_height_m == 0) & ~from_cm
+
+    height_m_out = [
+        calc if cm else ((h if h != 0 else 0) if use_h else orig)
+        for cm, use_h, calc, h, orig in zip(
+            from_cm.tolist(),
+            from_height.tolist(),
+            (a_height / 100).tolist(),
+            height,
+            height_m,
+        )
+    ]
+    a_height_m = np.where(from_cm, a_height / 100, np.where(from_height, a_height, a_height_m))
+
+    # ---------------------------------------------------------
+    # 3) BMI : 입력값 우선, 없으면 체중/키로 계산
+    # ---------------------------------------------------------
+    # (나눗셈은 계산 대상 행만 스칼라로 수행 → normalize_raw()와 비트 단위로 동일)
+    has_bmi = a_bmi > 0
+    calc_bmi = ~has_bmi & (a_weight > 0) & (a_height_m > 0)
+
+    bmi_out = [
+        orig if has else (w / (h**2) if use_calc else 0)
+        for has, use_calc, w, h, orig in zip(
+            has_bmi.tolist(), calc_bmi.tolist(), weight, height_m_out, bmi_in
+        )
+    ]
+
+    # ---------------------------------------------------------
+    # 4) 거리 (m → km)
+    # ---------------------------------------------------------
+    fill_km = (a_distance_km == 0) & (a_distance > 0)
+    distance_km_out = [
+        calc if fill else orig
+        for fill, calc, orig in zip(
+            fill_km.tolist(), (a_distance / 1000).tolist(), distance_km
+        )
+    ]
+
+    # ---------------------------------------------------------
+    # 5) 칼로리 (플랫폼별 키)
+    # ---------------------------------------------------------
+    total_cal = _column(raws, "total_calories")
+    if platform == "samsung":
+        active_cal = _column(raws, "active_calories")
+        calories_intake = [0] * len(raws)
+    else:
+        active_cal = _column(raws, "activeEnergy")
+        calories_intake = _column(raws, "calories_intake")
+
+    # ---------------------------------------------------------
+    # 6) 레코드 조립
+    # ---------------------------------------------------------
+    columns = zip(
+        sleep_min_out,
+        sleep_hr_out,
+        weight,
+        height_m_out,
+        bmi_out,
+        _column(raws, "body_fat"),
+        _column(raws, "lean_body"),
+        distance_km_out,
+        _column(raws, "steps"),
+        _column(raws, "steps_cadence"),
+        _column(raws, "exercise_min"),
+        _column(raws, "flights"),
+        active_cal,
+        total_cal,
+        calories_intake,
+        _column(raws, "oxygen_saturation"),
+        _column(raws, "heart_rate"),
+        _column(raws, "resting_heart_rate"),
+        _column(raws, "walking_heart_rate"),
+        _column(raws, "hrv"),
+        _column(raws, "systolic"),
+        _column(raws, "diastolic"),
+        _column(raws, "glucose"),
+    )
+    return [DailyHealthRecord(*values) for values in columns]
+
+
+def preprocess_health_batch(raw_by_day: dict, platform: str = "unknown") -> dict:
+    """
+    여러 날짜 건강 데이터 일괄 전처리 (preprocess_health_json 배치 버전)
+
+    - executor 왕복 1회로 전체 날짜 처리
+    - 날짜별 INFO 로그 없이 요약 로그 1줄만 출력
+
+    Args:
+        raw_by_day: {date_int: raw_json} (YYYYMMDD 또는 Epoch Day)
+        platform: 플랫폼 ('samsung', 'apple', 'unknown')
+
+    Returns:
+        {date_int: summary} (raw_by_day와 같은 순서)
+    """
+    date_ints = list(raw_by_day.keys())
+    records = normalize_raw_batch([raw_by_day[d] for d in date_ints], platform)
+
+    summaries = {}
+    for date_int, record in zip(date_ints, records):
+        summaries[date_int] = {
+            "created_at": date_int_to_created_at(date_int, verbose=False),
+            "summary_text": generate_summary_text(record),
+            "raw": record,
+            "platform": platform,
+        }
+
+    logger.debug("배치 전처리 완료: %d일 (플랫폼: %s)", len(summaries), platform)
+    return summaries
@@ -0,0 +1,151 @@
+"""
+Single-flight - 동일한 요청이 동시에 들어오면 계산은 1번만
+
+웹 새로고침 / 앱 타임아웃 재시도처럼 같은 요청이 겹쳐 들어오면
+RAG + LLM 파이프라인이 요청 수만큼 돌게 된다.
+같은 키 (endpoint, user_id, 정규화된 파라미터)의 호출이 진행 중이면
+새 호출은 계산을 시작하지 않고 진행 중인 결과를 기다려 함께 받는다.
+
+- 스레드 기반 (FastAPI 동기 엔드포인트 / run_in_executor 모두 대응)
+- 진행 중인 호출만 공유 (완료 후에는 캐시하지 않음)
+- 예외도 동일하게 공유
+- 대기하던 호출은 결과의 복사본을 받음 (응답 dict 공유 수정 방지)
+
+사용 예:
+    @single_flight("llm_analysis", params=("summary", "difficulty_level"))
+    def run_llm_analysis(summary, user_id, difficulty_level, ...):
+        ...
+"""
+
+import copy
+import inspect
+import logging
+import threading
+from concurrent.futures import Future
+from functools import wraps
+
+from app.utils.health_record import DailyHealthRecord
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# 1) 파라미터 정규화 → 해시 가능한 키
+# ============================================================
+def normalize_param(value):
+    """
+    키 비교용으로 값을 해시 가능한 형태로 변환
+
+    - 문자열: 앞뒤 공백 제거 + 연속 공백 1칸
+    - dict: key 정렬 후 tuple
+    - list/tuple/set: tuple
+    - DailyHealthRecord: 바이너리 직렬화 값
+    """
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, DailyHealthRecord):
+        return value.to_bytes()
+    if isinstance(value, dict):
+        return tuple(
+            sorted((str(k), normalize_param(v)) for k, v in value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_param(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize_param(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+# ============================================================
+# 2) Single-flight 그룹
+# ============================================================
+class SingleFlight:
+    """진행 중인 호출을 키별로 공유하는 그룹 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key → Future
+        self.stats = {"calls": 0, "shared": 0}
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.stats["shared"] += 1
+
+        if not leader:
+            logger.info("동일 요청 진행 중 → 결과 공유 대기: %s (%s)", key[0], key[1])
+            return copy.deepcopy(future.result())
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+# 앱 전체에서 공유하는 기본 그룹
+default_group = SingleFlight()
+
+
+# ============================================================
+# 3) 데코레이터
+# ============================================================
+def single_flight(
+    endpoint: str,
+    params: tuple = (),
+    user_param: str = "user_id",
+    group: SingleFlight = None,
+    digests: dict = None,
+):
+    """
+    함수 호출을 (endpoint, user_id, 정규화된 params) 키로 single-flight 처리
+
+    Args:
+        endpoint: 키 구분용 이름
+        params: 키에 포함할 인자 이름 (user_id 제외)
+        user_param: 사용자 ID 인자 이름
+        group: 사용할 SingleFlight (기본: default_group)
+        digests: 인자 이름 → 키 값 함수 (큰 인자는 전체 대신 요약값만 키에 포함)
+    """
+    digests = digests or {}
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+
+            key = (
+                endpoint,
+                arguments.get(user_param),
+                tuple(normalize_param(arguments.get(name)) for name in params),
+                tuple(digest(arguments.get(name)) for name, digest in digests.items()),
+            )
+            return (group or default_group).do(key, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
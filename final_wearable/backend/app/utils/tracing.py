@@ -0,0 +1,345 @@
+"""
+Tracing & Metrics - 요청 단위 추적 + 단계별 지연 시간 히스토그램
+
+외부 의존성 없이 동작하는 경량 계측 모듈:
+- span(): 구간 시간 측정 (중첩 가능, 요청 trace_id 공유)
+- traced(): 함수 전체를 span으로 감싸는 데코레이터
+- 히스토그램 / 카운터 / 인메모리 캐시 상태 → /metrics (Prometheus text format)
+- 느린 요청은 span 분해 결과를 WARNING 로그로 출력
+
+사용 예:
+    with span("chroma", op="query", fn="search_similar_summaries"):
+        results = collection.query(...)
+
+    @traced("interpreter", fn="build_analysis_text")
+    def build_analysis_text(...): ...
+"""
+
+import time
+import uuid
+import bisect
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 버킷 (초) - 인터프리터(µs) ~ LLM(수십 초)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+# ============================================================
+# 1) Metric 저장소
+# ============================================================
+_lock = threading.Lock()
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(
+            k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class CacheMetrics:
+    """
+    등록된 캐시(LRUCache)의 stats()를 /metrics 조회 시점에 읽어서 렌더링
+    (캐시 조회 경로에서는 metric lock을 잡지 않음)
+    """
+
+    FAMILIES = (
+        ("app_cache_requests_total", "counter", "In-process cache lookups by result",
+         (("result", "hit", "hits"), ("result", "miss", "misses"))),
+        ("app_cache_evictions_total", "counter", "In-process cache entries removed",
+         (("reason", "lru", "evictions"), ("reason", "ttl", "expirations"))),
+        ("app_cache_entries", "gauge", "In-process cache entry count",
+         ((None, None, "size"),)),
+    )
+
+    def __init__(self):
+        self._caches = []
+
+    def register(self, cache):
+        self._caches.append(cache)
+
+    def render(self) -> list:
+        stats = [(cache.name, cache.stats()) for cache in self._caches]
+        lines = []
+        for name, kind, help_text, series in self.FAMILIES:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for cache_name, values in stats:
+                for label, label_value, field in series:
+                    extra = ((label, label_value),) if label else ()
+                    labels = _format_labels((("cache", cache_name),), extra)
+                    lines.append(f"{name}{labels} {values[field]}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._values = {}  # key → [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(key, (("le", repr(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += state[len(self.buckets)]
+            labels = _format_labels(key, (("le", "+Inf"),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {state[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+SPAN_DURATION = Histogram(
+    "app_span_duration_seconds",
+    "Duration of traced spans (upload stages, embedding, chroma, llm, interpreter)",
+)
+SPAN_ERRORS = Counter("app_span_errors_total", "Spans that raised an exception")
+HTTP_DURATION = Histogram(
+    "app_http_request_duration_seconds", "HTTP request latency by route"
+)
+LLM_CALLS = Counter("app_llm_calls_total", "Chat completion calls that returned a response")
+LLM_TOKENS = Counter("app_llm_tokens_total", "Chat completion tokens")
+EMBEDDING_CALLS = Counter("app_embedding_calls_total", "Embedding API calls")
+EMBEDDING_INPUTS = Counter(
+    "app_embedding_inputs_total", "Texts sent to the embedding API"
+)
+EMBEDDING_TOKENS = Counter("app_embedding_tokens_total", "Embedding tokens")
+CANNED_RESPONSES = Counter(
+    "app_canned_responses_total",
+    "default_chat messages by canned-response category (none = sent to the LLM)",
+)
+CHAT_CACHE = Counter(
+    "app_chat_cache_total", "Chat response cache lookups by result (exact/similar/miss)"
+)
+FIXED_REPORTS = Counter(
+    "app_fixed_reports_total", "Fixed chat reports served by result (stored/computed)"
+)
+CACHES = CacheMetrics()
+
+METRICS = [
+    HTTP_DURATION,
+    SPAN_DURATION,
+    SPAN_ERRORS,
+    LLM_CALLS,
+    LLM_TOKENS,
+    EMBEDDING_CALLS,
+    EMBEDDING_INPUTS,
+    EMBEDDING_TOKENS,
+    CANNED_RESPONSES,
+    CHAT_CACHE,
+    FIXED_REPORTS,
+    CACHES,
+]
+
+
+def render_metrics() -> str:
+    """전체 metric → Prometheus text format"""
+    lines = []
+    with _lock:
+        for metric in METRICS:
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================
+# 2) Trace / Span
+# ============================================================
+# 현재 요청의 trace (trace_id + 완료된 span 목록)와 현재 부모 span 이름
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def current_trace_id() -> str | None:
+    trace = _current_trace.get()
+    return trace["trace_id"] if trace else None
+
+
+@contextmanager
+def span(name: str, **labels):
+    """
+    구간 시간 측정 → app_span_duration_seconds{span=name, ...labels}
+
+    labels는 카디널리티가 낮은 값만 사용 (user_id 등 금지)
+    """
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_span.reset(token)
+
+        SPAN_DURATION.observe(elapsed, span=name, **labels)
+        if error:
+            SPAN_ERRORS.inc(span=name, error=error)
+
+        trace = _current_trace.get()
+        if trace is not None:
+            trace["spans"].append((name, parent, elapsed, error))
+
+
+def traced(name: str, **labels):
+    """함수 호출 전체를 span으로 감싸는 데코레이터"""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ============================================================
+# 3) 요청 단위 trace (HTTP middleware에서 사용)
+# ============================================================
+@contextmanager
+def request_trace(method: str, path: str, trace_id: str = None):
+    """
+    요청 하나의 trace 시작
+
+    yield된 dict의 "status" / "route"(라우트 템플릿)를 채우면 히스토그램 라벨로 사용
+    (매칭되는 라우트가 없으면 "unmatched" → 경로별로 라벨이 늘어나지 않게)
+    요청이 TRACE_SLOW_REQUEST_SEC보다 오래 걸리면 span 분해 출력
+    """
+    trace = {
+        "trace_id": trace_id or uuid.uuid4().hex[:16],
+        "spans": [],
+        "status": 500,
+        "route": "unmatched",
+    }
+    # app.config는 OPENAI_API_KEY를 요구 → 규칙 기반 모듈(health_interpreter)이
+    # 이 모듈을 import해도 키 없이 동작하도록 요청 처리 시점에 읽음
+    from app.config import TRACE_SLOW_REQUEST_SEC
+
+    token = _current_trace.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_trace.reset(token)
+
+        HTTP_DURATION.observe(
+            elapsed, method=method, route=trace["route"], status=trace["status"]
+        )
+        if TRACE_SLOW_REQUEST_SEC > 0 and elapsed >= TRACE_SLOW_REQUEST_SEC:
+            _log_slow_trace(method, path, trace, elapsed)
+
+
+def _log_slow_trace(method: str, path: str, trace: dict, elapsed: float):
+    # span 이름별 합산 (병렬 실행 구간은 합이 전체보다 클 수 있음)
+    totals = {}
+    for name, _parent, duration, _error in trace["spans"]:
+        count, total = totals.get(name, (0, 0.0))
+        totals[name] = (count + 1, total + duration)
+
+    # 한 레코드로 출력 (다른 요청 로그와 섞이지 않게)
+    breakdown = "".join(
+        f"\n  - {name}: {total:.3f}s ({count}회)"
+        for name, (count, total) in sorted(
+            totals.items(), key=lambda item: item[1][1], reverse=True
+        )[:10]
+    )
+    logger.warning(
+        "느린 요청 %s %s %.2fs (status=%s)%s",
+        method, path, elapsed, trace["status"], breakdown,
+        extra={"duration_sec": round(elapsed, 3), "slow_spans": totals},
+    )
+
+
+def bind_context(func, *args):
+    """현재 trace context를 유지한 채 다른 스레드에서 실행할 callable 생성"""
+    context = contextvars.copy_context()
+    return lambda: context.run(func, *args)
+
+
+# ============================================================
+# 4) OpenAI 사용량 기록
+# ============================================================
+def record_llm_usage(operation: str, response, model: str = ""):
+    """chat.completions 응답의 token 사용량 기록"""
+    model = model or getattr(response, "model", "") or "unknown"
+    LLM_CALLS.inc(operation=operation, model=model)
+
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc(
+        getattr(usage, "prompt_tokens", 0) or 0,
+        operation=operation, model=model, type="prompt",
+    )
+    LLM_TOKENS.inc(
+        getattr(usage, "completion_tokens", 0) or 0,
+        operation=operation, model=model, type="completion",
+    )
+
+
+def record_embedding_usage(response, inputs: int):
+    """embeddings 응답의 호출 수 / 입력 수 / token 사용량 기록"""
+    model = getattr(response, "model", "") or "unknown"
+    EMBEDDING_CALLS.inc(model=model)
+    EMBEDDING_INPUTS.inc(inputs, model=model)
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        EMBEDDING_TOKENS.inc(getattr(usage, "total_tokens", 0) or 0, model=model)
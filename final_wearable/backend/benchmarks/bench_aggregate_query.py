@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+집계 질문 벤치마크 (summary 목록 순회 vs 날짜 테이블 NumPy 연산)
+
+기능:
+1. 랜덤 날짜 summary 생성 (측정 안 된 날 = 0 포함)
+2. 기준 구현(날짜별 summary 순회)과 aggregate_query 결과 일치 검증
+   - 연산 5종 (max / min / avg / sum / trend) × 전체 지표 × 여러 기간
+3. 질문당 처리 시간 비교 (테이블 생성 시간 별도 출력)
+
+사용법:
+  OPENAI_API_KEY=x python benchmarks/bench_aggregate_query.py
+  OPENAI_API_KEY=x python benchmarks/bench_aggregate_query.py --days 3650 --repeat 5
+"""
+
+import os
+import sys
+import time
+import math
+import random
+import argparse
+from datetime import date, timedelta
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core.day_table import DayTable, METRICS
+from app.core.chatbot_engine.aggregate_query import aggregate_values, TREND_MIN_CHANGE
+from app.utils.health_record import FIELD_NAMES
+
+OPS = ("max", "min", "avg", "sum", "trend")
+
+
+# ============================================================
+# 1) 데이터
+# ============================================================
+def make_summaries(n: int, seed: int = 42) -> list:
+    """오늘 이전 n일 (일부 날짜 누락, 지표의 20%는 0 = 측정 안 됨)"""
+    rng = random.Random(seed)
+    today = date.today()
+    summaries = []
+    for i in range(n):
+        if rng.random() < 0.1:
+            continue
+        raw = {
+            name: 0 if rng.random() < 0.2 else round(rng.uniform(1, 100), rng.choice([0, 2]))
+            for name in FIELD_NAMES
+        }
+        summaries.append(
+            {
+                "date": (today - timedelta(days=i)).isoformat(),
+                "raw": raw,
+                "health_score": rng.choice([0, rng.randint(1, 100)]),
+            }
+        )
+    rng.shuffle(summaries)
+    return summaries
+
+
+def make_windows(n: int) -> list:
+    today = date.today()
+    windows = [(None, None)]
+    for days in (0, 3, 7, 30, 90, n // 2):
+        windows.append(((today - timedelta(days=days)).isoformat(), today.isoformat()))
+    windows.append(((today - timedelta(days=60)).isoformat(), (today - timedelta(days=31)).isoformat()))
+    return windows
+
+
+# ============================================================
+# 2) 기준 구현 (summary 순회)
+# ============================================================
+def ref_aggregate(summaries: list, op: str, metric: str, start, end) -> dict:
+    points = []
+    for summary in sorted(summaries, key=lambda s: s["date"]):
+        if (start and summary["date"] < start) or (end and summary["date"] > end):
+            continue
+        value = summary["health_score"] if metric == "health_score" else summary["raw"][metric]
+        if value:
+            points.append((summary["date"], float(value)))
+
+    if not points:
+        return {}
+
+    if op in ("max", "min"):
+        best = points[0]
+        for point in points[1:]:
+            if (point[1] > best[1]) if op == "max" else (point[1] < best[1]):
+                best = point
+        return {"value": best[1], "date": best[0]}
+
+    values = [value for _, value in points]
+    if op == "sum":
+        return {"value": math.fsum(values)}
+
+    mean = math.fsum(values) / len(values)
+    if op != "trend":
+        return {"value": mean}
+    if len(values) < 2:
+        return {"value": mean, "slope": 0.0, "direction": None}
+
+    first_day = date.fromisoformat(points[0][0])
+    xs = [(date.fromisoformat(d) - first_day).days for d, _ in points]
+    x_mean = sum(xs) / len(xs)
+    sxx = sum((x - x_mean) ** 2 for x in xs)
+    slope = sum((x - x_mean) * (y - mean) for x, y in zip(xs, values)) / sxx if sxx else 0.0
+
+    half = len(values) // 2
+    first = math.fsum(values[:half]) / half
+    last = math.fsum(values[half:]) / (len(values) - half)
+    change = (last - first) / first if first else 0.0
+    direction = (
+        "증가" if change >= TREND_MIN_CHANGE else "감소" if change <= -TREND_MIN_CHANGE else "유지"
+    )
+    return {"value": mean, "slope": slope, "first": first, "last": last, "direction": direction}
+
+
+def same(expected: dict, actual: dict) -> bool:
+    if expected.keys() != actual.keys():
+        return False
+    for key, value in expected.items():
+        if isinstance(value, float):
+            if not math.isclose(value, actual[key], rel_tol=1e-9, abs_tol=1e-9):
+                return False
+        elif value != actual[key]:
+            return False
+    return True
+
+
+# ============================================================
+# 3) 검증 / 측정
+# ============================================================
+def best_of(repeat: int, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="집계 질문 벤치마크")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    summaries = make_summaries(args.days)
+    windows = make_windows(args.days)
+    queries = [(op, metric, start, end) for op in OPS for metric in METRICS for start, end in windows]
+
+    build_sec, table = best_of(args.repeat, lambda: DayTable.from_summaries(summaries))
+
+    def run_table():
+        return [
+            aggregate_values(op, *table.window(metric, start, end))
+            for op, metric, start, end in queries
+        ]
+
+    def run_ref():
+        return [ref_aggregate(summaries, *query) for query in queries]
+
+    table_sec, actual = best_of(args.repeat, run_table)
+    ref_sec, expected = best_of(args.repeat, run_ref)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, actual)) if not same(a, b)]
+
+    print(f"날짜 수: {len(summaries):,}일 / 질문 {len(queries):,}개 (best of {args.repeat})")
+    print(f"  테이블 생성 : {build_sec * 1000:8.2f} ms (데이터 버전당 1회)")
+    print(f"  summary 순회: {ref_sec / len(queries) * 1e6:8.1f} µs/질문")
+    print(f"  날짜 테이블 : {table_sec / len(queries) * 1e6:8.1f} µs/질문")
+    print(f"  속도 향상   : {ref_sec / table_sec:6.1f}x")
+    print(f"  결과 불일치 : {len(mismatches)}건")
+
+    if mismatches:
+        i = mismatches[0]
+        print(f"  예시 질문: {queries[i]}")
+        print(f"  기준: {expected[i]}")
+        print(f"  현재: {actual[i]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
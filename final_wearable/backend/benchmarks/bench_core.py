@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+핵심 순수 함수 마이크로 벤치마크 (기준 결과 저장 / 비교)
+
+기능:
+1. CPU 위주 순수 함수별 호출당 시간 측정 (pytest-benchmark 방식)
+   - 최소 측정 시간을 채우도록 반복 횟수 자동 보정 → 여러 round 측정
+   - round별 호출당 시간의 min / median / mean / stddev, ops/s
+   - 측정 중 GC 비활성화
+2. 입력 데이터는 seed 고정 (같은 입력으로 변경 전후 비교)
+3. 기준 결과 저장 (benchmarks/baselines/bench_core.json) + 이력 (bench_core_history.jsonl)
+4. 기준 대비 변화율 리포트 (기본 min 기준, --threshold 초과 시 회귀 표시)
+
+대상:
+  normalize_raw, generate_summary_text, summary_to_natural_text,
+  calculate_health_score, recommend_exercise_intensity, build_health_context_for_llm,
+  classify_intent, detect_time_expression, get_fallback_routine,
+  parse_db_json_to_raw_data_by_day
+
+사용법:
+  python benchmarks/bench_core.py                      # 측정 + 기준 결과와 비교
+  python benchmarks/bench_core.py -k intent            # 이름에 intent 포함된 항목만
+  python benchmarks/bench_core.py --save               # 기준 결과 갱신 + 이력 추가
+  python benchmarks/bench_core.py --fail-on-regression # 회귀 시 exit code 1
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import random
+import platform
+import argparse
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines", "bench_core.json")
+HISTORY_PATH = os.path.join(BENCH_DIR, "baselines", "bench_core_history.jsonl")
+
+# llm_analysis → app.config는 OPENAI_API_KEY 필요 (호출은 하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench-unused")
+# vector_store import 시 ./chroma_data가 생성/열림 → 저장소 데이터 대신 임시 디렉터리 사용
+ORIGINAL_CWD = os.getcwd()
+WORK_DIR = tempfile.mkdtemp(prefix="bench_core_")
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+os.chdir(WORK_DIR)
+
+from app.utils.preprocess import normalize_raw, generate_summary_text
+from app.utils.preprocess_for_embedding import summary_to_natural_text
+from app.core.health_interpreter import (
+    calculate_health_score,
+    recommend_exercise_intensity,
+    build_health_context_for_llm,
+)
+from app.core.chatbot_engine import intent_classifier
+from app.core.chatbot_engine.intent_classifier import (
+    classify_intent,
+    detect_time_expression,
+)
+from app.core.llm_analysis import get_fallback_routine
+from app.core.db_to_json import db_to_json
+from app.core.db_parser import parse_db_json_to_raw_data_by_day
+
+from synthetic_healthconnect import generate_healthconnect_db
+
+MESSAGES = [
+    "오늘 걸음수 얼마나 돼?",
+    "어제 잠은 몇 시간 잤어?",
+    "지난주 평균 심박수 알려줘",
+    "최근 7일 동안 제일 많이 걸은 날은?",
+    "3일 전에 운동 얼마나 했어?",
+    "이번 달 수면 패턴 어때?",
+    "12월 15일 기록 보여줘",
+    "지난주랑 이번주 활동량 비교해줘",
+    "요즘 컨디션이 예전이랑 비슷해?",
+    "오늘 운동 루틴 추천해줘",
+    "30분짜리 하체 운동 짜줘",
+    "안녕",
+    "고마워!",
+    "너는 누구야?",
+    "배고프다 뭐 먹지",
+]
+
+
+# ============================================================
+# 1) 입력 데이터 (seed 고정)
+# ============================================================
+def make_raw_jsons(n: int, seed: int = 42) -> list:
+    """앱 업로드 형태의 raw_json (삼성 키, 일부 필드 누락/None 포함)"""
+    rng = random.Random(seed)
+    raws = []
+    for _ in range(n):
+        steps = rng.randint(0, 16000)
+        raw = {
+            "platform": "samsung",
+            "steps": steps,
+            "distance": steps * 0.72,
+            "sleep_min": rng.choice([0, rng.randint(180, 600)]),
+            "heart_rate": rng.randint(55, 110),
+            "resting_heart_rate": rng.choice([0, rng.randint(45, 100)]),
+            "oxygen_saturation": rng.choice([0, round(rng.uniform(88, 100), 1)]),
+            "active_calories": rng.randint(0, 700),
+            "total_calories": rng.randint(1200, 3000),
+            "exercise_min": rng.randint(0, 90),
+            "weight": rng.choice([0, round(rng.uniform(45, 110), 1)]),
+            "height": rng.choice([0, 1.72, 165]),
+            "body_fat": None,
+        }
+        raws.append(raw)
+    return raws
+
+
+class Inputs:
+    """벤치마크 입력 (한 번만 생성)"""
+
+    def __init__(self, seed: int = 42):
+        self.raw_jsons = make_raw_jsons(200, seed)
+        self.records = [normalize_raw(dict(raw)) for raw in self.raw_jsons]
+        self.summaries = [
+            {"raw": record, "summary_text": generate_summary_text(record)}
+            for record in self.records
+        ]
+        self.scores = [calculate_health_score(record)["score"] for record in self.records]
+
+        # 30일 × 하루 심박 1,671건 (가장 큰 사용자와 같은 밀도)
+        db_path = os.path.join(WORK_DIR, "healthconnect_bench.db")
+        generate_healthconnect_db(db_path, days=30, seed=seed)
+        self.db_json = db_to_json(db_path)
+
+
+# ============================================================
+# 2) 벤치마크 대상 (1 round = 입력 전체 1회 처리, 결과는 호출당 시간)
+# ============================================================
+def make_cases(inputs: Inputs) -> dict:
+    """이름 → (round 함수, round당 호출 수)"""
+    records = inputs.records
+
+    def classify_cold():
+        # 캐시 적중이 아닌 실제 분류 비용 측정
+        for message in MESSAGES:
+            intent_classifier._intent_cache.clear()
+            classify_intent(message)
+
+    return {
+        "normalize_raw": (
+            lambda: [normalize_raw(dict(raw)) for raw in inputs.raw_jsons],
+            len(inputs.raw_jsons),
+        ),
+        "generate_summary_text": (
+            lambda: [generate_summary_text(record) for record in records],
+            len(records),
+        ),
+        "summary_to_natural_text": (
+            lambda: [summary_to_natural_text(summary) for summary in inputs.summaries],
+            len(inputs.summaries),
+        ),
+        "calculate_health_score": (
+            lambda: [calculate_health_score(record) for record in records],
+            len(records),
+        ),
+        "recommend_exercise_intensity": (
+            lambda: [recommend_exercise_intensity(record) for record in records],
+            len(records),
+        ),
+        "build_health_context_for_llm": (
+            lambda: [build_health_context_for_llm(record) for record in records],
+            len(records),
+        ),
+        "classify_intent": (classify_cold, len(MESSAGES)),
+        "detect_time_expression": (
+            lambda: [detect_time_expression(message) for message in MESSAGES],
+            len(MESSAGES),
+        ),
+        "get_fallback_routine": (
+            lambda: [
+                get_fallback_routine(score, 30, record)
+                for score, record in zip(inputs.scores[:50], records[:50])
+            ],
+            50,
+        ),
+        "parse_db_json_to_raw_data_by_day": (
+            lambda: parse_db_json_to_raw_data_by_day(inputs.db_json),
+            1,
+        ),
+    }
+
+
+# ============================================================
+# 3) 측정
+# ============================================================
+def measure(func, calls_per_round: int, rounds: int, min_time: float) -> dict:
+    """
+    반복 횟수 보정 후 rounds회 측정 → 호출당 시간 통계 (µs)
+
+    round 1회가 min_time보다 짧으면 loops를 늘려서 타이머 해상도 영향 제거
+    """
+    gc.collect()  # 이전 항목의 가비지가 측정에 섞이지 않게
+    func()  # warm-up
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        per_call = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            elapsed = time.perf_counter() - start
+            per_call.append(elapsed / (loops * calls_per_round) * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    median = statistics.median(per_call)
+    return {
+        "min_us": round(min(per_call), 3),
+        "median_us": round(median, 3),
+        "mean_us": round(statistics.mean(per_call), 3),
+        "stddev_us": round(statistics.stdev(per_call), 3) if rounds > 1 else 0.0,
+        "ops_per_sec": round(1e6 / median, 1) if median else 0.0,
+        "rounds": rounds,
+        "loops": loops,
+        "calls_per_round": calls_per_round,
+    }
+
+
+# ============================================================
+# 4) 기준 결과 저장 / 비교
+# ============================================================
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_baseline(results: dict):
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "machine": machine_info(),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+
+    # 기존 기준에 없는 항목(-k로 일부만 측정)은 유지
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            previous = json.load(f).get("results", {})
+        report["results"] = {**previous, **results}
+
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+    history = {
+        "created_at": report["created_at"],
+        "commit": report["commit"],
+        "python": report["machine"]["python"],
+        "min_us": {name: r["min_us"] for name, r in sorted(results.items())},
+        "median_us": {name: r["median_us"] for name, r in sorted(results.items())},
+    }
+    with open(HISTORY_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(history, ensure_ascii=False) + "\n")
+
+
+def compare(results: dict, baseline: dict, threshold: float, stat: str = "min_us") -> list:
+    """
+    기준 대비 변화율 출력 → 회귀 항목 이름 목록 반환
+
+    기본 비교값은 min (다른 프로세스 간섭이 가장 적은 round → 반복 측정 시 가장 안정적)
+    """
+    base_results = baseline.get("results", {})
+    regressions = []
+
+    print(
+        f"\n📊 기준 결과 비교 ({baseline.get('created_at', '?')}, "
+        f"commit {baseline.get('commit') or '?'}, {stat}, 허용 ±{threshold:.0%})"
+    )
+    if baseline.get("machine", {}).get("python") != platform.python_version():
+        print("  ⚠️ 기준 결과와 Python 버전이 다릅니다 (수치 비교 주의)")
+
+    for name, result in results.items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"  {name:<34} (기준 없음)")
+            continue
+
+        change = result[stat] / base[stat] - 1 if base[stat] else 0.0
+        if change > threshold:
+            mark = "❌ 회귀"
+            regressions.append(name)
+        elif change < -threshold:
+            mark = "🚀 개선"
+        else:
+            mark = "✅"
+        print(
+            f"  {name:<34} {base[stat]:>10.2f} → {result[stat]:>10.2f} µs"
+            f"  {change:+7.1%}  {mark}"
+        )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핵심 순수 함수 마이크로 벤치마크")
+    parser.add_argument("-k", dest="keyword", default="", help="이름 필터 (부분 일치)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="round당 최소 시간 (초)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", action="store_true", help="기준 결과 갱신 + 이력 추가")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀 판정 변화율")
+    parser.add_argument(
+        "--stat", default="min_us", choices=("min_us", "median_us", "mean_us"),
+        help="비교 기준 통계값",
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", dest="json_out", help="측정 결과 JSON 저장 경로")
+    args = parser.parse_args()
+    baseline_path = os.path.join(ORIGINAL_CWD, args.baseline)
+
+    inputs = Inputs(args.seed)
+    cases = {
+        name: case
+        for name, case in make_cases(inputs).items()
+        if args.keyword in name
+    }
+    if not cases:
+        parser.error(f"'{args.keyword}'에 해당하는 벤치마크가 없습니다.")
+
+    print(f"{'name':<34}{'median µs':>12}{'min µs':>12}{'stddev':>10}{'ops/s':>14}")
+    print("-" * 82)
+    results = {}
+    for name, (func, calls) in cases.items():
+        result = measure(func, calls, args.rounds, args.min_time)
+        results[name] = result
+        print(
+            f"{name:<34}{result['median_us']:>12.2f}{result['min_us']:>12.2f}"
+            f"{result['stddev_us']:>10.2f}{result['ops_per_sec']:>14,.0f}"
+        )
+
+    if args.json_out:
+        with open(os.path.join(ORIGINAL_CWD, args.json_out), "w", encoding="utf-8") as f:
+            json.dump({"machine": machine_info(), "results": results}, f, indent=2)
+
+    regressions = []
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold, args.stat)
+    else:
+        print(f"\n기준 결과 없음: {baseline_path} (--save로 생성)")
+
+    if args.save:
+        save_baseline(results)
+        print(f"\n💾 기준 결과 저장: {BASELINE_PATH}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
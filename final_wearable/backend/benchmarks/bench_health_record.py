@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+DailyHealthRecord 벤치마크 (dict + JSON vs 레코드 + 바이너리)
+
+기능:
+1. normalize_raw() 입력 형식의 랜덤 날짜 데이터 생성
+2. 하루치 메모리 사용량 비교 (tracemalloc)
+3. 직렬화/역직렬화 시간 비교 (json.dumps/loads vs to_bytes/from_bytes)
+4. 왕복 변환 결과 일치 검증
+
+사용법:
+  python benchmarks/bench_health_record.py
+  python benchmarks/bench_health_record.py --days 10000 --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.utils.health_record import DailyHealthRecord, FIELD_NAMES
+
+# 정수로 들어오는 필드 (db_parser 기준)
+INT_FIELDS = {"steps", "flights", "systolic", "diastolic"}
+
+
+def make_days(n: int, seed: int = 42) -> list:
+    """필드별 0(결측) 20% + 랜덤값 80%로 날짜 데이터 생성"""
+    rng = random.Random(seed)
+    days = []
+    for _ in range(n):
+        raw = {}
+        for name in FIELD_NAMES:
+            if rng.random() < 0.2:
+                raw[name] = 0
+            elif name in INT_FIELDS:
+                raw[name] = rng.randint(1, 15000)
+            else:
+                raw[name] = round(rng.uniform(0, 200), 3)
+        days.append(raw)
+    return days
+
+
+def measure_memory(factory) -> int:
+    """factory()가 만든 객체들이 차지하는 메모리 (bytes)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = factory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size
+
+
+def best_of(repeat: int, func):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DailyHealthRecord 벤치마크")
+    parser.add_argument("--days", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    days = make_days(args.days)
+    records = [DailyHealthRecord.from_mapping(raw) for raw in days]
+
+    # 1) 메모리 (하루당)
+    dict_mem = measure_memory(lambda: [dict(raw) for raw in days])
+    record_mem = measure_memory(
+        lambda: [DailyHealthRecord.from_mapping(raw) for raw in days]
+    )
+
+    # 2) 직렬화 / 역직렬화
+    json_dump_sec, dumped = best_of(
+        args.repeat, lambda: [json.dumps(raw, ensure_ascii=False) for raw in days]
+    )
+    json_load_sec, _ = best_of(args.repeat, lambda: [json.loads(s) for s in dumped])
+    bin_dump_sec, packed = best_of(
+        args.repeat, lambda: [record.to_bytes() for record in records]
+    )
+    bin_load_sec, restored = best_of(
+        args.repeat, lambda: [DailyHealthRecord.from_bytes(b) for b in packed]
+    )
+
+    # 3) 왕복 검증 (값 + int/float 타입)
+    mismatches = [
+        i
+        for i, (raw, record) in enumerate(zip(days, restored))
+        if any(
+            raw[k] != record[k] or type(raw[k]) is not type(record[k])
+            for k in FIELD_NAMES
+        )
+    ]
+
+    print(f"날짜 수: {args.days:,}일 (best of {args.repeat})")
+    print("  메모리 (하루당)")
+    print(f"    dict   : {dict_mem / args.days:8.1f} bytes")
+    print(f"    record : {record_mem / args.days:8.1f} bytes")
+    print("  직렬화 크기 (하루당)")
+    print(f"    JSON   : {sum(map(len, dumped)) / args.days:8.1f} bytes")
+    print(f"    binary : {len(packed[0]):8.1f} bytes")
+    print("  직렬화 / 역직렬화")
+    print(f"    JSON   : {json_dump_sec * 1000:8.2f} ms / {json_load_sec * 1000:8.2f} ms")
+    print(f"    binary : {bin_dump_sec * 1000:8.2f} ms / {bin_load_sec * 1000:8.2f} ms")
+    print(f"  왕복 불일치: {len(mismatches)}건")
+
+    if mismatches:
+        i = mismatches[0]
+        print(f"  예시 입력: {days[i]}")
+        print(f"  복원 결과: {restored[i].to_dict()}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+건강 점수 계산 벤치마크 (스칼라 vs NumPy 벡터화)
+
+기능:
+1. 랜덤 날짜 데이터 생성 (경계값 포함)
+2. calculate_health_score() 와 calculate_health_scores_batch() 결과 일치 검증
+   + exercise_recommendation 권장 강도와 recommended_levels_batch() 일치 검증
+3. 처리 시간 비교
+
+사용법:
+  python benchmarks/bench_health_score.py
+  python benchmarks/bench_health_score.py --days 10000 --repeat 5
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core.health_interpreter import HealthInterpretation, calculate_health_score
+from app.core.health_score_batch import (
+    calculate_health_scores_batch,
+    health_scores_to_dicts,
+    raws_to_columns,
+    recommended_levels_batch,
+)
+
+# 규칙 경계값 (경계 직전/직후까지 섞어서 검증)
+BOUNDARIES = {
+    "sleep_hr": [0, 4.99, 5, 5.99, 6, 6.99, 7, 9, 9.01, 12],
+    "steps": [0, 1999, 2000, 2999, 3000, 3999, 4000, 4999, 5000, 5999, 6000, 7999, 8000, 9999, 10000],
+    "resting_heart_rate": [0, 0, 49, 50, 64, 65, 74, 75, 84, 85, 89.9, 90, 94, 95],
+    "heart_rate": [0, 60, 64.9, 65, 80, 110],
+    "bmi": [0, 16.9, 17, 18.49, 18.5, 22.9, 23, 24.9, 25, 27.9, 28, 29.9, 30],
+    "oxygen_saturation": [0, 90, 94.9, 95, 97.9, 98, 100],
+    "active_calories": [0, 149, 150, 299, 300],
+    "exercise_min": [0, 14, 15, 29, 30],
+}
+
+
+def make_days(n: int, seed: int = 42) -> list:
+    """경계값 50% + 연속 랜덤값 50%로 날짜 데이터 생성"""
+    rng = random.Random(seed)
+    days = []
+    for _ in range(n):
+        raw = {}
+        for key, values in BOUNDARIES.items():
+            if rng.random() < 0.5:
+                raw[key] = rng.choice(values)
+            else:
+                raw[key] = round(rng.uniform(0, max(values) * 1.1), 2)
+        days.append(raw)
+    return days
+
+
+def best_of(repeat: int, func, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="건강 점수 계산 벤치마크")
+    parser.add_argument("--days", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    days = make_days(args.days)
+    columns = raws_to_columns(days)
+
+    scalar_sec, scalar = best_of(
+        args.repeat, lambda: [calculate_health_score(raw) for raw in days]
+    )
+    batch_sec, batch = best_of(args.repeat, calculate_health_scores_batch, columns)
+
+    mismatches = [
+        i for i, (a, b) in enumerate(zip(scalar, health_scores_to_dicts(batch))) if a != b
+    ]
+
+    scalar_levels = [
+        HealthInterpretation(raw).exercise_recommendation["recommended_level"] for raw in days
+    ]
+    batch_levels = recommended_levels_batch(columns, batch["score"]).tolist()
+    level_mismatches = [
+        i for i, (a, b) in enumerate(zip(scalar_levels, batch_levels)) if a != b
+    ]
+
+    print(f"날짜 수: {args.days:,}일 (best of {args.repeat})")
+    print(f"  스칼라  : {scalar_sec * 1000:8.2f} ms")
+    print(f"  벡터화  : {batch_sec * 1000:8.2f} ms")
+    print(f"  속도 향상: {scalar_sec / batch_sec:6.1f}x")
+    print(f"  결과 불일치: {len(mismatches)}건")
+    print(f"  권장 강도 불일치: {len(level_mismatches)}건")
+
+    if level_mismatches:
+        i = level_mismatches[0]
+        print(f"  예시 입력: {days[i]}")
+        print(f"  스칼라: {scalar_levels[i]} / 벡터화: {batch_levels[i]}")
+        sys.exit(1)
+
+    if mismatches:
+        i = mismatches[0]
+        print(f"  예시 입력: {days[i]}")
+        print(f"  스칼라: {scalar[i]}")
+        print(f"  벡터화: {health_scores_to_dicts(batch)[i]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Intent 분류기 벤치마크 (키워드 선형 검색 vs Aho–Corasick automaton)
+
+기능:
+1. 기존 방식(키워드 목록마다 `kw in msg`)을 기준 구현으로 재현
+2. 기준 구현과 현재 intent_classifier 결과 일치 검증
+   - 모든 키워드 단독 / 앞뒤 문장 포함
+   - 서로 다른 키워드 쌍 전체 (순서 / 공백 유무)
+   - 랜덤 조합 문장 (대소문자, 숫자 + 일/주/달 전 패턴 포함)
+   → scan_keywords (카테고리 → 매칭 키워드) / classify_intent / detect_time_expression
+     / detect_comparison_pattern / _rule_based_intent / parse_aggregate
+3. 메시지당 처리 시간 비교
+   - 키워드 스캔만: 카테고리 8개 × 키워드 목록 선형 검색 vs automaton 1회 순회
+   - 분류 전체 (캐시 미사용)
+   - 캐시 사용: 같은 메시지가 반복되는 경우 (캐시 크기 안의 메시지를 한 번 분류한 뒤 재측정)
+
+사용법:
+  python benchmarks/bench_intent_classifier.py
+  python benchmarks/bench_intent_classifier.py --random 50000 --repeat 5
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core.chatbot_engine import intent_classifier as ic
+
+FILLERS = ["", " ", "나", "좀", "알려줘", "?", "!", "요즘", "그리고", "abc", "123", "운", "동"]
+
+
+# ============================================================
+# 1) 기준 구현 (키워드 목록 선형 검색)
+# ============================================================
+def ref_detect_time_expression(message: str) -> dict:
+    msg = message.strip().lower()
+    today = datetime.now().date()
+
+    for keyword, days_ago in ic.TIME_KEYWORDS.items():
+        if keyword in msg:
+            target_date = today - timedelta(days=days_ago)
+            return {
+                "detected": True,
+                "type": "specific",
+                "days_ago": days_ago,
+                "target_date": target_date.strftime("%Y-%m-%d"),
+                "keyword": keyword,
+            }
+
+    for keyword in ic.TIME_RANGE_KEYWORDS:
+        if keyword in msg:
+            if "이번주" in keyword or "금주" in keyword:
+                start = today - timedelta(days=today.weekday())
+            elif "이번달" in keyword or "금월" in keyword:
+                start = today.replace(day=1)
+            elif "최근 3일" in keyword:
+                start = today - timedelta(days=3)
+            elif "최근 7일" in keyword or "최근 일주일" in keyword:
+                start = today - timedelta(days=7)
+            elif "최근 30일" in keyword or "최근 한달" in keyword:
+                start = today - timedelta(days=30)
+            else:
+                start = today - timedelta(days=7)
+            return {
+                "detected": True,
+                "type": "range",
+                "start_date": start.strftime("%Y-%m-%d"),
+                "end_date": today.strftime("%Y-%m-%d"),
+                "keyword": keyword,
+            }
+
+    match = re.search(r"(\d+)\s*(일|주|달|개월)\s*(전|ago)", msg)
+    if match:
+        num = int(match.group(1))
+        unit = match.group(2)
+        days = {"일": num, "주": num * 7, "달": num * 30, "개월": num * 30}.get(unit, num)
+        return {
+            "detected": True,
+            "type": "specific",
+            "days_ago": days,
+            "target_date": (today - timedelta(days=days)).strftime("%Y-%m-%d"),
+            "keyword": match.group(0),
+        }
+
+    return {"detected": False, "type": None}
+
+
+def ref_scan_keywords(message: str) -> dict:
+    """카테고리마다 목록 순서대로 `kw in msg` → 처음 걸린 키워드"""
+    msg = message.strip().lower()
+    categories = {
+        "time": list(ic.TIME_KEYWORDS),
+        "time_range": ic.TIME_RANGE_KEYWORDS,
+        "comparison": ic.COMPARISON_KEYWORDS,
+        "routine_explicit": ic.ROUTINE_EXPLICIT_KEYWORDS,
+        "routine_context": ic.ROUTINE_CONTEXT_KEYWORDS,
+        "health": ic.HEALTH_KEYWORDS,
+        "aggregate_op": list(ic.AGGREGATE_OPS),
+        "aggregate_metric": list(ic.AGGREGATE_METRIC_KEYWORDS),
+    }
+    hits = {}
+    for category, keywords in categories.items():
+        keyword = next((kw for kw in keywords if kw in msg), None)
+        if keyword is not None:
+            hits[category] = keyword
+    return hits
+
+
+def ref_detect_comparison_pattern(message: str) -> bool:
+    msg = message.strip().lower()
+    return any(keyword in msg for keyword in ic.COMPARISON_KEYWORDS)
+
+
+def ref_rule_based_intent(message: str) -> str:
+    msg = message.strip().lower()
+    if any(kw in msg for kw in ic.ROUTINE_EXPLICIT_KEYWORDS):
+        return "routine_request"
+    if any(kw in msg for kw in ic.ROUTINE_CONTEXT_KEYWORDS):
+        return "routine_request"
+    if any(kw in msg for kw in ic.HEALTH_KEYWORDS):
+        return "health_query"
+    if any(kw in msg for kw in ic.AGGREGATE_OPS) and any(
+        kw in msg for kw in ic.AGGREGATE_METRIC_KEYWORDS
+    ):
+        return "health_query"
+    return None
+
+
+def ref_parse_aggregate(message: str) -> dict | None:
+    msg = message.strip().lower()
+    op = next((kw for kw in ic.AGGREGATE_OPS if kw in msg), None)
+    metric = next((kw for kw in ic.AGGREGATE_METRIC_KEYWORDS if kw in msg), None)
+    if op is None or metric is None:
+        return None
+
+    time_keyword = next((kw for kw in ic.TIME_KEYWORDS if kw in msg), None)
+    period = None
+    if time_keyword in ic.LAST_WEEK_KEYWORDS:
+        period = "last_week"
+    elif time_keyword in ic.LAST_MONTH_KEYWORDS:
+        period = "last_month"
+
+    days = None
+    match = re.search(r"(?:최근|지난)\s*(\d+)\s*(일|주|달|개월)", msg)
+    if match:
+        num = int(match.group(1))
+        days = {"일": num, "주": num * 7}.get(match.group(2), num * 30)
+
+    return {
+        "op": ic.AGGREGATE_OPS[op],
+        "metric": ic.AGGREGATE_METRIC_KEYWORDS[metric],
+        "days": days,
+        "period": period,
+        "keyword": op,
+    }
+
+
+def ref_classify_intent(message: str) -> dict:
+    time_context = ref_detect_time_expression(message)
+    return {
+        "intent": ref_rule_based_intent(message) or "default_chat",
+        "time_context": time_context if time_context["detected"] else None,
+        "use_similarity": ref_detect_comparison_pattern(message),
+    }
+
+
+# ============================================================
+# 2) 검증용 메시지
+# ============================================================
+def all_keywords() -> list:
+    keywords = (
+        list(ic.TIME_KEYWORDS)
+        + ic.TIME_RANGE_KEYWORDS
+        + ic.COMPARISON_KEYWORDS
+        + ic.ROUTINE_EXPLICIT_KEYWORDS
+        + ic.ROUTINE_CONTEXT_KEYWORDS
+        + ic.HEALTH_KEYWORDS
+        + list(ic.AGGREGATE_OPS)
+        + list(ic.AGGREGATE_METRIC_KEYWORDS)
+    )
+    return list(dict.fromkeys(keywords))
+
+
+def make_messages(n_random: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    keywords = all_keywords()
+    messages = ["", "   ", "안녕", "ㅋㅋㅋ", "3일 전", "2 주 전에", "10 ago"]
+
+    # 단독 / 앞뒤 문장
+    for kw in keywords:
+        messages += [kw, f"  {kw.upper()}  ", f"오늘은 {kw} 어때?", f"나{kw}해"]
+
+    # 키워드 쌍 전체
+    for a in keywords:
+        for b in keywords:
+            if a != b:
+                messages += [f"{a} {b}", f"{a}{b}"]
+
+    # 랜덤 조합
+    for _ in range(n_random):
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            parts.append(rng.choice(keywords))
+            parts.append(rng.choice(FILLERS))
+        if rng.random() < 0.2:
+            parts.append(f"{rng.randint(1, 20)}{rng.choice(['', ' '])}{rng.choice(['일', '주', '달', '개월'])} 전")
+        message = "".join(parts)
+        messages.append(message.upper() if rng.random() < 0.1 else message)
+
+    return messages
+
+
+# ============================================================
+# 3) 검증 / 측정
+# ============================================================
+def verify(messages: list) -> list:
+    mismatches = []
+    checks = (
+        ("scan_keywords", ref_scan_keywords, ic.scan_keywords),
+        ("classify_intent", ref_classify_intent, ic.classify_intent),
+        ("detect_time_expression", ref_detect_time_expression, ic.detect_time_expression),
+        ("detect_comparison_pattern", ref_detect_comparison_pattern, ic.detect_comparison_pattern),
+        ("_rule_based_intent", ref_rule_based_intent, ic._rule_based_intent),
+        ("parse_aggregate", ref_parse_aggregate, ic.parse_aggregate),
+    )
+    for message in messages:
+        ic._intent_cache.clear()
+        for name, ref, current in checks:
+            expected, actual = ref(message), current(message)
+            if isinstance(expected, dict) and name == "classify_intent":
+                # 기준 구현에 없는 항목 (confidence / source) 제외
+                actual = {key: actual[key] for key in expected}
+            if expected != actual:
+                mismatches.append((name, message, expected, actual))
+    return mismatches
+
+
+def best_of(repeat: int, func, messages: list) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            func(message)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def classify_uncached(message: str) -> dict:
+    ic._intent_cache.clear()
+    return ic.classify_intent(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent 분류기 벤치마크")
+    parser.add_argument("--random", type=int, default=20000, help="랜덤 조합 메시지 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    messages = make_messages(args.random)
+    mismatches = verify(messages)
+
+    sample = messages[-args.random:] if args.random else messages
+    ref_scan_sec = best_of(args.repeat, ref_scan_keywords, sample)
+    new_scan_sec = best_of(args.repeat, ic.scan_keywords, sample)
+    ref_sec = best_of(args.repeat, ref_classify_intent, sample)
+    new_sec = best_of(args.repeat, classify_uncached, sample)
+
+    hot = sample[: ic.CACHE_MAX_SIZE]
+    ic._intent_cache.clear()
+    for message in hot:
+        ic.classify_intent(message)
+    cached_sec = best_of(args.repeat, ic.classify_intent, hot) / len(hot) * len(sample)
+
+    print(f"검증 메시지: {len(messages):,}개 (키워드 {len(all_keywords())}개)")
+    print(f"측정 메시지: {len(sample):,}개 (best of {args.repeat})")
+    print("  [키워드 스캔]")
+    print(f"    선형 검색        : {ref_scan_sec / len(sample) * 1e6:8.2f} µs/메시지")
+    print(f"    automaton        : {new_scan_sec / len(sample) * 1e6:8.2f} µs/메시지")
+    print(f"    속도 향상        : {ref_scan_sec / new_scan_sec:6.1f}x")
+    print("  [분류 전체]")
+    print(f"    기준 구현        : {ref_sec / len(sample) * 1e6:8.2f} µs/메시지")
+    print(f"    현재 (캐시 미사용): {new_sec / len(sample) * 1e6:8.2f} µs/메시지")
+    print(f"    현재 (캐시 사용)  : {cached_sec / len(sample) * 1e6:8.2f} µs/메시지")
+    print(f"  결과 불일치: {len(mismatches)}건")
+
+    if mismatches:
+        for name, message, expected, actual in mismatches[:5]:
+            print(f"  [{name}] {message!r}")
+            print(f"    기준: {expected}")
+            print(f"    현재: {actual}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
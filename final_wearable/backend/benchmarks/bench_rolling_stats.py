@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+누적 통계 벤치마크 (요청마다 최근 summary 재계산 vs 업로드마다 증분 갱신)
+
+기능:
+1. 랜덤 업로드 시나리오 생성
+   - 대부분 하루씩 새 날짜 추가, 일부는 며칠 건너뜀
+   - 같은 날짜 재업로드 (덮어쓰기) / 90일 이내 과거 날짜 추가 / 90일보다 오래된 날짜
+   - 지표의 20%는 0 (측정 안 됨)
+2. 업로드마다 전체 재계산(기준 구현)과 rolling_stats 결과 일치 검증
+   - 7 / 30 / 90일 × 전체 지표의 기록 일수 / 합계 / 평균 / 최소 / 최대
+   - 지표별 연속 기록 일수 / 목표 연속 달성 일수
+3. 업로드당 갱신 시간, 조회당 시간 비교
+
+사용법:
+  OPENAI_API_KEY=x python benchmarks/bench_rolling_stats.py
+  OPENAI_API_KEY=x python benchmarks/bench_rolling_stats.py --uploads 5000 --seed 7
+"""
+
+import os
+import sys
+import time
+import math
+import random
+import argparse
+from datetime import date, timedelta
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core.rolling_stats import RollingStats, WINDOWS, HISTORY_DAYS, STREAK_GOALS
+from app.utils.health_record import FIELD_NAMES, METRIC_NAMES, metric_row
+
+
+# ============================================================
+# 1) 시나리오
+# ============================================================
+def make_raw(rng: random.Random) -> dict:
+    raw = {
+        name: 0 if rng.random() < 0.2 else round(rng.uniform(1, 100), rng.choice([0, 2]))
+        for name in FIELD_NAMES
+    }
+    # 목표 연속 달성이 나오도록 목표 지표는 기준 근처 값
+    for metric, goal in STREAK_GOALS.items():
+        if raw[metric]:
+            raw[metric] = round(goal * rng.uniform(0.7, 1.5), 1)
+    return raw
+
+
+def make_uploads(n: int, seed: int) -> list:
+    """[(날짜, raw, health_score), ...] 업로드 순서"""
+    rng = random.Random(seed)
+    day = date.today() - timedelta(days=n)
+    uploads = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.75:
+            day += timedelta(days=1)
+            target = day
+        elif r < 0.85:
+            day += timedelta(days=rng.randint(2, 40))
+            target = day
+        elif r < 0.93:
+            target = day - timedelta(days=rng.randint(0, 10))
+        elif r < 0.98:
+            target = day - timedelta(days=rng.randint(11, HISTORY_DAYS - 1))
+        else:
+            target = day - timedelta(days=rng.randint(HISTORY_DAYS, 200))
+        uploads.append((target.isoformat(), make_raw(rng), rng.choice([0, rng.randint(1, 100)])))
+    return uploads
+
+
+# ============================================================
+# 2) 기준 구현 (저장된 날짜 전체에서 재계산)
+# ============================================================
+def ref_stats(days: dict) -> dict:
+    """days: 날짜 → (raw, health_score) (같은 날짜는 마지막 업로드)"""
+    latest = date.fromisoformat(max(days))
+    result = {}
+
+    for metric in METRIC_NAMES:
+        def value(day):
+            raw, score = days[day]
+            v = score if metric == "health_score" else raw[metric]
+            return float(v) if v else None
+
+        for w in WINDOWS:
+            since = (latest - timedelta(days=w - 1)).isoformat()
+            values = [v for d in days if d >= since for v in [value(d)] if v is not None]
+            result[(metric, w)] = {
+                "days": len(values),
+                "total": math.fsum(values) if values else None,
+                "mean": math.fsum(values) / len(values) if values else None,
+                "min": min(values) if values else None,
+                "max": max(values) if values else None,
+            }
+
+        def run(condition):
+            count = 0
+            for i in range(HISTORY_DAYS):
+                day = (latest - timedelta(days=i)).isoformat()
+                if day not in days or not condition(value(day)):
+                    break
+                count += 1
+            return count
+
+        result[(metric, "streak")] = run(lambda v: v is not None)
+        if metric in STREAK_GOALS:
+            goal = STREAK_GOALS[metric]
+            result[(metric, "goal")] = run(lambda v: v is not None and v >= goal)
+
+    return result
+
+
+def actual_stats(stats: RollingStats) -> dict:
+    result = {}
+    for metric in METRIC_NAMES:
+        for w in WINDOWS:
+            result[(metric, w)] = stats.window(metric, w)
+        result[(metric, "streak")] = stats.streak(metric)
+        if metric in STREAK_GOALS:
+            result[(metric, "goal")] = stats.goal_streak(metric)
+    return result
+
+
+def same(expected, actual) -> bool:
+    if isinstance(expected, dict):
+        return all(same(value, actual[key]) for key, value in expected.items())
+    if isinstance(expected, float):
+        return actual is not None and math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-6)
+    return expected == actual
+
+
+# ============================================================
+# 3) 검증 / 측정
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="누적 통계 벤치마크")
+    parser.add_argument("--uploads", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    uploads = make_uploads(args.uploads, args.seed)
+    rows = [metric_row(raw, score) for _, raw, score in uploads]
+
+    stats = RollingStats()
+    days = {}
+    update_sec = ref_sec = 0.0
+    mismatches = []
+
+    for i, ((day, raw, score), row) in enumerate(zip(uploads, rows)):
+        start = time.perf_counter()
+        stats.update(day, row)
+        update_sec += time.perf_counter() - start
+
+        days[day] = (raw, score)
+        start = time.perf_counter()
+        expected = ref_stats(days)
+        ref_sec += time.perf_counter() - start
+
+        actual = actual_stats(stats)
+        diff = [key for key in expected if not same(expected[key], actual[key])]
+        if diff:
+            mismatches.append((i, diff[0], expected[diff[0]], actual[diff[0]]))
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        stats.window("steps", 7), stats.window("sleep_hr", 30), stats.goal_streak("steps")
+    read_sec = (time.perf_counter() - start) / 1000
+
+    n = len(uploads)
+    print(f"업로드 {n:,}건 (날짜 {len(days):,}개)")
+    print(f"  전체 재계산 : {ref_sec / n * 1000:8.2f} ms/업로드 (전 지표 × 창 3개)")
+    print(f"  증분 갱신   : {update_sec / n * 1e6:8.1f} µs/업로드")
+    print(f"  조회        : {read_sec * 1e6:8.1f} µs (지표 2개 창 + 연속 일수)")
+    print(f"  결과 불일치 : {len(mismatches)}건")
+
+    if mismatches:
+        i, key, expected, actual = mismatches[0]
+        print(f"  예시: 업로드 #{i} {uploads[i][0]} {key}")
+        print(f"  기준: {expected}")
+        print(f"  현재: {actual}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
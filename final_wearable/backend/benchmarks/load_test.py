@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+End-to-end 부하 테스트 (실제 app.main:app + OpenAI 스텁)
+
+기능:
+1. OpenAI 스텁 서버 실행 (임베딩 / chat completion, 지연 시간 설정 가능)
+2. 임시 작업 디렉터리에서 uvicorn으로 app.main:app 실행
+   - ./chroma_data, 업로드 job DB, 서버 로그 모두 임시 디렉터리에 생성
+3. 시나리오별 부하 생성 (httpx 비동기 클라이언트)
+   - zip_upload[Nd]: 합성 Health Connect DB(ZIP) 업로드 → job 완료까지 (크기별)
+   - auto_burst: 사용자별 7일치 /api/auto/upload 동시 전송 (앱 동기화 패턴)
+   - chat_mix: /api/chat (intent 혼합) + /api/chat/fixed, 캐릭터 랜덤
+   - latest_analysis: /api/user/latest-analysis
+4. 시나리오별 처리량(req/s), p50/p95/p99, 서버 peak RSS 출력
+5. 결과 JSON 저장 / 이전 결과와 비교 (회귀 시 exit code 1)
+
+같은 --seed면 같은 요청 순서 / 데이터로 실행된다.
+
+사용법:
+  python benchmarks/load_test.py
+  python benchmarks/load_test.py --zip-days 30,365,1000 --chat-latency-ms 800
+  python benchmarks/load_test.py --scenarios chat_mix,latest_analysis --concurrency 16
+  python benchmarks/load_test.py --output base.json
+  python benchmarks/load_test.py --compare base.json --tolerance 0.2
+  python benchmarks/load_test.py --env AUTO_ANALYSIS_DEBOUNCE_SEC=0.2
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import socket
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from stub_openai import start_stub_server
+from synthetic_healthconnect import generate_healthconnect_zip
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ("zip_upload", "auto_burst", "chat_mix", "latest_analysis")
+PERSONAS = ("devil_coach", "angel_coach", "booster_coach")
+FIXED_QUESTIONS = (
+    "weekly_report",
+    "today_recommendation",
+    "weekly_steps",
+    "sleep_report",
+    "heart_rate",
+    "health_score",
+)
+CHAT_MESSAGES = (
+    # health_query (시간 표현 포함)
+    "오늘 걸음수 얼마나 돼?",
+    "어제 잠은 몇 시간 잤어?",
+    "지난주 평균 심박수 알려줘",
+    "최근 7일 동안 제일 많이 걸은 날은?",
+    "이번 달 수면 패턴 어때?",
+    # 비교 / 패턴
+    "지난주랑 이번주 활동량 비교해줘",
+    "요즘 컨디션이 예전이랑 비슷해?",
+    # routine_request
+    "오늘 운동 루틴 추천해줘",
+    "30분짜리 하체 운동 짜줘",
+    # default_chat
+    "안녕",
+    "고마워!",
+    "너는 누구야?",
+)
+
+
+# ============================================================
+# 1) 테스트 데이터
+# ============================================================
+def make_raw_json(rng: random.Random) -> dict:
+    """앱 자동 업로드 raw_json (삼성 키)"""
+    steps = rng.randint(1500, 14000)
+    return {
+        "steps": steps,
+        "distance": steps * 0.72,
+        "sleep_min": rng.randint(300, 480),
+        "heart_rate": rng.randint(65, 95),
+        "resting_heart_rate": rng.randint(55, 80),
+        "oxygen_saturation": round(rng.uniform(94, 99), 1),
+        "active_calories": rng.randint(100, 600),
+        "total_calories": rng.randint(1600, 2600),
+        "exercise_min": rng.randint(0, 60),
+        "weight": round(rng.uniform(55, 85), 1),
+        "height": 172,
+    }
+
+
+# ============================================================
+# 2) 서버 실행
+# ============================================================
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_rss_mb(pid: int) -> dict:
+    """/proc/<pid>/status의 현재 RSS / peak RSS (MB, Linux 전용)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return {"rss_mb": None, "peak_rss_mb": None}
+
+    def to_mb(key):
+        value = fields.get(key)
+        return round(int(value.split()[0]) / 1024, 1) if value else None
+
+    return {"rss_mb": to_mb("VmRSS"), "peak_rss_mb": to_mb("VmHWM")}
+
+
+def start_app_server(workdir: str, openai_base_url: str, extra_env: dict) -> tuple:
+    """임시 디렉터리를 cwd로 uvicorn app.main:app 실행 → (process, base_url)"""
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(
+        OPENAI_API_KEY="sk-loadtest-stub",
+        OPENAI_BASE_URL=openai_base_url,
+        UPLOAD_JOB_DB=os.path.join(workdir, "upload_jobs.sqlite3"),
+        LOG_FILE="",
+        LOG_LEVEL="WARNING",
+        TRACE_SLOW_REQUEST_SEC="0",
+    )
+    env.update(extra_env)
+
+    log = open(os.path.join(workdir, "server.log"), "wb")
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--app-dir", BACKEND_DIR,
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--log-level", "warning",
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 시작 실패 (로그: {log.name})")
+        try:
+            if httpx.get(base_url + "/", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError(f"서버 시작 시간 초과 (로그: {log.name})")
+
+
+# ============================================================
+# 3) 부하 생성 / 집계
+# ============================================================
+def percentile(sorted_values: list, pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, index))]
+
+
+async def run_requests(jobs: list, concurrency: int) -> dict:
+    """
+    job(비동기 함수, 성공 시 True 반환)을 동시 실행 수 제한으로 실행
+
+    Returns:
+        requests / errors / duration_sec / throughput_rps / p50·p95·p99·max (ms)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = []
+
+    async def run(job):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                error = None if await job() else "unexpected response"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            latencies.append(time.perf_counter() - start)
+            if error:
+                errors.append(error)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(job) for job in jobs))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(jobs),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:3],
+        "duration_sec": round(duration, 3),
+        "throughput_rps": round(len(jobs) / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+    }
+
+
+# ============================================================
+# 4) 시나리오
+# ============================================================
+def user_id(index: int) -> str:
+    return f"loadtest-{index:03d}@bench.local"
+
+
+def zip_upload_jobs(client, workdir, days, repeat, hr_per_day, seed, user_offset):
+    """ZIP 업로드 → job 완료(done)까지를 요청 1건으로 측정"""
+    path = os.path.join(workdir, f"healthconnect_{days}d.zip")
+    generate_healthconnect_zip(path, days=days, hr_per_day=hr_per_day, seed=seed)
+    with open(path, "rb") as f:
+        payload = f.read()
+
+    def make_job(index):
+        async def job():
+            response = await client.post(
+                "/api/file/upload",
+                params={"user_id": user_id(user_offset + index)},
+                files={"file": (os.path.basename(path), payload, "application/zip")},
+            )
+            response.raise_for_status()
+            status_url = response.json()["status_url"]
+
+            while True:
+                job_state = (await client.get(status_url)).json()
+                if job_state["status"] in ("done", "failed"):
+                    return job_state["status"] == "done"
+                await asyncio.sleep(0.1)
+
+        return job
+
+    return [make_job(i) for i in range(repeat)]
+
+
+def auto_burst_jobs(client, users, burst_days, seed):
+    """사용자별 최근 N일을 날짜별 요청으로 동시에 전송"""
+    rng = random.Random(seed)
+    today = date.today()
+    jobs = []
+
+    for u in range(users):
+        for offset in range(burst_days, 0, -1):
+            body = {
+                "user_id": user_id(u),
+                "date": (today - timedelta(days=offset)).isoformat(),
+                "raw_json": make_raw_json(rng),
+            }
+
+            async def job(body=body):
+                response = await client.post("/api/auto/upload", json=body)
+                return response.status_code == 200 and response.json().get("success")
+
+            jobs.append(job)
+
+    rng.shuffle(jobs)
+    return jobs
+
+
+def chat_mix_jobs(client, users, count, fixed_ratio, seed):
+    """자유형 / 고정형 챗봇 요청 혼합"""
+    rng = random.Random(seed)
+    jobs = []
+
+    for _ in range(count):
+        uid = user_id(rng.randrange(users))
+        character = rng.choice(PERSONAS)
+        if rng.random() < fixed_ratio:
+            path = "/api/chat/fixed"
+            body = {
+                "user_id": uid,
+                "question_type": rng.choice(FIXED_QUESTIONS),
+                "character": character,
+            }
+        else:
+            path = "/api/chat"
+            body = {
+                "user_id": uid,
+                "message": rng.choice(CHAT_MESSAGES),
+                "character": character,
+            }
+
+        async def job(path=path, body=body):
+            response = await client.post(path, json=body)
+            return response.status_code == 200
+
+        jobs.append(job)
+
+    return jobs
+
+
+def latest_analysis_jobs(client, users, count, seed):
+    rng = random.Random(seed)
+    jobs = []
+
+    for _ in range(count):
+        params = {"user_id": user_id(rng.randrange(users))}
+
+        async def job(params=params):
+            response = await client.get("/api/user/latest-analysis", params=params)
+            return response.status_code == 200
+
+        jobs.append(job)
+
+    return jobs
+
+
+async def run_all(args, base_url: str, workdir: str, server_pid: int) -> list:
+    results = []
+    timeout = httpx.Timeout(args.request_timeout)
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.users * args.burst_days))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+
+        async def record(name, jobs, concurrency):
+            print(f"▶ {name}: {len(jobs)}건 (동시 {concurrency})", flush=True)
+            result = {"scenario": name, **await run_requests(jobs, concurrency)}
+            result.update(read_rss_mb(server_pid))
+            results.append(result)
+
+        if "zip_upload" in args.scenarios:
+            for i, days in enumerate(args.zip_days):
+                jobs = zip_upload_jobs(
+                    client, workdir, days, args.zip_repeat, args.hr_per_day,
+                    args.seed + i, user_offset=args.users + i * args.zip_repeat,
+                )
+                await record(f"zip_upload[{days}d]", jobs, args.zip_concurrency)
+
+        # 챗봇 / 최신 분석 시나리오가 사용할 데이터도 이 단계에서 저장됨
+        if "auto_burst" in args.scenarios or args.seed_users:
+            jobs = auto_burst_jobs(client, args.users, args.burst_days, args.seed)
+            await record("auto_burst", jobs, len(jobs))
+
+        if "chat_mix" in args.scenarios:
+            jobs = chat_mix_jobs(
+                client, args.users, args.chat_requests, args.fixed_ratio, args.seed
+            )
+            await record("chat_mix", jobs, args.concurrency)
+
+        if "latest_analysis" in args.scenarios:
+            jobs = latest_analysis_jobs(client, args.users, args.latest_requests, args.seed)
+            await record("latest_analysis", jobs, args.concurrency)
+
+    return results
+
+
+# ============================================================
+# 5) 출력 / 비교
+# ============================================================
+def print_report(results: list):
+    header = (
+        f"{'scenario':<22}{'req':>6}{'err':>5}{'req/s':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak RSS':>11}"
+    )
+    print("\n" + header)
+    print("-" * len(header))
+    for r in results:
+        peak = f"{r['peak_rss_mb']}MB" if r["peak_rss_mb"] is not None else "-"
+        print(
+            f"{r['scenario']:<22}{r['requests']:>6}{r['errors']:>5}"
+            f"{r['throughput_rps']:>9.2f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['p99_ms']:>10.1f}{peak:>11}"
+        )
+        for sample in r["error_samples"]:
+            print(f"    ⚠️ {sample}")
+
+
+def compare_report(results: list, baseline: dict, tolerance: float) -> bool:
+    """
+    이전 결과 대비 회귀 검사 (p99 증가 / 처리량 감소 / 오류 증가)
+
+    Returns:
+        회귀가 없으면 True
+    """
+    base_by_name = {r["scenario"]: r for r in baseline.get("results", [])}
+    ok = True
+
+    print(f"\n📊 기준 결과 비교 (허용 오차 {tolerance:.0%})")
+    for r in results:
+        base = base_by_name.get(r["scenario"])
+        if base is None:
+            print(f"  {r['scenario']:<22} (기준 없음)")
+            continue
+
+        problems = []
+        if r["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            problems.append("p99")
+        if r["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            problems.append("throughput")
+        if r["errors"] > base["errors"]:
+            problems.append("errors")
+
+        mark = "❌ " + ",".join(problems) if problems else "✅"
+        print(
+            f"  {r['scenario']:<22} p99 {base['p99_ms']:.1f} → {r['p99_ms']:.1f}ms, "
+            f"{base['throughput_rps']:.2f} → {r['throughput_rps']:.2f} req/s  {mark}"
+        )
+        ok = ok and not problems
+
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="app.main:app end-to-end 부하 테스트")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS),
+        type=lambda s: [x.strip() for x in s.split(",") if x.strip()],
+    )
+    parser.add_argument("--seed", type=int, default=42)
+
+    # OpenAI 스텁
+    parser.add_argument("--chat-latency-ms", type=float, default=300)
+    parser.add_argument("--embed-latency-ms", type=float, default=30)
+
+    # 시나리오 크기
+    parser.add_argument(
+        "--zip-days", default=[30, 180, 365],
+        type=lambda s: [int(x) for x in s.split(",")],
+        help="ZIP 업로드 크기 (일수, 쉼표 구분)",
+    )
+    parser.add_argument("--zip-repeat", type=int, default=2, help="크기별 업로드 횟수")
+    parser.add_argument("--zip-concurrency", type=int, default=2)
+    parser.add_argument(
+        "--hr-per-day", type=int, help="하루 심박 샘플 수 (기본: 가장 큰 사용자 기준)"
+    )
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--burst-days", type=int, default=7)
+    parser.add_argument("--chat-requests", type=int, default=60)
+    parser.add_argument("--fixed-ratio", type=float, default=0.3)
+    parser.add_argument("--latest-requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--request-timeout", type=float, default=120)
+
+    # 서버
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE",
+        help="서버 환경변수 추가 (여러 번 사용 가능)",
+    )
+    parser.add_argument("--keep", action="store_true", help="임시 디렉터리 유지")
+
+    # 결과
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {sorted(unknown)}")
+    # 챗봇 / 최신 분석은 사용자 데이터가 필요 → auto_burst로 먼저 저장
+    args.seed_users = bool({"chat_mix", "latest_analysis"} & set(args.scenarios))
+    return args
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="loadtest_")
+    stub, openai_base_url = start_stub_server(
+        chat_latency_ms=args.chat_latency_ms, embed_latency_ms=args.embed_latency_ms
+    )
+    extra_env = dict(item.split("=", 1) for item in args.env)
+
+    print(f"📁 작업 디렉터리: {workdir}")
+    print(f"🤖 OpenAI 스텁: {openai_base_url}")
+    process, base_url = start_app_server(workdir, openai_base_url, extra_env)
+    print(f"🚀 서버: {base_url} (pid {process.pid})\n")
+
+    try:
+        results = asyncio.run(run_all(args, base_url, workdir, process.pid))
+        final_rss = read_rss_mb(process.pid)
+        stub_stats = httpx.get(openai_base_url + "/stats").json()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        stub.shutdown()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(results)
+    print(f"\n🧠 서버 peak RSS: {final_rss['peak_rss_mb']}MB")
+    print(f"🤖 OpenAI 스텁 호출: {stub_stats}")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "compare", "keep")
+        },
+        "results": results,
+        "server_peak_rss_mb": final_rss["peak_rss_mb"],
+        "openai_stub_calls": stub_stats,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare_report(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+OpenAI API 로컬 스텁 서버 (부하 테스트용)
+
+기능:
+1. POST /v1/embeddings - 텍스트 해시 기반 결정적 임베딩 (같은 텍스트 → 같은 벡터)
+   - 단어 / 문자 3-gram을 차원에 해싱 → 비슷한 문장은 코사인 유사도도 높음
+   - encoding_format=base64 (openai 클라이언트 기본값) / float 모두 지원
+2. POST /v1/chat/completions - 고정 응답 + 설정한 지연 시간
+   - 프롬프트에 "JSON" 요청이 있으면 분석 JSON (MET 범위 / 목표 시간 반영), 아니면 짧은 텍스트
+3. 호출 수 / 입력 수 집계 (GET /stats)
+
+서버는 OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 로 연결
+
+사용법:
+  python benchmarks/stub_openai.py --port 9100
+  python benchmarks/stub_openai.py --port 9100 --chat-latency-ms 800 --embed-latency-ms 50
+"""
+
+import re
+import copy
+import json
+import time
+import zlib
+import array
+import base64
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_DIM = 1536
+
+ANALYSIS_JSON = {
+    "analysis": "최근 활동량과 수면 패턴을 기준으로 한 스텁 분석 결과입니다.",
+    "ai_recommended_routine": {
+        "total_time_min": 30,
+        "total_calories": 150,
+        "items": [
+            {
+                "exercise": "걷기",
+                "category": "유산소",
+                "duration_sec": 1800,
+                "set_count": 1,
+                "rest_sec": 0,
+                "met": 3.5,
+                "calories": 150,
+            }
+        ],
+    },
+}
+
+MET_RANGE_RE = re.compile(r"MET 범위:\s*([\d.]+)\s*-\s*([\d.]+)")
+TARGET_MIN_RE = re.compile(r"목표:\s*(\d+)분")
+
+CHAT_TEXT = "좋아요! 오늘 기록을 보면 꾸준히 잘하고 있어요. 가볍게 30분 걷기부터 해볼까요?"
+
+
+def analysis_json(prompt: str) -> dict:
+    """프롬프트의 MET 범위 / 목표 시간에 맞춘 분석 JSON (검증 통과용)"""
+    result = copy.deepcopy(ANALYSIS_JSON)
+    item = result["ai_recommended_routine"]["items"][0]
+
+    met_range = MET_RANGE_RE.search(prompt)
+    if met_range:
+        item["met"] = round((float(met_range[1]) + float(met_range[2])) / 2, 2)
+    target_min = TARGET_MIN_RE.search(prompt)
+    if target_min:
+        item["duration_sec"] = int(target_min[1]) * 60
+        result["ai_recommended_routine"]["total_time_min"] = int(target_min[1])
+    return result
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> array.array:
+    """단어 + 문자 3-gram 해싱 → L2 정규화 벡터"""
+    vector = array.array("f", bytes(4 * dim))
+    tokens = text.split()
+    compact = "".join(tokens)
+    features = tokens + [compact[i : i + 3] for i in range(max(0, len(compact) - 2))]
+
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += 1.0 if (h >> 16) & 1 else -1.0
+
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    for i, v in enumerate(vector):
+        if v:
+            vector[i] = v / norm
+    return vector
+
+
+class StubState:
+    """지연 시간 설정 + 호출 통계 (스레드 안전)"""
+
+    def __init__(self, chat_latency_ms: float = 0, embed_latency_ms: float = 0):
+        self.chat_latency = chat_latency_ms / 1000
+        self.embed_latency = embed_latency_ms / 1000
+        self._lock = threading.Lock()
+        self.stats = {"chat_calls": 0, "embedding_calls": 0, "embedding_inputs": 0}
+
+    def count(self, **amounts):
+        with self._lock:
+            for key, amount in amounts.items():
+                self.stats[key] += amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(self.state.snapshot())
+        else:
+            self._send_json({"error": {"message": "not found"}}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path.endswith("/embeddings"):
+            self._send_json(self._embeddings(request))
+        elif self.path.endswith("/chat/completions"):
+            self._send_json(self._chat(request))
+        else:
+            self._send_json({"error": {"message": "not found"}}, 404)
+
+    # ------ 1) 임베딩 ------
+    def _embeddings(self, request: dict) -> dict:
+        inputs = request.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        if self.state.embed_latency:
+            time.sleep(self.state.embed_latency)
+        self.state.count(embedding_calls=1, embedding_inputs=len(inputs))
+
+        use_base64 = request.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(inputs):
+            vector = embed_text(str(text))
+            if use_base64:
+                embedding = base64.b64encode(vector.tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        tokens = sum(len(str(text)) for text in inputs) // 2
+        return {
+            "object": "list",
+            "data": data,
+            "model": request.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    # ------ 2) Chat completion ------
+    def _chat(self, request: dict) -> dict:
+        prompt = "\n".join(
+            str(message.get("content", "")) for message in request.get("messages", [])
+        )
+
+        if self.state.chat_latency:
+            time.sleep(self.state.chat_latency)
+        self.state.count(chat_calls=1)
+
+        if "JSON" in prompt:
+            content = json.dumps(analysis_json(prompt), ensure_ascii=False)
+        else:
+            content = CHAT_TEXT
+
+        prompt_tokens = len(prompt) // 2
+        completion_tokens = len(content) // 2
+        return {
+            "id": f"chatcmpl-stub-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+
+def start_stub_server(
+    port: int = 0, chat_latency_ms: float = 0, embed_latency_ms: float = 0
+) -> tuple:
+    """
+    스텁 서버를 백그라운드 스레드에서 시작
+
+    Returns:
+        (server, base_url) - base_url은 OPENAI_BASE_URL로 그대로 사용
+    """
+    handler = type(
+        "BoundStubHandler",
+        (StubHandler,),
+        {"state": StubState(chat_latency_ms, embed_latency_ms)},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI API 스텁 서버")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--chat-latency-ms", type=float, default=0)
+    parser.add_argument("--embed-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(
+        args.port, args.chat_latency_ms, args.embed_latency_ms
+    )
+    print(f"OpenAI 스텁 서버 실행 중: OPENAI_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+합성 Health Connect DB 생성기 (수집 파이프라인 스케일 테스트 / 퍼징용)
+
+기능:
+1. db_parser가 읽는 테이블을 Health Connect export와 같은 이름 / 주요 컬럼으로 생성
+   (공통 메타 컬럼 + uuid BLOB 포함 → db_to_json 변환 비용도 실제와 비슷)
+2. 날짜 수, 하루 심박 샘플 수, 테이블별 행 수 설정
+3. 기본 분포 = 가장 큰 실사용자 export (SAMPLE_DATA.md: 410일, 심박 샘플 685,258건)
+   --scale 10 / 100 → 테이블별 행 수 10배 / 100배 (날짜 수는 유지, 밀도 증가)
+4. 출력 경로가 .zip이면 ZIP으로 압축 (파일명에 healthconnect 포함 → 삼성으로 감지)
+
+같은 --seed면 같은 파일이 생성된다.
+
+사용법:
+  python benchmarks/synthetic_healthconnect.py --out /tmp/healthconnect_1x.zip
+  python benchmarks/synthetic_healthconnect.py --scale 10 --out /tmp/healthconnect_10x.db
+  python benchmarks/synthetic_healthconnect.py --days 30 --hr-per-day 1440 --out /tmp/healthconnect_30d.zip
+  python benchmarks/synthetic_healthconnect.py --rows sleep_session_record_table=400 --rows weight_record_table=0
+"""
+
+import os
+import time
+import random
+import sqlite3
+import zipfile
+import argparse
+from datetime import date, datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+DAY_MS = 86_400_000
+
+# 가장 큰 실사용자 export 기준 (SAMPLE_DATA.md, 410일치)
+LARGEST_USER_DAYS = 410
+LARGEST_USER_ROWS = {
+    "heart_rate_record_series_table": 685_258,
+    "steps_record_table": 407,
+    "total_calories_burned_record_table": 349,
+    "distance_record_table": 278,
+    "sleep_session_record_table": 48,
+    "oxygen_saturation_record_table": 47,
+    "height_record_table": 14,
+    "weight_record_table": 14,
+    "active_calories_burned_record_table": 0,
+    "resting_heart_rate_record_table": 0,
+    "steps_cadence_record_table": 0,
+}
+
+# Health Connect 레코드 공통 컬럼
+_INTERVAL_COLUMNS = """
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid BLOB NOT NULL,
+    last_modified_time INTEGER NOT NULL,
+    client_record_id TEXT,
+    client_record_version INTEGER NOT NULL,
+    device_info_id INTEGER,
+    app_info_id INTEGER,
+    recording_method INTEGER,
+    start_time INTEGER NOT NULL,
+    start_zone_offset INTEGER,
+    end_time INTEGER NOT NULL,
+    end_zone_offset INTEGER,
+    local_date INTEGER NOT NULL
+"""
+_INSTANT_COLUMNS = """
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid BLOB NOT NULL,
+    last_modified_time INTEGER NOT NULL,
+    client_record_id TEXT,
+    client_record_version INTEGER NOT NULL,
+    device_info_id INTEGER,
+    app_info_id INTEGER,
+    recording_method INTEGER,
+    time INTEGER NOT NULL,
+    zone_offset INTEGER,
+    local_date INTEGER NOT NULL
+"""
+
+# 테이블 → (공통 컬럼 종류, 값 컬럼 DDL)
+INTERVAL, INSTANT = "interval", "instant"
+TABLES = {
+    "steps_record_table": (INTERVAL, "count INTEGER NOT NULL"),
+    "distance_record_table": (INTERVAL, "distance REAL NOT NULL"),
+    "steps_cadence_record_table": (INTERVAL, "rate REAL"),
+    "total_calories_burned_record_table": (INTERVAL, "energy REAL NOT NULL"),
+    "active_calories_burned_record_table": (INTERVAL, "energy REAL NOT NULL"),
+    "sleep_session_record_table": (INTERVAL, "title TEXT, notes TEXT"),
+    "resting_heart_rate_record_table": (INSTANT, "value INTEGER NOT NULL"),
+    "oxygen_saturation_record_table": (INSTANT, "percentage REAL NOT NULL"),
+    "weight_record_table": (INSTANT, "weight REAL NOT NULL"),
+    "height_record_table": (INSTANT, "height REAL NOT NULL"),
+}
+# 심박: 하루 1개의 부모 레코드 + 샘플 series
+HEART_RATE_PARENT = "heart_rate_record_table"
+HEART_RATE_SERIES = "heart_rate_record_series_table"
+
+SERIES_BATCH = 50_000
+ZONE_OFFSET_SEC = 9 * 3600
+
+
+# ============================================================
+# 1) 행 분배 / 값 생성
+# ============================================================
+def scaled_rows(days: int, scale: float = 1.0) -> dict:
+    """가장 큰 사용자의 하루당 행 수 × scale × days → 테이블별 행 수"""
+    return {
+        table: round(count / LARGEST_USER_DAYS * scale * days)
+        for table, count in LARGEST_USER_ROWS.items()
+    }
+
+
+def distribute(total: int, days: int, rng: random.Random) -> list:
+    """
+    행 total개를 날짜별 개수로 분배
+
+    - total <= days: 랜덤 날짜 total개에 1개씩 (기록이 빠진 날 재현)
+    - total > days: 모든 날짜에 고르게, 나머지는 랜덤 날짜에 1개씩 추가
+    """
+    counts = [0] * days
+    if total <= 0 or days <= 0:
+        return counts
+    if total <= days:
+        for index in rng.sample(range(days), total):
+            counts[index] = 1
+        return counts
+
+    base, extra = divmod(total, days)
+    counts = [base] * days
+    for index in rng.sample(range(days), extra):
+        counts[index] += 1
+    return counts
+
+
+def _day_start_ms(day: date) -> int:
+    """KST 자정 epoch millis"""
+    return int(datetime(day.year, day.month, day.day, tzinfo=KST).timestamp() * 1000)
+
+
+def _values(table: str, day_start: int, n: int, k: int, rng: random.Random) -> tuple:
+    """
+    테이블별 (start/time, end, 값 컬럼...) 생성
+
+    하루 n개 레코드 중 k번째 → 하루치 합계를 n개로 나눈 값 (걸음수 / 거리 / 칼로리)
+    """
+    slot = DAY_MS // n
+    start = day_start + k * slot + rng.randrange(max(1, slot // 2))
+    end = min(start + rng.randrange(60_000, max(60_001, slot // 2)), day_start + DAY_MS - 1)
+
+    if table == "steps_record_table":
+        return start, end, rng.randint(1500, 14000) // n
+    if table == "distance_record_table":
+        return start, end, rng.uniform(1000, 10000) / n
+    if table == "steps_cadence_record_table":
+        return start, end, rng.uniform(60, 120)
+    if table == "total_calories_burned_record_table":
+        return start, end, rng.uniform(1600, 2600) * 1000 / n  # kcal → millikcal
+    if table == "active_calories_burned_record_table":
+        return start, end, rng.uniform(100, 600) * 1000 / n
+    if table == "sleep_session_record_table":
+        # 전날 22시 ~ 새벽 1시 취침, 5~9시간 (local_date는 기상일)
+        sleep_start = day_start - rng.randint(0, 3 * 60) * 60_000 - 2 * 3_600_000
+        return sleep_start, sleep_start + rng.randint(300, 540) * 60_000, None, None
+    if table == "resting_heart_rate_record_table":
+        return start, rng.randint(52, 78)
+    if table == "oxygen_saturation_record_table":
+        return start, round(rng.uniform(92, 99.5), 1)
+    if table == "weight_record_table":
+        return start, rng.uniform(55, 85) * 1000  # kg → gram
+    if table == "height_record_table":
+        return start, 1.72
+    raise KeyError(table)
+
+
+def _heart_rate_samples(parent_key: int, day_start: int, n: int, rng: random.Random):
+    """하루 n개 심박 샘플 (낮 8~22시는 활동 구간)"""
+    slot = DAY_MS / n
+    for i in range(n):
+        t = int(day_start + i * slot)
+        hour = (t - day_start) // 3_600_000
+        bpm = rng.randint(68, 125) if 8 <= hour < 22 else rng.randint(50, 70)
+        yield parent_key, bpm, t
+
+
+# ============================================================
+# 2) DB 생성
+# ============================================================
+def generate_healthconnect_db(
+    path: str,
+    days: int = LARGEST_USER_DAYS,
+    scale: float = 1.0,
+    hr_per_day: int = None,
+    rows: dict = None,
+    seed: int = 0,
+    end_date: date = None,
+) -> dict:
+    """
+    합성 Health Connect SQLite 파일 생성
+
+    Args:
+        path: 출력 .db 경로 (이미 있으면 덮어씀)
+        days: 날짜 수 (end_date부터 과거로)
+        scale: 가장 큰 사용자 대비 행 수 배율
+        hr_per_day: 하루 심박 샘플 수 (지정 시 scale 대신 사용)
+        rows: 테이블별 행 수 직접 지정 {table: count}
+        seed: 난수 seed
+        end_date: 마지막 날짜 (기본: 어제)
+
+    Returns:
+        {table: 생성된 행 수}
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today() - timedelta(days=1)
+    first_day = end_date - timedelta(days=days - 1)
+    epoch_day = (first_day - date(1970, 1, 1)).days
+
+    volumes = scaled_rows(days, scale)
+    if hr_per_day is not None:
+        volumes[HEART_RATE_SERIES] = hr_per_day * days
+    volumes.update(rows or {})
+
+    unknown = set(volumes) - set(LARGEST_USER_ROWS)
+    if unknown:
+        raise ValueError(f"알 수 없는 테이블: {sorted(unknown)}")
+
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    def meta(record_time: int) -> tuple:
+        return (
+            rng.randbytes(16),  # uuid
+            record_time + rng.randrange(3_600_000),  # last_modified_time
+            None,
+            0,
+            1,
+            1,
+            rng.choice((1, 2)),  # recording_method (자동 / 수동)
+        )
+
+    counts = {}
+
+    # ------ 1) 일반 레코드 테이블 ------
+    for table, (kind, value_ddl) in TABLES.items():
+        common = _INTERVAL_COLUMNS if kind == INTERVAL else _INSTANT_COLUMNS
+        conn.execute(f"CREATE TABLE {table} ({common}, {value_ddl})")
+
+        per_day = distribute(volumes[table], days, rng)
+        records = []
+        for offset, n in enumerate(per_day):
+            day_start = _day_start_ms(first_day + timedelta(days=offset))
+            local_date = epoch_day + offset
+            for k in range(n):
+                values = _values(table, day_start, n, k, rng)
+                if kind == INTERVAL:
+                    start, end, *fields = values
+                    records.append(
+                        (*meta(end), start, ZONE_OFFSET_SEC, end, ZONE_OFFSET_SEC, local_date, *fields)
+                    )
+                else:
+                    at, *fields = values
+                    records.append((*meta(at), at, ZONE_OFFSET_SEC, local_date, *fields))
+
+        if records:
+            width = len(records[0])
+            columns = conn.execute(f"SELECT * FROM {table} LIMIT 0").description
+            names = ", ".join(col[0] for col in columns[1 : 1 + width])
+            conn.executemany(
+                f"INSERT INTO {table} ({names}) VALUES ({', '.join('?' * width)})",
+                records,
+            )
+        counts[table] = len(records)
+
+    # ------ 2) 심박 (부모 레코드 + series) ------
+    conn.execute(f"CREATE TABLE {HEART_RATE_PARENT} ({_INTERVAL_COLUMNS})")
+    conn.execute(
+        f"""
+        CREATE TABLE {HEART_RATE_SERIES} (
+            parent_key INTEGER NOT NULL,
+            beats_per_minute INTEGER NOT NULL,
+            epoch_millis INTEGER NOT NULL
+        )
+        """
+    )
+
+    per_day = distribute(volumes[HEART_RATE_SERIES], days, rng)
+    series_total = 0
+    parents = 0
+    for offset, n in enumerate(per_day):
+        if n == 0:
+            continue
+        day_start = _day_start_ms(first_day + timedelta(days=offset))
+        cursor = conn.execute(
+            f"""
+            INSERT INTO {HEART_RATE_PARENT} (
+                uuid, last_modified_time, client_record_id, client_record_version,
+                device_info_id, app_info_id, recording_method,
+                start_time, start_zone_offset, end_time, end_zone_offset, local_date
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                *meta(day_start + DAY_MS - 1),
+                day_start, ZONE_OFFSET_SEC,
+                day_start + DAY_MS - 1, ZONE_OFFSET_SEC,
+                epoch_day + offset,
+            ),
+        )
+        parents += 1
+
+        samples = _heart_rate_samples(cursor.lastrowid, day_start, n, rng)
+        while True:
+            batch = [sample for _, sample in zip(range(SERIES_BATCH), samples)]
+            if not batch:
+                break
+            conn.executemany(f"INSERT INTO {HEART_RATE_SERIES} VALUES (?, ?, ?)", batch)
+            series_total += len(batch)
+
+    counts[HEART_RATE_PARENT] = parents
+    counts[HEART_RATE_SERIES] = series_total
+
+    conn.commit()
+    conn.close()
+    return counts
+
+
+def generate_healthconnect_zip(path: str, **kwargs) -> dict:
+    """
+    합성 DB 생성 후 ZIP으로 압축 (kwargs는 generate_healthconnect_db와 동일)
+
+    파일명에 healthconnect가 없으면 업로드 시 플랫폼 감지가 애플로 갈 수 있음
+    """
+    db_path = path + ".db"
+    counts = generate_healthconnect_db(db_path, **kwargs)
+    try:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(db_path, "health_connect_export.db")
+    finally:
+        os.remove(db_path)
+    return counts
+
+
+# ============================================================
+# 3) CLI
+# ============================================================
+def _parse_rows(items: list) -> dict:
+    rows = {}
+    for item in items:
+        table, _, count = item.partition("=")
+        rows[table.strip()] = int(count)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 Health Connect DB 생성")
+    parser.add_argument("--out", required=True, help="출력 경로 (.db 또는 .zip)")
+    parser.add_argument("--days", type=int, default=LARGEST_USER_DAYS)
+    parser.add_argument("--scale", type=float, default=1.0, help="가장 큰 사용자 대비 배율")
+    parser.add_argument("--hr-per-day", type=int, help="하루 심박 샘플 수")
+    parser.add_argument(
+        "--rows", action="append", default=[], metavar="TABLE=COUNT",
+        help="테이블 행 수 직접 지정 (여러 번 사용 가능)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--end-date", type=date.fromisoformat, help="마지막 날짜 YYYY-MM-DD (기본: 어제)"
+    )
+    args = parser.parse_args()
+
+    options = dict(
+        days=args.days,
+        scale=args.scale,
+        hr_per_day=args.hr_per_day,
+        rows=_parse_rows(args.rows),
+        seed=args.seed,
+        end_date=args.end_date,
+    )
+
+    start = time.perf_counter()
+    if args.out.endswith(".zip"):
+        counts = generate_healthconnect_zip(args.out, **options)
+    else:
+        counts = generate_healthconnect_db(args.out, **options)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n📦 {args.out} ({os.path.getsize(args.out) / 1024 / 1024:.1f}MB, {elapsed:.1f}s)")
+    print(f"📅 {args.days}일, 배율 {args.scale:g}×\n")
+    for table, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {table:<40} {count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,6 @@ OpenAI API 없이 직접 ChromaDB에 접근합니다.
 
 import sys
 import os
-import json
 from datetime import datetime
 
 # 백엔드 경로 추가
@@ -23,7 +22,7 @@ except ImportError:
 except Exception as e:
     pass
 
-from app.core.vector_store import collection
+from app.core.vector_store import collection, summary_from_metadata
 
 
 def print_header(title):
@@ -76,12 +75,8 @@ def get_date(user_id: str, date: str):
             return None
 
         metadata = result["metadatas"][0]
-        summary_json = metadata.get("summary_json", "{}")
-
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
+        # raw_bin (바이너리) / summary_json["raw"] (이전 데이터) 모두 복원
+        raw, summary_text = summary_from_metadata(metadata)
 
         return {
             "date": metadata.get("date"),
@@ -90,8 +85,8 @@ def get_date(user_id: str, date: str):
             "health_score": metadata.get("health_score"),
             "recommended_intensity": metadata.get("recommended_intensity"),
             "updated_at": metadata.get("updated_at"),
-            "summary_text": summary_dict.get("summary_text", ""),
-            "raw": summary_dict.get("raw", {}),
+            "summary_text": summary_text,
+            "raw": dict(raw),
         }
     except Exception as e:
         print(f"[ERROR] {e}")
@@ -253,15 +248,9 @@ def view_user_data(user_id: str, detailed=False, show_all_fields=False):
             health_score = metadata.get("health_score", 0)
             intensity = metadata.get("recommended_intensity", "중")
 
-            # summary_json 파싱
-            summary_json = metadata.get("summary_json", "{}")
-            try:
-                summary_dict = json.loads(summary_json)
-            except:
-                summary_dict = {}
-
-            raw = summary_dict.get("raw", {})
-            summary_text = summary_dict.get("summary_text", "")
+            # raw_bin (바이너리) / summary_json["raw"] (이전 데이터) 모두 복원
+            raw, summary_text = summary_from_metadata(metadata)
+            raw = dict(raw)
 
             print(f"\n{'='*100}")
             print(f"📅 [{i}] 날짜: {date}")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+로컬 intent 분류 모델 학습 스크립트
+
+기능:
+1. 라벨링된 메시지 (JSONL: text / intent / use_similarity) 로드
+2. 문자 1~3-gram TF-IDF + 로지스틱 회귀 학습 (numpy, 배치 경사하강법)
+   - intent: 3-class softmax / use_similarity: 이진 분류
+3. 층화 k-fold 교차 검증 정확도 출력
+   - 모델 단독 / 규칙 단독 / 모델 + 규칙 fallback (신뢰도 임계값별)
+4. 전체 데이터로 재학습 후 저장 + 메시지당 추론 시간 측정
+
+사용법:
+  python train_intent_model.py
+  python train_intent_model.py --data my_labeled.jsonl --out my_model.npz --folds 5
+  → 서버 적용: INTENT_MODEL_PATH=app/core/chatbot_engine/data/intent_model.npz
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core.chatbot_engine.intent_model import IntentModel, INTENTS, char_ngrams
+from app.core.chatbot_engine import intent_classifier as ic
+
+DATA_DIR = os.path.join("app", "core", "chatbot_engine", "data")
+DEFAULT_DATA = os.path.join(DATA_DIR, "intent_labeled.jsonl")
+DEFAULT_OUT = os.path.join(DATA_DIR, "intent_model.npz")
+
+
+# ============================================================
+# 1) 데이터
+# ============================================================
+def load_labeled(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        if row["intent"] not in INTENTS:
+            raise ValueError(f"알 수 없는 intent: {row}")
+    return rows
+
+
+def stratified_folds(rows: list, folds: int, seed: int) -> list:
+    """(intent, use_similarity) 비율을 유지하는 fold별 index 목록"""
+    rng = random.Random(seed)
+    groups = {}
+    for index, row in enumerate(rows):
+        groups.setdefault((row["intent"], row["use_similarity"]), []).append(index)
+
+    result = [[] for _ in range(folds)]
+    position = 0
+    for key in sorted(groups):
+        indices = groups[key]
+        rng.shuffle(indices)
+        for index in indices:
+            result[position % folds].append(index)
+            position += 1
+    return result
+
+
+# ============================================================
+# 2) 학습
+# ============================================================
+def vectorize(texts: list, min_df: int) -> tuple:
+    """texts → (vocab, idf, L2 정규화된 TF-IDF 행렬)"""
+    counts = [char_ngrams(text) for text in texts]
+    df = {}
+    for count in counts:
+        for ngram in count:
+            df[ngram] = df.get(ngram, 0) + 1
+
+    vocab = sorted(ngram for ngram, n in df.items() if n >= min_df)
+    index = {ngram: i for i, ngram in enumerate(vocab)}
+    idf = np.array(
+        [np.log((1 + len(texts)) / (1 + df[ngram])) + 1 for ngram in vocab],
+        dtype=np.float32,
+    )
+
+    X = np.zeros((len(texts), len(vocab)), dtype=np.float32)
+    for row, count in enumerate(counts):
+        for ngram, tf in count.items():
+            if ngram in index:
+                X[row, index[ngram]] = tf
+    X *= idf
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    X /= np.where(norms == 0, 1, norms)
+    return vocab, idf, X
+
+
+def fit_softmax(X, y, classes: int, l2: float, epochs: int, lr: float) -> tuple:
+    """다중 클래스 로지스틱 회귀 (전체 배치 경사하강법 + L2)"""
+    n, d = X.shape
+    W = np.zeros((d, classes), dtype=np.float32)
+    b = np.zeros(classes, dtype=np.float32)
+    Y = np.eye(classes, dtype=np.float32)[y]
+
+    for _ in range(epochs):
+        logits = X @ W + b
+        logits -= logits.max(axis=1, keepdims=True)
+        P = np.exp(logits)
+        P /= P.sum(axis=1, keepdims=True)
+        G = (P - Y) / n
+        W -= lr * (X.T @ G + l2 * W)
+        b -= lr * G.sum(axis=0)
+    return W, b
+
+
+def train(rows: list, args) -> IntentModel:
+    texts = [row["text"] for row in rows]
+    vocab, idf, X = vectorize(texts, args.min_df)
+
+    y_intent = np.array([INTENTS.index(row["intent"]) for row in rows])
+    y_similarity = np.array([int(row["use_similarity"]) for row in rows])
+
+    intent_W, intent_b = fit_softmax(X, y_intent, len(INTENTS), args.l2, args.epochs, args.lr)
+    # 이진 분류 = 2-class softmax의 logit 차이
+    sim_W, sim_b = fit_softmax(X, y_similarity, 2, args.l2, args.epochs, args.lr)
+
+    return IntentModel(
+        vocab=vocab,
+        idf=idf,
+        intent_weights=intent_W,
+        intent_bias=intent_b,
+        similarity_weights=sim_W[:, 1] - sim_W[:, 0],
+        similarity_bias=float(sim_b[1] - sim_b[0]),
+    )
+
+
+# ============================================================
+# 3) 평가
+# ============================================================
+def rule_prediction(text: str) -> tuple:
+    keyword_hits = ic.scan_keywords(text)
+    intent = ic._rule_based_intent(text, keyword_hits) or "default_chat"
+    return intent, ic.detect_comparison_pattern(text, keyword_hits)
+
+
+def combined_prediction(prediction: dict, rules: tuple, threshold: float) -> tuple:
+    """intent_classifier.classify_intent와 같은 규칙: 항목별로 신뢰도 미만이면 규칙 결과"""
+    intent, use_similarity = rules
+    if prediction["confidence"] >= threshold:
+        intent = prediction["intent"]
+    if prediction["similarity_confidence"] >= threshold:
+        use_similarity = prediction["use_similarity"]
+    return intent, use_similarity
+
+
+def cross_validate(rows: list, args) -> dict:
+    thresholds = args.thresholds
+    correct = {"model": [0, 0], "rules": [0, 0]}
+    correct.update({f"model+rules@{t}": [0, 0] for t in thresholds})
+
+    for fold in stratified_folds(rows, args.folds, args.seed):
+        test = set(fold)
+        model = train([row for i, row in enumerate(rows) if i not in test], args)
+
+        for i in fold:
+            row = rows[i]
+            expected = (row["intent"], row["use_similarity"])
+            prediction = model.predict(row["text"])
+            rules = rule_prediction(row["text"])
+
+            results = {
+                "model": (prediction["intent"], prediction["use_similarity"]),
+                "rules": rules,
+            }
+            for t in thresholds:
+                results[f"model+rules@{t}"] = combined_prediction(prediction, rules, t)
+
+            for name, (intent, use_similarity) in results.items():
+                correct[name][0] += intent == expected[0]
+                correct[name][1] += use_similarity == expected[1]
+
+    return {
+        name: (intent / len(rows), similarity / len(rows))
+        for name, (intent, similarity) in correct.items()
+    }
+
+
+def measure_latency(model: IntentModel, texts: list, repeat: int = 20) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            model.predict(text)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+# ============================================================
+# 메인
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="로컬 intent 분류 모델 학습")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="라벨링된 JSONL")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="저장할 모델 (.npz)")
+    parser.add_argument("--folds", type=int, default=5, help="교차 검증 fold 수 (0이면 생략)")
+    parser.add_argument("--min-df", type=int, default=1, help="n-gram 최소 등장 메시지 수")
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--lr", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8],
+        help="교차 검증에서 비교할 신뢰도 임계값",
+    )
+    args = parser.parse_args()
+
+    rows = load_labeled(args.data)
+    print(f"📂 학습 데이터: {len(rows)}개 ({args.data})")
+    for intent in INTENTS:
+        n = sum(row["intent"] == intent for row in rows)
+        n_sim = sum(row["intent"] == intent and row["use_similarity"] for row in rows)
+        print(f"  {intent:<16} {n:4d}개 (use_similarity {n_sim}개)")
+
+    if args.folds > 1:
+        print(f"\n🔁 {args.folds}-fold 교차 검증 (intent 정확도 / use_similarity 정확도)")
+        for name, (intent_acc, similarity_acc) in cross_validate(rows, args).items():
+            print(f"  {name:<20} {intent_acc:6.1%}  /  {similarity_acc:6.1%}")
+
+    model = train(rows, args)
+    model.save(args.out)
+    p50, p99 = measure_latency(model, [row["text"] for row in rows])
+    print(f"\n💾 저장: {args.out} (n-gram {len(model.vocab):,}개, "
+          f"{os.path.getsize(args.out) / 1024:.0f} KB)")
+    print(f"⏱️ 추론 시간: p50 {p50 * 1e6:.0f} µs / p99 {p99 * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ const ChatPage = () => {
   const [messages, setMessages] = useState([]);
   const [input, setInput] = useState('');
   const [character, setCharacter] = useState('booster_coach');
+  // ✅ 서버 대화 세션 ID (응답으로 받은 값을 다음 요청에 그대로 전송 → 이전 대화 이어짐)
+  const [sessionId, setSessionId] = useState(null);
 
   // 메시지 추가 함수
   const addMessage = (sender, text) => {
@@ -31,6 +33,7 @@ const ChatPage = () => {
     setIsLoggedIn(false);
     setUserId('');
     setMessages([]);
+    setSessionId(null);
   };
 
   // ================================
@@ -45,6 +48,7 @@ const ChatPage = () => {
       user_id: userId,
       message: input,
       character: character,
+      session_id: sessionId,
     };
 
     setInput('');
@@ -57,6 +61,7 @@ const ChatPage = () => {
       });
 
       const data = await res.json();
+      if (data.session_id) setSessionId(data.session_id);
       addMessage('bot', data.response);
     } catch (error) {
       addMessage('bot', '⚠️ 서버 연결 오류 발생');
@@ -56,6 +56,30 @@ function UploadPage() {
     setError(null);
   };
 
+  // ================================
+  // 업로드 job 완료 대기 (1.5초 간격 조회)
+  // ================================
+  const waitForUploadJob = async (jobId) => {
+    const statusUrl = `${BACKEND_URL}/api/file/jobs/${jobId}`;
+
+    while (true) {
+      const response = await fetch(statusUrl);
+      const job = await response.json();
+
+      if (!response.ok) {
+        throw new Error(`작업 조회 오류 (${response.status}): ${job.detail}`);
+      }
+      if (job.status === 'done') {
+        return job.result;
+      }
+      if (job.status === 'failed') {
+        throw new Error(`분석 실패: ${job.error}`);
+      }
+
+      await new Promise((resolve) => setTimeout(resolve, 1500));
+    }
+  };
+
   // ================================
   // ZIP/DB 파일 업로드
   // ================================
@@ -86,7 +110,9 @@ function UploadPage() {
         throw new Error(`서버 응답 오류 (${response.status}): ${responseBody}`);
       }
 
-      const data = JSON.parse(responseBody);
+      // 업로드는 job으로 처리됨 → 완료될 때까지 상태 조회
+      const job = JSON.parse(responseBody);
+      const data = await waitForUploadJob(job.job_id);
       setResult(data);
     } catch (err) {
       console.error('[ERROR] 업로드 실패:', err);